@@ -0,0 +1,93 @@
+"""
+Banco de efectos de sonido con caché de PCM decodificado en disco.
+
+Decodificar MP3 es lo más lento de arrancar el audio. La primera vez que se
+carga un efecto se decodifica con pygame y sus muestras crudas (en el
+formato del mixer) se guardan en `assets/music/.cache`. Las siguientes
+ejecuciones mapean ese archivo en memoria y crean el `Sound` directamente,
+sin decodificar.
+
+La clave de la caché incluye la fecha de modificación del archivo original
+y el formato del mixer (frecuencia, tamaño de muestra y canales): si el MP3
+cambia o el mixer se abre con otro formato, se vuelve a decodificar.
+"""
+
+import mmap
+import os
+import tempfile
+import pygame
+
+
+class BancoSonidos:
+    """Carga (y cachea) efectos de sonido por nombre de archivo.
+
+    Los efectos se cargan de forma perezosa en la primera llamada a
+    `obtener`; `precargar` permite cargar por adelantado los frecuentes.
+    Requiere que `pygame.mixer` esté inicializado.
+    """
+    def __init__(self, base_path, cache_dir=None):
+        self.base_path = base_path
+        self.cache_dir = cache_dir or os.path.join(base_path, ".cache")
+        self._sonidos = {}
+        self._volumenes = {}
+
+    def fijar_volumen(self, nombre, volumen):
+        """Volumen a aplicar al efecto (ahora o cuando se cargue)."""
+        self._volumenes[nombre] = volumen
+        if nombre in self._sonidos:
+            self._sonidos[nombre].set_volume(volumen)
+
+    def precargar(self, nombres):
+        for nombre in nombres:
+            self.obtener(nombre)
+
+    def cargado(self, nombre):
+        return nombre in self._sonidos
+
+    def obtener(self, nombre):
+        """Devuelve el `pygame.mixer.Sound` del archivo `nombre` (lo carga si hace falta)."""
+        sonido = self._sonidos.get(nombre)
+        if sonido is None:
+            sonido = self._cargar(nombre)
+            if nombre in self._volumenes:
+                sonido.set_volume(self._volumenes[nombre])
+            self._sonidos[nombre] = sonido
+        return sonido
+
+    def _ruta_cache(self, ruta):
+        freq, formato, canales = pygame.mixer.get_init()
+        mtime = os.stat(ruta).st_mtime_ns
+        base = os.path.splitext(os.path.basename(ruta))[0]
+        return os.path.join(self.cache_dir, f"{base}.{mtime}.{freq}_{formato}_{canales}.pcm")
+
+    def _cargar(self, nombre):
+        ruta = os.path.join(self.base_path, nombre)
+        ruta_cache = self._ruta_cache(ruta)
+
+        if os.path.exists(ruta_cache) and os.path.getsize(ruta_cache) > 0:
+            with open(ruta_cache, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as datos:
+                return pygame.mixer.Sound(buffer=datos)
+
+        sonido = pygame.mixer.Sound(ruta)
+        try:
+            self._guardar_cache(ruta_cache, sonido.get_raw())
+        except OSError as e:
+            print(f"[WARN] No se pudo guardar la caché de audio {ruta_cache}: {e}")
+        return sonido
+
+    def _guardar_cache(self, ruta_cache, datos):
+        """Escribe la caché de forma atómica y borra versiones viejas del mismo efecto."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        prefijo = os.path.basename(ruta_cache).split(".", 1)[0] + "."
+        for viejo in os.listdir(self.cache_dir):
+            if viejo.startswith(prefijo) and viejo.endswith(".pcm"):
+                os.remove(os.path.join(self.cache_dir, viejo))
+
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(datos)
+            os.replace(tmp, ruta_cache)
+        except OSError:
+            os.remove(tmp)
+            raise
@@ -0,0 +1,259 @@
+"""
+Benchmark sin ventana del bucle de juego.
+
+Reproduce un vídeo grabado (o una carpeta de imágenes) a través de
+`CrazyFruitsGame.procesar_frame`, sin cámara, sin `imshow`/`waitKey` y con
+una semilla fija, y mide el tiempo de cada frame. Informa el rendimiento
+(frames/s) y los percentiles de latencia, y puede guardar el resultado como
+referencia o compararlo con una referencia anterior.
+
+Uso:
+    python src/benchmark.py grabacion.mp4
+    python src/benchmark.py carpeta_frames/ --frames 600 --semilla 1
+    python src/benchmark.py grabacion.mp4 --guardar-base base.json
+    python src/benchmark.py grabacion.mp4 --base base.json --tolerancia 0.1
+
+Solo se mide `procesar_frame`: la decodificación del vídeo y el espejado
+quedan fuera del tiempo. La simulación avanza 1/fps segundos por frame
+(`--fps`, 30 por defecto), no el tiempo real, así que la partida es la misma
+en una máquina lenta y en una rápida. Cuando la partida termina se reinicia con
+`reset` y la reproducción sigue. Los puntajes de esas partidas se guardan en
+una base temporal, nunca en la del juego.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+import score_manager
+from detectors import cargar_cascades
+from game import CrazyFruitsGame
+from perfilador import Perfilador
+from sprites import precargar_sprites
+
+EXTENSIONES_IMAGEN = (".png", ".jpg", ".jpeg", ".bmp")
+PERCENTILES = (50, 90, 95, 99)
+
+
+# -------------------------------
+# Fuentes de frames
+# -------------------------------
+def leer_frames(ruta, max_frames=None):
+    """Genera los frames BGR de un vídeo o de una carpeta de imágenes (en orden)."""
+    n = 0
+    if os.path.isdir(ruta):
+        nombres = sorted(f for f in os.listdir(ruta) if f.lower().endswith(EXTENSIONES_IMAGEN))
+        for nombre in nombres:
+            if max_frames is not None and n >= max_frames:
+                return
+            frame = cv2.imread(os.path.join(ruta, nombre))
+            if frame is None:
+                print(f"[WARN] No se pudo leer la imagen: {nombre}")
+                continue
+            n += 1
+            yield frame
+        return
+
+    cap = cv2.VideoCapture(ruta)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"No se pudo abrir el vídeo: {ruta}")
+    try:
+        while max_frames is None or n < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                return
+            n += 1
+            yield frame
+    finally:
+        cap.release()
+
+
+# -------------------------------
+# Medición
+# -------------------------------
+def resumir(latencias):
+    """Estadísticas de una lista de latencias en segundos (resultado en ms)."""
+    ms = np.asarray(latencias, dtype=np.float64) * 1000.0
+    if len(ms) == 0:
+        return {"frames": 0}
+    resumen = {
+        "frames": int(len(ms)),
+        "fps": float(len(ms) / (ms.sum() / 1000.0)),
+        "media_ms": float(ms.mean()),
+        "max_ms": float(ms.max()),
+    }
+    for p, valor in zip(PERCENTILES, np.percentile(ms, PERCENTILES)):
+        resumen[f"p{p}_ms"] = float(valor)
+    return resumen
+
+
+def ejecutar(ruta, max_frames=None, semilla=0, calentamiento=10, espejo=True, ruta_csv=None, fps=30.0,
+             jugadores=1):
+    """Reproduce `ruta` en el juego y devuelve un dict con los resultados.
+
+    Los primeros `calentamiento` frames no entran en las estadísticas
+    (cachés, asignación de buffers y primera detección completa). Además
+    del total se mide cada etapa de `procesar_frame`; con `ruta_csv` se
+    guarda una fila por frame.
+    """
+    face_cascade, mouth_cascade = cargar_cascades()
+    precargar_sprites()
+
+    perfil = Perfilador(ventana=max_frames or 20000, ruta_csv=ruta_csv)
+    game = None
+    latencias = []
+    rondas = 0
+    puntajes = []
+    for i, frame in enumerate(leer_frames(ruta, max_frames)):
+        if espejo:
+            frame = cv2.flip(frame, 1)
+        if game is None:
+            h, w = frame.shape[:2]
+            game = CrazyFruitsGame(face_cascade, mouth_cascade, w, h, "Benchmark", semilla=semilla,
+                                   perfilador=perfil, jugadores=jugadores)
+
+        perfil.reiniciar_marca()
+        t0 = time.perf_counter()
+        game.procesar_frame(frame, dt=1.0 / fps)
+        dt = time.perf_counter() - t0
+        if i >= calentamiento:
+            latencias.append(dt)
+            perfil.fin_frame()
+        else:
+            perfil.descartar_frame()
+
+        if game.game_over:
+            rondas += 1
+            puntajes.append(game.score)
+            game.reset()
+
+    perfil.cerrar()
+    if game is None:
+        raise ValueError(f"No hay frames en {ruta}")
+
+    etapas = {
+        etapa: {"media_ms": float(media), "p95_ms": float(p95), "max_ms": float(maximo)}
+        for etapa, (media, p95, maximo) in perfil.estadisticas().items()
+        if etapa != "total" and maximo > 0
+    }
+
+    return {
+        "fuente": os.path.basename(os.path.normpath(ruta)),
+        "resolucion": [game.frame_width, game.frame_height],
+        "semilla": semilla,
+        "jugadores": jugadores,
+        "fps_fuente": fps,
+        "calentamiento": calentamiento,
+        "rondas_terminadas": rondas,
+        "puntaje_medio": float(np.mean(puntajes)) if puntajes else None,
+        "frames_detectados": game.frames_detectados,
+        "frames_seguidos": game.frames_seguidos,
+        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "entorno": {
+            "python": platform.python_version(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+            "maquina": platform.machine(),
+        },
+        "estadisticas": resumir(latencias),
+        "etapas": etapas,
+    }
+
+
+# -------------------------------
+# Informe y comparación
+# -------------------------------
+def imprimir(resultado):
+    e = resultado["estadisticas"]
+    print(f"Fuente: {resultado['fuente']}  {resultado['resolucion'][0]}x{resultado['resolucion'][1]}"
+          f"  semilla={resultado['semilla']}")
+    if e["frames"] == 0:
+        print("Sin frames medidos (¿calentamiento mayor que el vídeo?)")
+        return
+    print(f"Frames medidos: {e['frames']}  |  {e['fps']:.1f} frames/s  |  media {e['media_ms']:.2f} ms")
+    print("Latencia: " + "  ".join(f"p{p} {e[f'p{p}_ms']:.2f} ms" for p in PERCENTILES)
+          + f"  max {e['max_ms']:.2f} ms")
+    print(f"Rondas terminadas: {resultado['rondas_terminadas']}  |  "
+          f"cara detectada {resultado['frames_detectados']} / seguida {resultado['frames_seguidos']}")
+    if resultado.get("etapas"):
+        print("Etapas (ms):      media     p95     max")
+        for etapa, t in resultado["etapas"].items():
+            print(f"  {etapa:<12} {t['media_ms']:8.2f} {t['p95_ms']:7.2f} {t['max_ms']:7.2f}")
+
+
+def comparar(resultado, base, tolerancia=0.1):
+    """Imprime la diferencia con la referencia y devuelve False si hay regresión.
+
+    Es regresión si los frames/s bajan o el p99 sube más que `tolerancia`
+    (fracción, 0.1 = 10 %).
+    """
+    actual, ref = resultado["estadisticas"], base["estadisticas"]
+    if actual.get("frames", 0) == 0 or ref.get("frames", 0) == 0:
+        print("[WARN] No hay estadísticas para comparar")
+        return True
+    if base.get("fuente") != resultado["fuente"] or base.get("semilla") != resultado["semilla"]:
+        print("[WARN] La referencia se midió con otra fuente o semilla")
+
+    print("\nComparación con la referencia:")
+    for clave in ["fps", "media_ms"] + [f"p{p}_ms" for p in PERCENTILES] + ["max_ms"]:
+        cambio = (actual[clave] - ref[clave]) / ref[clave] * 100.0
+        print(f"  {clave:>9}: {ref[clave]:9.2f} -> {actual[clave]:9.2f}  ({cambio:+.1f} %)")
+
+    ok = (actual["fps"] >= ref["fps"] * (1.0 - tolerancia)
+          and actual["p99_ms"] <= ref["p99_ms"] * (1.0 + tolerancia))
+    print("Sin regresión" if ok else f"REGRESIÓN (tolerancia {tolerancia * 100:.0f} %)")
+    return ok
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark sin ventana de CrazyFruits")
+    parser.add_argument("fuente", help="vídeo grabado o carpeta con imágenes")
+    parser.add_argument("--frames", type=int, default=None, help="máximo de frames a reproducir")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--fps", type=float, default=30.0,
+                        help="frames por segundo de la fuente (ritmo de la simulación)")
+    parser.add_argument("--calentamiento", type=int, default=10,
+                        help="frames iniciales que no se miden")
+    parser.add_argument("--sin-espejo", action="store_true",
+                        help="no espejar los frames (si la grabación ya está espejada)")
+    parser.add_argument("--guardar-base", metavar="JSON", help="guarda el resultado como referencia")
+    parser.add_argument("--base", metavar="JSON", help="compara con una referencia guardada")
+    parser.add_argument("--tolerancia", type=float, default=0.1)
+    parser.add_argument("--csv", help="guarda los tiempos por etapa de cada frame")
+    parser.add_argument("--jugadores", type=int, default=1, help="jugadores simultáneos (una cara cada uno)")
+    args = parser.parse_args(argv)
+
+    # Los puntajes de las partidas del benchmark no van a la base del juego
+    with tempfile.TemporaryDirectory() as tmp:
+        score_manager.SCORES_DB = os.path.join(tmp, "scores.db")
+        score_manager.SCORES_FILE = os.path.join(tmp, "scores.json")
+        resultado = ejecutar(args.fuente, args.frames, args.semilla,
+                             args.calentamiento, espejo=not args.sin_espejo, ruta_csv=args.csv, fps=args.fps,
+                             jugadores=args.jugadores)
+        score_manager.vaciar_pendientes()
+
+    imprimir(resultado)
+
+    if args.guardar_base:
+        with open(args.guardar_base, "w", encoding="utf-8") as f:
+            json.dump(resultado, f, indent=4, ensure_ascii=False)
+        print(f"Referencia guardada en {args.guardar_base}")
+
+    if args.base:
+        with open(args.base, "r", encoding="utf-8") as f:
+            base = json.load(f)
+        if not comparar(resultado, base, args.tolerancia):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+"""
+Gobernador de calidad adaptativa.
+
+Los quioscos tienen equipos muy distintos: una configuración fija va lenta
+en los viejos o desaprovecha los nuevos. `Gobernador` mira el tiempo de
+trabajo de los últimos frames (sin contar la espera de la cámara) contra el
+presupuesto de un FPS objetivo y sube o baja un nivel de calidad cada vez.
+
+Con `MotorDeteccion` la detección corre en otro proceso y no aparece en el
+tiempo del bucle principal, así que el gobernador recibe además lo que tarda
+el motor por frame. Cada parte del nivel actúa en un sitio distinto:
+- bucle principal: partículas, destellos del menú y corazones (y la
+  detección, si no hay motor)
+- proceso del motor: intervalo y escala de la cara, cascade e intervalo de
+  la boca
+Se baja de nivel si cualquiera de los dos tiempos se pasa del presupuesto, y
+solo se sube si ambos tienen holgura.
+
+Hay histéresis: se baja de nivel en cuanto una ventana completa se pasa
+del presupuesto, pero solo se sube tras varias ventanas seguidas con
+holgura clara. Después de cada cambio la ventana se vacía para medir el
+nivel nuevo desde cero.
+
+Cada nivel (`NivelCalidad`) fija el intervalo y la escala de detección de
+la cara, los parámetros del cascade de boca, el presupuesto de partículas,
+los destellos del menú y cómo se dibujan las animaciones de corazones.
+"""
+
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import graphics
+from particulas import fijar_presupuesto
+
+NivelCalidad = namedtuple("NivelCalidad", [
+    "intervalo_deteccion",  # frames entre detecciones de cara (seguimiento en medio)
+    "escala_deteccion",     # escala del frame para el cascade de cara
+    "factor_boca",          # scaleFactor del cascade de boca
+    "intervalo_boca",       # frames entre estimaciones de la boca
+    "particulas",           # presupuesto global de partículas
+    "destellos",            # destellos animados del menú
+    "corazones",            # "completa", "simple" o "ninguna"
+])
+
+# De mayor (0) a menor calidad. El nivel 1 es la configuración por defecto.
+NIVELES = (
+    NivelCalidad(3, 0.5, 1.3, 1, 600, 20, "completa"),
+    NivelCalidad(5, 0.5, 1.5, 1, 600, 20, "completa"),
+    NivelCalidad(8, 0.45, 1.5, 2, 300, 10, "simple"),
+    NivelCalidad(12, 0.4, 1.7, 3, 100, 0, "ninguna"),
+)
+NIVEL_INICIAL = 1
+
+# Fracción del presupuesto por frame que dispara cada cambio
+UMBRAL_BAJAR = 1.0
+UMBRAL_SUBIR = 0.6
+# Ventanas seguidas con holgura necesarias para subir de nivel
+VENTANAS_PARA_SUBIR = 3
+
+
+def aplicar_global(config):
+    """Aplica los ajustes de un nivel que no dependen de la partida
+    (presupuesto de partículas, destellos del menú y corazones)."""
+    fijar_presupuesto(config.particulas)
+    graphics.fijar_destellos(config.destellos)
+    graphics.fijar_modo_corazones(config.corazones)
+
+
+class Gobernador:
+    """Ajusta el nivel de calidad para mantener `fps_objetivo`.
+
+    Uso (una vez por frame dibujado):
+        if gobernador.registrar(segundos_de_trabajo, segundos_de_deteccion):
+            aplicar(gobernador.config)    # cambió el nivel
+
+    `segundos_de_deteccion` es el tiempo del motor por frame, o None si no
+    hay motor (la detección ya está en el trabajo del bucle).
+
+    Atributos:
+    - nivel: índice actual en `NIVELES`
+    - config: `NivelCalidad` del nivel actual
+    - ajustes: historial de cambios (dicts con t, de, a, motivo y medida_ms)
+    """
+    def __init__(self, fps_objetivo=30, ventana=30, nivel=NIVEL_INICIAL, niveles=NIVELES):
+        self.fps_objetivo = fps_objetivo
+        self.presupuesto = 1.0 / fps_objetivo
+        self.niveles = niveles
+        self.nivel = nivel
+        self.ajustes = []
+        self._tiempos = np.zeros(ventana, dtype=np.float64)
+        self._deteccion = np.full(ventana, np.nan)
+        self._n = 0
+        self._holgura = 0
+        self._t0 = time.perf_counter()
+        aplicar_global(self.config)
+
+    @property
+    def config(self):
+        return self.niveles[self.nivel]
+
+    def registrar(self, trabajo, deteccion=None):
+        """Añade el tiempo de trabajo de un frame y, si hay motor, el de su
+        detección (segundos).
+
+        Devuelve True si con él cambió el nivel de calidad.
+        """
+        self._tiempos[self._n] = trabajo
+        self._deteccion[self._n] = np.nan if deteccion is None else deteccion
+        self._n += 1
+        if self._n < len(self._tiempos):
+            return False
+
+        self._n = 0
+        medida = float(self._tiempos.mean())
+        motivo = "lento"
+        if not np.isnan(self._deteccion).all():
+            medida_deteccion = float(np.nanmean(self._deteccion))
+            if medida_deteccion > medida:
+                medida, motivo = medida_deteccion, "deteccion lenta"
+        self._deteccion.fill(np.nan)
+
+        if medida > self.presupuesto * UMBRAL_BAJAR:
+            self._holgura = 0
+            if self.nivel < len(self.niveles) - 1:
+                return self._cambiar(self.nivel + 1, motivo, medida)
+        elif medida < self.presupuesto * UMBRAL_SUBIR:
+            self._holgura += 1
+            if self._holgura >= VENTANAS_PARA_SUBIR and self.nivel > 0:
+                return self._cambiar(self.nivel - 1, "holgura", medida)
+        else:
+            self._holgura = 0
+        return False
+
+    def _cambiar(self, nivel, motivo, medida):
+        ajuste = {
+            "t": round(time.perf_counter() - self._t0, 2),
+            "de": self.nivel,
+            "a": nivel,
+            "motivo": motivo,
+            "medida_ms": round(medida * 1000.0, 2),
+        }
+        self.ajustes.append(ajuste)
+        self.nivel = nivel
+        self._holgura = 0
+        aplicar_global(self.config)
+        print(f"[CALIDAD] nivel {ajuste['de']} -> {nivel} ({motivo}: {ajuste['medida_ms']} ms "
+              f"por frame, presupuesto {self.presupuesto * 1000.0:.1f} ms) {self.config}")
+        return True
@@ -4,9 +4,12 @@
 Utilities para inicializar y liberar la cámara usando OpenCV.
 
 Se centraliza aquí la configuración de la cámara (resolución por defecto)
-para que el resto del proyecto pueda reutilizarla fácilmente.
+para que el resto del proyecto pueda reutilizarla fácilmente. `LectorCamara`
+captura en segundo plano para que el bucle del juego nunca espere a la cámara.
 """
 
+import threading
+import time
 import cv2
 
 def inicializar_camara(cam_index=0, ancho=1280, alto=720):
@@ -31,4 +34,64 @@ def liberar_camara(cap):
     Recibe el objeto VideoCapture abierto.
     """
     cap.release()
-    cv2.destroyAllWindows()
\ No newline at end of file
+    cv2.destroyAllWindows()
+
+class LectorCamara:
+    """Lee la cámara en un hilo dedicado y conserva solo el frame más reciente.
+
+    El hilo llama a `cap.read()` sin parar, de modo que el buffer del driver
+    nunca acumula frames viejos. Cada frame capturado recibe un número de
+    secuencia creciente y la marca de tiempo (`time.perf_counter`) de su
+    captura; quien consume puede detectar los frames que se saltó comparando
+    secuencias.
+
+    Uso:
+        lector = LectorCamara(cap).iniciar()
+        seq, ts, frame = lector.leer()   # no bloquea
+        lector.detener()
+    """
+    def __init__(self, cap):
+        self.cap = cap
+        self._lock = threading.Lock()
+        self._frame = None
+        self._seq = 0
+        self._timestamp = 0.0
+        self._activo = False
+        self._hilo = None
+        self.terminado = False  # True si la cámara dejó de entregar frames
+
+    def iniciar(self):
+        """Arranca el hilo de captura y devuelve el propio lector."""
+        if self._hilo is None:
+            self._activo = True
+            self._hilo = threading.Thread(target=self._bucle, name="LectorCamara", daemon=True)
+            self._hilo.start()
+        return self
+
+    def _bucle(self):
+        while self._activo:
+            ret, frame = self.cap.read()
+            if not ret:
+                self.terminado = True
+                break
+            ts = time.perf_counter()
+            with self._lock:
+                self._frame = frame
+                self._seq += 1
+                self._timestamp = ts
+
+    def leer(self):
+        """Devuelve (seq, timestamp, frame) del frame más reciente sin bloquear.
+
+        `seq` es 0 y `frame` None mientras no haya llegado ningún frame. El
+        frame no debe modificarse en el sitio (se comparte con el hilo).
+        """
+        with self._lock:
+            return self._seq, self._timestamp, self._frame
+
+    def detener(self):
+        """Detiene el hilo de captura (no libera la cámara)."""
+        self._activo = False
+        if self._hilo is not None:
+            self._hilo.join(timeout=1.0)
+            self._hilo = None
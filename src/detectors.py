@@ -3,29 +3,414 @@
 """
 Herramientas para cargar clasificadores Haar Cascade y para detectar
 si la boca está abierta a partir de una ROI de la cara en escala de grises.
+
+`BuscadorCara` reduce el coste de la detección de rostro buscando en una
+versión reducida del frame y, mientras se siga viendo la cara, solo en una
+ventana alrededor de la última detección. `LocalizadorCara` añade un
+seguimiento barato (`SeguidorCara`) para que el cascade solo corra cada
+pocos frames. `LocalizadorCaras` hace lo mismo con varias caras a la vez
+(modo multijugador), manteniendo cada una en su hueco entre frames.
 """
 
+import math
 import os
+import time
 import cv2
+import numpy as np
+
+_cascades = None
+
 
 def cargar_cascades():
     """Carga los clasificadores necesarios (cara y boca) y los devuelve.
 
+    Se leen una sola vez por proceso; los procesos creados con fork después
+    de la primera carga (motor de detección, estaciones) heredan los mismos.
     Lanza RuntimeError si alguno no puede cargarse.
     """
+    global _cascades
+    if _cascades is not None:
+        return _cascades
     script_dir = os.path.dirname(os.path.abspath(__file__))
     mouth_cascade = cv2.CascadeClassifier(os.path.join(script_dir, "haarcascade_mcs_mouth.xml"))
     face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + "haarcascade_frontalface_default.xml")
     if mouth_cascade.empty() or face_cascade.empty():
         raise RuntimeError("No se pudieron cargar los cascades")
-    return face_cascade, mouth_cascade
+    _cascades = (face_cascade, mouth_cascade)
+    return _cascades
+
+class BuscadorCara:
+    """Búsqueda de rostro multirresolución restringida a la última posición.
+
+    - Detecta sobre el frame reducido por `escala` (un nivel de pirámide).
+    - Si hubo cara en la búsqueda anterior, busca solo en una ventana
+      ampliada `margen` veces su tamaño alrededor de ella, con `minSize` /
+      `maxSize` derivados del último rectángulo.
+    - Si la ventana falla, repite la búsqueda en el frame completo.
+
+    Cada llamada deja su coste en `ultima_medicion` (modo, ms y píxeles
+    analizados) y acumula totales por modo en `estadisticas`, para comparar
+    contra la búsqueda completa original (`escala=1.0, usar_ventana=False`).
+    """
+    def __init__(self, face_cascade, escala=0.5, margen=0.5, usar_ventana=True):
+        self.face_cascade = face_cascade
+        self.escala = escala
+        self.margen = margen
+        self.usar_ventana = usar_ventana
+        self.ultima = None
+        self.ultima_medicion = None
+        self.estadisticas = {}
+
+    def reiniciar(self):
+        """Olvida la última cara: la próxima búsqueda será completa."""
+        self.ultima = None
+
+    def buscar(self, gray):
+        """Devuelve la cara (x, y, w, h) en coordenadas del frame o None."""
+        inicio = time.perf_counter()
+        pixeles = 0
+        cara = None
+        modo = "completo"
+
+        if self.usar_ventana and self.ultima is not None:
+            modo = "ventana"
+            cara, pixeles = self.buscar_en_ventana(gray, self.ultima)
+            if cara is None:
+                modo = "ventana+completo"
+
+        if cara is None:
+            cara, px = self._buscar_completo(gray)
+            pixeles += px
+
+        self.ultima = cara
+        ms = (time.perf_counter() - inicio) * 1000.0
+        self.ultima_medicion = {"modo": modo, "ms": ms, "pixeles": pixeles, "encontrada": cara is not None}
+        total = self.estadisticas.setdefault(modo, {"busquedas": 0, "ms": 0.0, "pixeles": 0})
+        total["busquedas"] += 1
+        total["ms"] += ms
+        total["pixeles"] += pixeles
+        return cara
+
+    def buscar_todas(self, gray):
+        """Devuelve todas las caras del frame completo (coordenadas del frame).
+
+        Se usa en el modo multijugador, donde la ventana alrededor de una
+        sola cara no sirve.
+        """
+        inicio = time.perf_counter()
+        small = self._reducir(gray)
+        faces = self.face_cascade.detectMultiScale(small, 1.3, 5)
+        caras = [self._a_frame(f, 0, 0) for f in faces]
+        ms = (time.perf_counter() - inicio) * 1000.0
+        self.ultima_medicion = {"modo": "todas", "ms": ms, "pixeles": small.size, "encontrada": bool(caras)}
+        total = self.estadisticas.setdefault("todas", {"busquedas": 0, "ms": 0.0, "pixeles": 0})
+        total["busquedas"] += 1
+        total["ms"] += ms
+        total["pixeles"] += small.size
+        return caras
+
+    def _reducir(self, gray):
+        if self.escala == 1.0:
+            return gray
+        return cv2.resize(gray, None, fx=self.escala, fy=self.escala, interpolation=cv2.INTER_AREA)
+
+    def _buscar_completo(self, gray):
+        small = self._reducir(gray)
+        faces = self.face_cascade.detectMultiScale(small, 1.3, 5)
+        if len(faces) == 0:
+            return None, small.size
+        return self._a_frame(faces[0], 0, 0), small.size
+
+    def buscar_en_ventana(self, gray, ultima):
+        """Busca una cara en una ventana alrededor de `ultima` (x, y, w, h).
+
+        Devuelve (cara, píxeles analizados); cara es None si no aparece. Con
+        varias candidatas se queda con la más cercana a `ultima`.
+        """
+        x, y, w, h = ultima
+        alto, ancho = gray.shape[:2]
+        mx, my = int(w * self.margen), int(h * self.margen)
+        vx1, vy1 = max(0, x - mx), max(0, y - my)
+        vx2, vy2 = min(ancho, x + w + mx), min(alto, y + h + my)
+        small = self._reducir(gray[vy1:vy2, vx1:vx2])
+
+        lado = max(w, h) * self.escala
+        min_lado = max(1, int(lado * 0.75))
+        max_lado = max(min_lado + 1, int(lado * 1.35))
+        faces = self.face_cascade.detectMultiScale(
+            small, 1.1, 5, minSize=(min_lado, min_lado), maxSize=(max_lado, max_lado)
+        )
+        if len(faces) == 0:
+            return None, small.size
+
+        # Quedarse con la cara más cercana a la anterior
+        cx, cy = (x + w / 2 - vx1) * self.escala, (y + h / 2 - vy1) * self.escala
+        mejor = min(faces, key=lambda f: (f[0] + f[2] / 2 - cx) ** 2 + (f[1] + f[3] / 2 - cy) ** 2)
+        return self._a_frame(mejor, vx1, vy1), small.size
+
+    def _a_frame(self, cara, dx, dy):
+        """Convierte un rectángulo del nivel reducido a coordenadas del frame."""
+        fx, fy, fw, fh = cara
+        e = self.escala
+        return int(round(fx / e)) + dx, int(round(fy / e)) + dy, int(round(fw / e)), int(round(fh / e))
+
+class SeguidorCara:
+    """Seguimiento de la cara entre detecciones por correlación de plantilla.
+
+    Al iniciarse guarda el parche de la cara (reducido por `escala`) y en
+    cada frame lo busca con `cv2.matchTemplate` en una ventana ampliada
+    `margen` veces alrededor de la última posición. La confianza es el
+    máximo de la correlación normalizada (TM_CCOEFF_NORMED, de -1 a 1).
+    El tamaño del rectángulo no cambia hasta la siguiente detección.
+    """
+    def __init__(self, margen=0.25, escala=0.5):
+        self.margen = margen
+        self.escala = escala
+        self.cara = None
+        self._plantilla = None
+
+    @property
+    def activo(self):
+        return self.cara is not None
+
+    def iniciar(self, gray, cara):
+        """Toma la plantilla de la cara recién detectada."""
+        x, y, w, h = cara
+        tw, th = max(1, int(w * self.escala)), max(1, int(h * self.escala))
+        self._plantilla = cv2.resize(gray[y:y + h, x:x + w], (tw, th), interpolation=cv2.INTER_AREA)
+        self.cara = cara
+
+    def reiniciar(self):
+        self.cara = None
+        self._plantilla = None
+
+    def actualizar(self, gray):
+        """Devuelve (cara, confianza) en el frame actual; (None, 0.0) si no cabe."""
+        x, y, w, h = self.cara
+        alto, ancho = gray.shape[:2]
+        mx, my = int(w * self.margen), int(h * self.margen)
+        vx1, vy1 = max(0, x - mx), max(0, y - my)
+        vx2, vy2 = min(ancho, x + w + mx), min(alto, y + h + my)
+        ventana = cv2.resize(gray[vy1:vy2, vx1:vx2], None, fx=self.escala, fy=self.escala,
+                             interpolation=cv2.INTER_AREA)
+        th, tw = self._plantilla.shape[:2]
+        if ventana.shape[0] < th or ventana.shape[1] < tw:
+            return None, 0.0
+
+        res = cv2.matchTemplate(ventana, self._plantilla, cv2.TM_CCOEFF_NORMED)
+        _, confianza, _, (px, py) = cv2.minMaxLoc(res)
+        self.cara = (vx1 + int(round(px / self.escala)), vy1 + int(round(py / self.escala)), w, h)
+        return self.cara, confianza
+
+
+class LocalizadorCara:
+    """Detecta la cara periódicamente y la sigue entre detecciones.
+
+    El cascade (`BuscadorCara`) corre cada `intervalo_deteccion` frames o
+    cuando la confianza del seguidor baja de `umbral_confianza`; el resto de
+    frames la posición se actualiza con `SeguidorCara`. `frames_detectados`
+    y `frames_seguidos` cuentan cuántos frames usaron cada camino.
+    Con `intervalo_deteccion=1` se detecta en todos los frames.
+    """
+    def __init__(self, face_cascade, intervalo_deteccion=5, umbral_confianza=0.6):
+        self.buscador = BuscadorCara(face_cascade)
+        self.seguidor = SeguidorCara()
+        self.intervalo_deteccion = intervalo_deteccion
+        self.umbral_confianza = umbral_confianza
+        self.frames_detectados = 0
+        self.frames_seguidos = 0
+        self.confianza = 0.0
+        self._desde_deteccion = 0
+
+    def localizar(self, gray):
+        """Devuelve la cara (x, y, w, h) en el frame o None."""
+        if self.seguidor.activo and self._desde_deteccion < self.intervalo_deteccion - 1:
+            cara, self.confianza = self.seguidor.actualizar(gray)
+            if cara is not None and self.confianza >= self.umbral_confianza:
+                self._desde_deteccion += 1
+                self.frames_seguidos += 1
+                # La próxima detección buscará en una ventana alrededor de aquí
+                self.buscador.ultima = cara
+                return cara
+
+        cara = self.buscador.buscar(gray)
+        self.frames_detectados += 1
+        self._desde_deteccion = 0
+        if cara is not None:
+            self.seguidor.iniciar(gray, cara)
+            self.confianza = 1.0
+        else:
+            self.seguidor.reiniciar()
+            self.confianza = 0.0
+        return cara
+
+class LocalizadorCaras:
+    """Varias caras a la vez, cada una en un hueco fijo (un hueco por jugador).
+
+    Cada `intervalo_deteccion` frames, o cuando algún seguidor pierde
+    confianza, el cascade busca todas las caras del frame y cada una se
+    asigna al hueco cuya última cara está más cerca, para que un jugador
+    conserve su hueco aunque se mueva o desaparezca un momento. Las caras
+    nuevas ocupan los huecos libres en orden y las que sobran se ignoran.
+    Entre detecciones, cada hueco sigue su cara con su propio `SeguidorCara`.
+
+    La búsqueda en el frame completo es cara; solo se hace una de cada
+    `intervalo_completa` detecciones (para descubrir caras nuevas) o cuando
+    alguna cara conocida no aparece en la ventana alrededor de su posición.
+    """
+    def __init__(self, face_cascade, max_caras=2, intervalo_deteccion=5, umbral_confianza=0.6,
+                 intervalo_completa=4):
+        self.buscador = BuscadorCara(face_cascade, usar_ventana=False)
+        self.seguidores = [SeguidorCara() for _ in range(max_caras)]
+        self.max_caras = max_caras
+        self.intervalo_deteccion = intervalo_deteccion
+        self.umbral_confianza = umbral_confianza
+        self.intervalo_completa = intervalo_completa
+        self.frames_detectados = 0
+        self.frames_seguidos = 0
+        self.caras = [None] * max_caras
+        # Última posición vista en cada hueco (aunque ahora esté vacío)
+        self._ultimas = [None] * max_caras
+        self._desde_deteccion = 0
+
+    def localizar(self, gray):
+        """Devuelve una lista con la cara (x, y, w, h) o None de cada hueco."""
+        if any(self.caras) and self._desde_deteccion < self.intervalo_deteccion - 1:
+            seguidas = list(self.caras)
+            for i, seguidor in enumerate(self.seguidores):
+                if seguidor.activo:
+                    cara, confianza = seguidor.actualizar(gray)
+                    if cara is None or confianza < self.umbral_confianza:
+                        break
+                    seguidas[i] = cara
+            else:
+                self._desde_deteccion += 1
+                self.frames_seguidos += 1
+                self.caras = seguidas
+                return self.caras
+
+        self.frames_detectados += 1
+        self._desde_deteccion = 0
+        caras = None
+        if any(self.caras) and self.frames_detectados % self.intervalo_completa:
+            caras = self._buscar_conocidas(gray)
+        if caras is None:
+            caras = self._asignar(self.buscador.buscar_todas(gray))
+        self.caras = caras
+        for i, cara in enumerate(self.caras):
+            if cara is not None:
+                self.seguidores[i].iniciar(gray, cara)
+                self._ultimas[i] = cara
+            else:
+                self.seguidores[i].reiniciar()
+        return self.caras
+
+    def _buscar_conocidas(self, gray):
+        """Vuelve a detectar cada cara conocida en una ventana alrededor de
+        ella. Devuelve None si alguna no aparece (hace falta buscar en todo)."""
+        caras = list(self.caras)
+        for i, cara in enumerate(self.caras):
+            if cara is not None:
+                caras[i], _ = self.buscador.buscar_en_ventana(gray, cara)
+                if caras[i] is None:
+                    return None
+        return caras
+
+    def _asignar(self, caras):
+        """Reparte las caras detectadas entre los huecos (la más cercana primero)."""
+        huecos = [None] * self.max_caras
+        pares = []
+        for j, (x, y, w, h) in enumerate(caras):
+            for i, ultima in enumerate(self._ultimas):
+                if ultima is not None:
+                    ux, uy, uw, uh = ultima
+                    d = (x + w / 2 - ux - uw / 2) ** 2 + (y + h / 2 - uy - uh / 2) ** 2
+                    pares.append((d, i, j))
+        asignadas = set()
+        for _, i, j in sorted(pares):
+            if huecos[i] is None and j not in asignadas:
+                huecos[i] = caras[j]
+                asignadas.add(j)
+        libres = (i for i in range(self.max_caras) if huecos[i] is None and self._ultimas[i] is None)
+        for j, cara in enumerate(caras):
+            if j not in asignadas:
+                i = next(libres, None)
+                if i is None:
+                    break
+                huecos[i] = cara
+        return huecos
+
+def roi_boca(gray, cara):
+    """Recorta de la imagen gris la mitad inferior de la cara, donde está la boca."""
+    x, y, w, h = cara
+    return gray[y + int(h * 0.55):y + h, x:x + w]
+
+def punto_boca(cara):
+    """Punto (x, y) de la boca usado para atrapar frutas."""
+    x, y, w, h = cara
+    return x + w // 2, y + int(h * 0.75)
+
+# Tamaño canónico (ancho, alto) al que se lleva la ROI de la boca antes de
+# clasificarla; mantiene la proporción de la ROI (mitad inferior de la cara)
+# para que el coste no dependa de lo cerca que esté el jugador.
+TAM_ROI_BOCA = (120, 54)
+VECINOS_BOCA_CERRADA = 11
+# scaleFactor del cascade de boca con el que se calibró VECINOS_BOCA_CERRADA
+FACTOR_BOCA = 1.5
+
+def normalizar_roi_boca(face_roi_gray):
+    """Redimensiona la ROI de la boca al tamaño canónico `TAM_ROI_BOCA`."""
+    return cv2.resize(face_roi_gray, TAM_ROI_BOCA, interpolation=cv2.INTER_AREA)
+
+def estimar_apertura_boca(face_roi_gray, mouth_cascade, factor_escala=FACTOR_BOCA):
+    """Devuelve la apertura de la boca como un valor continuo entre 0 y 1.
+
+    El cascade de boca detecta sobre todo bocas cerradas. Se mira cuántas
+    detecciones vecinas apoyan al mejor candidato: con más de
+    `VECINOS_BOCA_CERRADA` la boca se considera cerrada (0.0), como hacía el
+    criterio original; con menos, la apertura crece hasta 1.0 cuando el
+    cascade no encuentra nada.
+
+    `factor_escala` es el scaleFactor del cascade: uno mayor analiza menos
+    escalas (más rápido). Los vecinos salen de escalas contiguas, así que el
+    umbral se ajusta en proporción al número de escalas analizadas.
+    """
+    if face_roi_gray is None or face_roi_gray.size == 0:
+        return 0.0
+    return _clasificar_boca(normalizar_roi_boca(face_roi_gray), mouth_cascade, factor_escala)
+
+def _clasificar_boca(roi, mouth_cascade, factor_escala):
+    """Apertura (0..1) de una ROI de boca ya llevada a `TAM_ROI_BOCA`.
+
+    Es el criterio común de `estimar_apertura_boca` y `estimar_aperturas_boca`.
+    """
+    _, vecinos = mouth_cascade.detectMultiScale2(roi, factor_escala, 1)
+    if len(vecinos) == 0:
+        return 1.0
+    umbral = VECINOS_BOCA_CERRADA * math.log(FACTOR_BOCA) / math.log(factor_escala)
+    apoyo = min(int(max(vecinos)) / (umbral + 1), 1.0)
+    return 1.0 - apoyo
+
+def estimar_aperturas_boca(gray, caras, mouth_cascade, factor_escala=FACTOR_BOCA, buffer=None):
+    """`estimar_apertura_boca` para todas las caras de un frame a la vez.
 
-def detectar_boca(face_roi_gray, mouth_cascade):
-    """Devuelve True si parece que la boca está abierta en la ROI.
+    Las ROI de las bocas se llevan al tamaño canónico dentro de un solo
+    buffer (n x alto x ancho, reutilizable con `buffer`). Devuelve una
+    apertura por cara (None donde la cara es None).
 
-    La heurística usada invierte la lógica del cascade (detectMultiScale
-    devuelve regiones con probabilidad de encontrar la boca cerrada), por eso
-    aquí se compara la longitud del resultado.
+    Las ROI se clasifican una por una: un mosaico con todas en una sola
+    llamada al cascade resultó más lento y cambiaba el número de vecinos
+    cerca de los bordes.
     """
-    mouths = mouth_cascade.detectMultiScale(face_roi_gray, 1.5, 11)
-    return len(mouths) == 0  # True si boca abierta
+    tw, th = TAM_ROI_BOCA
+    if buffer is None or buffer.shape[0] < len(caras):
+        buffer = np.empty((len(caras), th, tw), dtype=np.uint8)
+    aperturas = []
+    for i, cara in enumerate(caras):
+        roi = roi_boca(gray, cara) if cara is not None else None
+        if roi is None or roi.size == 0:
+            aperturas.append(None if cara is None else 0.0)
+            continue
+        cv2.resize(roi, TAM_ROI_BOCA, dst=buffer[i], interpolation=cv2.INTER_AREA)
+        aperturas.append(_clasificar_boca(buffer[i], mouth_cascade, factor_escala))
+    return aperturas
@@ -0,0 +1,319 @@
+"""
+Una estación de juego: cámara, ventana, menú y partida.
+
+`Estacion` reúne el estado que antes vivía en variables globales de
+main.py (estado del menú, nombre del jugador, sonidos, juego, motor de
+detección, perfilador, gobernador de calidad...). Así `main.py` ejecuta una
+estación y `estaciones.py` puede ejecutar varias, una por proceso, cada una
+con su cámara y su ventana.
+
+`ejecutar()` devuelve un código de salida: `SALIDA_NORMAL` si se salió desde
+el juego (tecla Q o botón SALIR) y `SALIDA_CAMARA` si la cámara no abrió,
+dejó de entregar frames o pasó `espera_camara` segundos sin un frame nuevo.
+"""
+
+import time
+
+import cv2
+
+from detectors import cargar_cascades
+from camera_utils import inicializar_camara, LectorCamara
+from motor_deteccion import MotorDeteccion
+from game import CrazyFruitsGame
+import graphics
+from sound_manager import SoundManager
+from sprites import precargar_sprites
+import score_manager
+from perfilador import Perfilador
+from calidad import Gobernador, NIVELES, NIVEL_INICIAL, aplicar_global
+from simulacion import GrabadorEntrada
+from grabador_video import GrabadorVideo
+
+MENU_OPCIONES = ["JUGAR", "SALIR"]
+TECLA_PERFIL = 9  # TAB
+
+# Códigos de salida de `Estacion.ejecutar` (y del proceso de cada estación)
+SALIDA_NORMAL = 0
+SALIDA_CAMARA = 3
+# Segundos sin frames nuevos tras los que se da la cámara por caída
+ESPERA_CAMARA = 5.0
+
+
+class Estacion:
+    """Una cámara, una ventana OpenCV y su partida.
+
+    Uso:
+        estacion = Estacion(camara=0)
+        codigo = estacion.ejecutar()     # bloquea hasta salir
+
+    Parámetros:
+    - camara: índice de la cámara
+    - ventana: título de la ventana OpenCV (único por estación)
+    - perfil_csv: CSV donde guardar los tiempos por etapa de cada frame
+    - fps_objetivo / calidad / calidad_fija: gobernador de calidad
+    - grabar_entrada: CSV donde guardar la boca de cada paso (ver simulacion.py)
+    - semilla: semilla de la aparición de frutas (None: al azar)
+    - jugadores: jugadores simultáneos, uno por cara
+    - grabar_video: carpeta donde guardar un vídeo por ronda (ver grabador_video.py)
+    - latido: valor compartido (`multiprocessing.RawValue("d")`) donde se
+      escribe `time.monotonic()` en cada vuelta del bucle, para que un
+      supervisor detecte una estación colgada
+    """
+    def __init__(self, camara=0, ventana="CrazyFruits", perfil_csv=None, fps_objetivo=30.0,
+                 calidad=NIVEL_INICIAL, calidad_fija=False, grabar_entrada=None, jugadores=1,
+                 grabar_video=None, semilla=None, latido=None, espera_camara=ESPERA_CAMARA):
+        self.camara = camara
+        self.ventana = ventana
+        self.perfil_csv = perfil_csv
+        self.fps_objetivo = fps_objetivo
+        self.calidad = calidad
+        self.calidad_fija = calidad_fija
+        self.grabar_entrada = grabar_entrada
+        self.jugadores = jugadores
+        self.grabar_video = grabar_video
+        self.semilla = semilla
+        self.latido = latido
+        self.espera_camara = espera_camara
+
+        # Menú
+        self.estado = "MENU"  # MENU, JUEGO, GAME_OVER, SALIR
+        self.menu_rects = []
+        self.campo_nombre_rect = (0, 0, 0, 0)
+        self.campo_activo = False
+        self.nombre_jugador = ""
+        self.vol_rect = (0, 0, 0, 0)
+
+        # Recursos (se crean en `ejecutar`)
+        self.face_cascade = self.mouth_cascade = None
+        self.w = self.h = 0
+        self.sonidos = None
+        self.game = None
+        self.motor = None
+        # Tiempos por etapa; el overlay se muestra/oculta con TAB
+        self.perfil = None
+        # Gobernador de calidad (None si la calidad es fija)
+        self.gobernador = None
+        # Entrada de cada paso para reproducirla con simulacion.py
+        self.grabador = None
+        # Vídeo de cada ronda (None si no se graba)
+        self.video = None
+
+    # -------------------------------
+    # Mouse y teclado
+    # -------------------------------
+    def click_event(self, event, x, y, flags, param):
+        """Manejador de eventos del mouse de la ventana OpenCV.
+
+        Detecta pulsaciones sobre:
+        - Icono de sonido (mute/unmute)
+        - Campo de texto del nombre
+        - Botones del menú (JUGAR, SALIR)
+        - Botón de reiniciar en pantalla de GAME_OVER
+
+        Las coordenadas del click se comparan contra rectángulos previamente
+        calculados y almacenados.
+        """
+        if event != cv2.EVENT_LBUTTONDOWN:
+            return
+
+        # --- Icono de sonido ---
+        x1, y1, x2, y2 = self.vol_rect
+        if x1 <= x <= x2 and y1 <= y <= y2:
+            if self.sonidos:
+                self.sonidos.toggle_mute()
+            return
+
+        # --- Campo de texto nombre ---
+        if self.estado == "MENU":
+            x1, y1, x2, y2 = self.campo_nombre_rect
+            if x1 <= x <= x2 and y1 <= y <= y2:
+                self.campo_activo = True
+                return
+            self.campo_activo = False
+
+            # --- Botones menú ---
+            for i, (bx1, by1, bx2, by2) in enumerate(self.menu_rects):
+                if bx1 <= x <= bx2 and by1 <= y <= by2:
+                    seleccion = MENU_OPCIONES[i]
+                    if seleccion == "JUGAR":
+                        self._jugar()
+                    elif seleccion == "SALIR":
+                        self.estado = "SALIR"
+
+        elif self.estado == "GAME_OVER":
+            if self.game and self.game.boton_reiniciar:
+                x1, y1, x2, y2 = self.game.boton_reiniciar
+                if x1 <= x <= x2 and y1 <= y <= y2:
+                    # Reinicio instantáneo: se reutilizan juego y sonidos ya cargados
+                    self.game.reset(self.nombre_jugador)
+                    if self.sonidos:
+                        self.sonidos.reanudar_musica()
+                    self.estado = "JUEGO"
+
+    def _jugar(self):
+        if self.game is None:
+            self.game = CrazyFruitsGame(self.face_cascade, self.mouth_cascade, self.w, self.h,
+                                        nombre_jugador=self.nombre_jugador, sonidos=self.sonidos,
+                                        motor=self.motor, perfilador=self.perfil,
+                                        semilla=self.semilla, grabador=self.grabador,
+                                        jugadores=self.jugadores)
+            self.game.aplicar_calidad(NIVELES[self.nivel_calidad()])
+        else:
+            self.game.reset(self.nombre_jugador)
+        self.estado = "JUEGO"
+
+    def nivel_calidad(self):
+        return self.gobernador.nivel if self.gobernador else self.calidad
+
+    def manejar_tecla(self, key):
+        """Procesa la tecla devuelta por `cv2.waitKey`.
+
+        Escribe en el campo del nombre cuando está activo y alterna el overlay
+        de tiempos con TAB. Devuelve False si el jugador pidió salir (tecla Q).
+        """
+        # --- Salir ---
+        if key in (ord('q'), ord('Q')):
+            return False
+
+        # --- Overlay de tiempos ---
+        if key == TECLA_PERFIL and self.perfil:
+            self.perfil.alternar()
+            return True
+
+        # --- Escribir nombre ---
+        if self.campo_activo and self.estado == "MENU":
+            if 32 <= key <= 126:
+                self.nombre_jugador += chr(key)
+            elif key in (8, 127):
+                self.nombre_jugador = self.nombre_jugador[:-1]
+        return True
+
+    # -------------------------------
+    # Bucle principal
+    # -------------------------------
+    def ejecutar(self):
+        """Inicializa los recursos, ejecuta el bucle principal y los libera.
+
+        - Carga los clasificadores en cascada (cara y boca) y los sprites de
+          frutas; si ya estaban cargados (estaciones.py los carga antes de
+          crear los procesos) se reutilizan.
+        - Inicia la cámara, el motor de detección y la ventana OpenCV.
+        - Maneja estados: MENU, JUEGO, GAME_OVER, SALIR.
+
+        Devuelve `SALIDA_NORMAL` o `SALIDA_CAMARA`.
+        """
+        self.face_cascade, self.mouth_cascade = cargar_cascades()
+        precargar_sprites()
+        score_manager.inicializar()
+        try:
+            cap = inicializar_camara(self.camara)
+        except RuntimeError as e:
+            print(f"[WARN] Cámara {self.camara}: {e}")
+            return SALIDA_CAMARA
+
+        ret, frame = cap.read()
+        if not ret:
+            print(f"[WARN] Cámara {self.camara}: no entrega frames")
+            cap.release()
+            return SALIDA_CAMARA
+
+        self.h, self.w = frame.shape[:2]
+        self.sonidos = SoundManager()
+        # Detección de cara/boca en un proceso aparte (no frena el render)
+        self.motor = MotorDeteccion(self.w, self.h, max_caras=self.jugadores)
+        cv2.namedWindow(self.ventana)
+        cv2.setMouseCallback(self.ventana, self.click_event)
+
+        # Captura en segundo plano: el bucle siempre toma el frame más reciente
+        lector = LectorCamara(cap).iniciar()
+        self.perfil = Perfilador(ruta_csv=self.perfil_csv)
+        if self.grabar_entrada:
+            self.grabador = GrabadorEntrada(self.grabar_entrada)
+        if self.grabar_video:
+            self.video = GrabadorVideo(self.grabar_video, fps=self.fps_objetivo)
+        if self.calidad_fija:
+            aplicar_global(NIVELES[self.calidad])
+        else:
+            self.gobernador = Gobernador(self.fps_objetivo, nivel=self.calidad)
+
+        try:
+            codigo = self._bucle(lector)
+        finally:
+            lector.detener()
+            self.perfil.cerrar()
+            if self.grabador:
+                self.grabador.cerrar()
+            if self.video:
+                self.video.cerrar()
+            self.motor.cerrar()
+            self.sonidos.cerrar()
+            cap.release()
+            cv2.destroyWindow(self.ventana)
+            score_manager.vaciar_pendientes()
+        return codigo
+
+    def _bucle(self, lector):
+        perfil = self.perfil
+        ultimo_seq = 0
+        ultimo_frame = time.monotonic()
+        while True:
+            ahora = time.monotonic()
+            if self.latido is not None:
+                self.latido.value = ahora
+            seq, _, frame = lector.leer()
+            if seq == ultimo_seq:
+                # Sin frame nuevo: atender la ventana y volver a mirar
+                if lector.terminado or ahora - ultimo_frame > self.espera_camara:
+                    print(f"[WARN] Cámara {self.camara}: sin frames nuevos")
+                    return SALIDA_CAMARA
+                if not self.manejar_tecla(cv2.waitKey(1) & 0xFF):
+                    return SALIDA_NORMAL
+                continue
+            ultimo_seq = seq
+            ultimo_frame = ahora
+            perfil.marca("captura")
+            frame = cv2.flip(frame, 1)
+            perfil.marca("espejo")
+
+            # Solo se graban los frames de juego; el que termina la ronda cierra su vídeo
+            grabar = fin_ronda = False
+            if self.estado == "MENU":
+                self.campo_nombre_rect = graphics.dibujar_menu(frame, MENU_OPCIONES, self.menu_rects,
+                                                               self.nombre_jugador)
+
+            elif self.estado == "JUEGO":
+                frame = self.game.procesar_frame(frame, seq=seq)
+                grabar = True
+                if self.game.game_over:
+                    self.estado = "GAME_OVER"
+                    fin_ronda = True
+
+            elif self.estado == "GAME_OVER":
+                self.game.mostrar_game_over(frame)
+
+            elif self.estado == "SALIR":
+                return SALIDA_NORMAL
+
+            # --- Icono de sonido ---
+            if self.sonidos:
+                self.vol_rect = graphics.dibujar_icono_sonido(frame, self.sonidos.muted,
+                                                              x=self.w - 70, y=20, tam=40)
+            perfil.dibujar(frame, extra=(f"calidad: nivel {self.nivel_calidad()}",))
+            perfil.marca("hud")
+            if grabar and self.video:
+                self.video.agregar(frame)
+                if fin_ronda:
+                    self.video.terminar_ronda()
+                perfil.marca("video")
+
+            cv2.imshow(self.ventana, frame)
+            perfil.marca("imshow")
+            key = cv2.waitKey(1) & 0xFF
+            perfil.marca("waitkey")
+            perfil.fin_frame()
+            if self.gobernador:
+                deteccion = self.game.duracion_deteccion if self.estado == "JUEGO" else None
+                if self.gobernador.registrar(perfil.trabajo, deteccion) and self.game:
+                    self.game.aplicar_calidad(self.gobernador.config)
+            if not self.manejar_tecla(key):
+                return SALIDA_NORMAL
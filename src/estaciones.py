@@ -0,0 +1,265 @@
+"""
+Varias estaciones de juego en una misma máquina, un proceso por cámara.
+
+Cada cámara tiene su `Estacion` (ventana, partida, sonido y motor de
+detección) en un proceso propio, así que una estación lenta o caída no
+frena a las demás. Antes de crear los procesos se cargan los cascades de
+Haar y los sprites de frutas; con el método de arranque fork (Linux) los
+procesos los heredan sin volver a leerlos y las páginas quedan compartidas
+mientras nadie las escriba. Donde no hay fork (Windows) cada proceso los
+carga al arrancar.
+
+`--cpus` fija la afinidad de cada estación (su motor de detección la
+hereda). Un `Supervisor` vigila los procesos: si una estación termina por
+un fallo de cámara, una excepción o deja de dar señales de vida, la vuelve
+a lanzar con espera creciente; si se salió desde el juego (tecla Q o
+SALIR) no la relanza. Una estación colgada recibe SIGTERM, que en el proceso
+se convierte en `SystemExit` para que `Estacion.ejecutar` cierre su motor de
+detección y su memoria compartida; si no termina en `ESPERA_TERMINAR`
+segundos se mata con SIGKILL (el motor se cierra solo al ver que su proceso
+padre murió).
+
+Uso:
+    python src/estaciones.py --camaras 0 1
+    python src/estaciones.py --camaras 0 1 2 --cpus 0,1 2,3 4-5
+
+Todas las estaciones guardan en la misma `scores.db` (SQLite en modo WAL).
+"""
+
+import argparse
+import multiprocessing as mp
+import os
+import signal
+import sys
+import time
+
+from detectors import cargar_cascades
+from sprites import precargar_sprites
+import score_manager
+from calidad import NIVELES, NIVEL_INICIAL
+from partida import MAX_JUGADORES
+from estacion import Estacion, SALIDA_NORMAL, SALIDA_CAMARA
+
+# Espera antes de relanzar una estación caída (se duplica en cada fallo seguido)
+ESPERA_REINICIO = 2.0
+ESPERA_REINICIO_MAX = 30.0
+# Una estación que aguantó este tiempo vuelve a empezar la cuenta de fallos
+TIEMPO_ESTABLE = 60.0
+# Segundos sin latido tras los que una estación se da por colgada
+TIEMPO_SIN_LATIDO = 10.0
+# Segundos que tiene una estación para cerrarse tras SIGTERM antes del SIGKILL
+ESPERA_TERMINAR = 5.0
+MAX_REINICIOS = 10
+INTERVALO_VIGILANCIA = 0.5
+
+
+# -------------------------------
+# Proceso de cada estación
+# -------------------------------
+def parsear_cpus(texto):
+    """Convierte "0,1" o "2-3" (o combinaciones) en un conjunto de CPUs."""
+    cpus = set()
+    for parte in texto.split(","):
+        if "-" in parte:
+            a, b = parte.split("-")
+            cpus.update(range(int(a), int(b) + 1))
+        elif parte:
+            cpus.add(int(parte))
+    return cpus
+
+
+def fijar_afinidad(cpus):
+    """Restringe el proceso actual (y los que cree) a las CPUs dadas."""
+    if not hasattr(os, "sched_setaffinity"):
+        print("[WARN] Este sistema no permite fijar la afinidad de CPU; se ignora --cpus")
+        return
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError as e:
+        print(f"[WARN] No se pudo fijar la afinidad {sorted(cpus)}: {e}")
+
+
+def _al_terminar(signum, frame):
+    """SIGTERM del supervisor: salir por `SystemExit` para que corran los `finally`."""
+    raise SystemExit(128 + signum)
+
+
+def _ejecutar_estacion(opciones, cpus, latido):
+    """Punto de entrada del proceso de una estación."""
+    signal.signal(signal.SIGTERM, _al_terminar)
+    if cpus:
+        fijar_afinidad(cpus)
+    score_manager.fijar_compartida()
+    sys.exit(Estacion(latido=latido, **opciones).ejecutar())
+
+
+# -------------------------------
+# Supervisor
+# -------------------------------
+class EstadoEstacion:
+    """Proceso actual, latido y cuenta de fallos de una estación."""
+    def __init__(self, opciones, cpus):
+        self.opciones = opciones
+        self.cpus = cpus
+        self.proceso = None
+        self.latido = None
+        self.inicio = 0.0
+        self.detenida_en = None  # momento del SIGTERM a un proceso colgado
+        self.fallos = 0
+        self.relanzar_en = 0.0   # momento del próximo arranque
+        self.terminada = False
+
+    @property
+    def nombre(self):
+        return self.opciones["ventana"]
+
+
+class Supervisor:
+    """Lanza un proceso por estación y relanza los que fallan.
+
+    Uso:
+        supervisor = Supervisor([(opciones, cpus), ...])
+        supervisor.ejecutar()    # bloquea hasta que terminen todas
+
+    `opciones` son los argumentos de `Estacion` y `cpus` el conjunto de
+    CPUs del proceso (o None). Con `max_reinicios` fallos seguidos una
+    estación se abandona.
+    """
+    def __init__(self, estaciones, max_reinicios=MAX_REINICIOS, contexto=None):
+        if contexto is None:
+            metodo = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+            contexto = mp.get_context(metodo)
+        self.contexto = contexto
+        self.max_reinicios = max_reinicios
+        self.estaciones = [EstadoEstacion(opciones, cpus) for opciones, cpus in estaciones]
+
+    def _lanzar(self, estacion):
+        estacion.latido = self.contexto.RawValue("d", 0.0)
+        estacion.proceso = self.contexto.Process(
+            target=_ejecutar_estacion,
+            args=(estacion.opciones, estacion.cpus, estacion.latido),
+            name=estacion.nombre,
+        )
+        estacion.proceso.start()
+        estacion.inicio = time.monotonic()
+        estacion.detenida_en = None
+        print(f"[INFO] {estacion.nombre}: proceso {estacion.proceso.pid}")
+
+    def _revisar(self, estacion, ahora):
+        """Atiende una estación: relanzarla, darla por terminada o por colgada."""
+        if estacion.terminada:
+            return
+        proceso = estacion.proceso
+        if proceso is None:
+            if ahora >= estacion.relanzar_en:
+                self._lanzar(estacion)
+            return
+
+        if proceso.is_alive():
+            if estacion.detenida_en is not None:
+                if ahora - estacion.detenida_en > ESPERA_TERMINAR:
+                    print(f"[WARN] {estacion.nombre}: no terminó tras SIGTERM; se mata")
+                    proceso.kill()
+                return
+            # El latido empieza a contar cuando la estación entra en su bucle
+            ultimo = estacion.latido.value
+            if ultimo and ahora - ultimo > TIEMPO_SIN_LATIDO:
+                print(f"[WARN] {estacion.nombre}: sin latido desde hace {ahora - ultimo:.0f} s; se detiene")
+                proceso.terminate()
+                estacion.detenida_en = ahora
+            return
+
+        proceso.join()
+        codigo = proceso.exitcode
+        estacion.proceso = None
+        if codigo == SALIDA_NORMAL:
+            print(f"[INFO] {estacion.nombre}: terminada")
+            estacion.terminada = True
+            return
+
+        motivo = "fallo de cámara" if codigo == SALIDA_CAMARA else f"código {codigo}"
+        if ahora - estacion.inicio >= TIEMPO_ESTABLE:
+            estacion.fallos = 0
+        estacion.fallos += 1
+        if estacion.fallos > self.max_reinicios:
+            print(f"[WARN] {estacion.nombre}: {motivo}; se abandona tras {self.max_reinicios} reinicios")
+            estacion.terminada = True
+            return
+        espera = min(ESPERA_REINICIO * 2 ** (estacion.fallos - 1), ESPERA_REINICIO_MAX)
+        estacion.relanzar_en = ahora + espera
+        print(f"[WARN] {estacion.nombre}: {motivo}; se relanza en {espera:.0f} s")
+
+    def ejecutar(self):
+        """Vigila las estaciones hasta que terminen todas (o Ctrl+C)."""
+        try:
+            while not all(e.terminada for e in self.estaciones):
+                ahora = time.monotonic()
+                for estacion in self.estaciones:
+                    self._revisar(estacion, ahora)
+                time.sleep(INTERVALO_VIGILANCIA)
+        except KeyboardInterrupt:
+            print("[INFO] Deteniendo estaciones")
+        finally:
+            self.detener()
+
+    def detener(self):
+        for estacion in self.estaciones:
+            if estacion.proceso is not None and estacion.proceso.is_alive():
+                estacion.proceso.terminate()
+        for estacion in self.estaciones:
+            if estacion.proceso is not None:
+                estacion.proceso.join(timeout=ESPERA_TERMINAR)
+                if estacion.proceso.is_alive():
+                    estacion.proceso.kill()
+                    estacion.proceso.join()
+                estacion.proceso = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Varias estaciones de CrazyFruits, una por cámara")
+    parser.add_argument("--camaras", type=int, nargs="+", default=[0], help="índices de las cámaras")
+    parser.add_argument("--cpus", nargs="*", default=[],
+                        help="CPUs de cada estación, en el orden de --camaras (p. ej. 0,1 2-3)")
+    parser.add_argument("--jugadores", type=int, default=1, choices=range(1, MAX_JUGADORES + 1),
+                        help="jugadores simultáneos por estación")
+    parser.add_argument("--fps-objetivo", type=float, default=30.0,
+                        help="frames por segundo que intenta sostener cada estación")
+    parser.add_argument("--calidad", type=int, default=NIVEL_INICIAL, choices=range(len(NIVELES)),
+                        help="nivel de calidad inicial (0 = máxima)")
+    parser.add_argument("--calidad-fija", action="store_true", help="no ajustar la calidad automáticamente")
+    parser.add_argument("--grabar-video", metavar="CARPETA",
+                        help="guarda un vídeo de cada ronda (una subcarpeta por cámara)")
+    parser.add_argument("--max-reinicios", type=int, default=MAX_REINICIOS,
+                        help="fallos seguidos tras los que se abandona una estación")
+    args = parser.parse_args(argv)
+
+    if len(args.cpus) > len(args.camaras):
+        parser.error("hay más grupos en --cpus que cámaras")
+    cpus = [parsear_cpus(c) for c in args.cpus]
+    cpus += [None] * (len(args.camaras) - len(cpus))
+
+    # Se cargan una vez aquí para que los procesos (con fork) los hereden
+    cargar_cascades()
+    precargar_sprites()
+    # La base se crea antes de los procesos para que no compitan importando el JSON
+    score_manager.inicializar()
+
+    estaciones = []
+    for camara, cpus_estacion in zip(args.camaras, cpus):
+        opciones = {
+            "camara": camara,
+            "ventana": f"CrazyFruits {camara}",
+            "fps_objetivo": args.fps_objetivo,
+            "calidad": args.calidad,
+            "calidad_fija": args.calidad_fija,
+            "jugadores": args.jugadores,
+        }
+        if args.grabar_video:
+            opciones["grabar_video"] = os.path.join(args.grabar_video, f"camara{camara}")
+        estaciones.append((opciones, cpus_estacion))
+    Supervisor(estaciones, args.max_reinicios).ejecutar()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
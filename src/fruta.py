@@ -1,86 +1,168 @@
 """
-Módulo de manejo de objetos `Fruta` y funciones de utilidad.
+Frutas en juego.
 
-Contiene la clase `Fruta` que encapsula posición, velocidad, tamaño y
-la imagen asociada que se dibuja en pantalla. Además hay utilidades para
-generar frutas aleatorias y detectar si una fruta ha sido atrapada por la boca.
+`PoolFrutas` guarda muchas frutas en arrays NumPy paralelos y las mueve,
+prueba y descarta en bloque; es lo que usa el juego en cada frame. El tamaño
+de cada fruta es el de su sprite (`tam_escalado`), de modo que el alcance de
+captura coincide con lo que se dibuja.
 """
 
 import random
-import os
-import cv2
+import numpy as np
 from tipo_fruta import TipoFruta
+from sprites import escala_actual
 
-class Fruta:
-    """Representa una fruta que cae en la pantalla.
+# -------------------------------
+# Pool de frutas (estructura de arrays)
+# -------------------------------
+# Tablas por id de tipo (posición en TipoFruta) para trabajar con arrays
+TIPOS = tuple(TipoFruta)
+TIPO_ID = {tipo: i for i, tipo in enumerate(TIPOS)}
+PUNTAJES = np.array([t.puntaje for t in TIPOS], dtype=np.int32)
+ID_MIX = TIPO_ID[TipoFruta.MIX]
+ID_BOMB = TIPO_ID[TipoFruta.BOMB]
 
-    Atributos:
-    - x, y: posiciones (float/int)
-    - tipo: miembro de `TipoFruta` (contiene metadatos como ruta de imagen)
-    - velocidad: velocidad vertical de caída
-    - tam: tamaño de referencia para dibujar/colisiones
-    - puntaje: valor que otorga cuando se come
-    - imagen: imagen redimensionada (si existe) con posible canal alfa
-    """
-    def __init__(self, x, y, tipo: TipoFruta, velocidad, tam, puntaje):
-        self.x = x
-        self.y = y
-        self.tipo = tipo # 'sandia', 'platano', 'manzana', etc.
-        self.velocidad = velocidad
-        self.tam = tam
-        self.puntaje = puntaje
-
-        # Intentar cargar la imagen asociada al tipo de fruta.
-        ruta = tipo.ruta_imagen
-        if os.path.exists(ruta):
-            img = cv2.imread(ruta, cv2.IMREAD_UNCHANGED)
-            if img is not None:
-                h, w = img.shape[:2]
-                escala = self.tam / max(h, w)
-                new_w, new_h = int(w * escala), int(h * escala)
-                self.imagen = cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-            else:
-                print(f"[WARN] No se pudo leer la imagen: {ruta}")
-                self.imagen = None
-        else:
-            print(f"[WARN] Imagen no encontrada: {ruta}")
-            self.imagen = None
-
-    def mover(self):
-        self.y += self.velocidad
-    
-    def fuera_de_pantalla(self, frame_height):
-        return self.y - self.tam // 2 > frame_height
 
+def tam_escalado(tipo: TipoFruta):
+    """Tamaño de una fruta del tipo, el mismo con el que se escala su sprite."""
+    return int(tipo.tam * escala_actual())
 
-def generar_fruta(frame_width, dificultad=1):
-    """
-    Genera una nueva fruta con atributos según el tipo.
-    La dificultad multiplica la velocidad base.
-    """
-    x = random.randint(50, frame_width - 50)
-    y = -40
-
-    tipo = random.choice(list(TipoFruta))  # elegimos una fruta aleatoria
-    vel_min, vel_max = tipo.vel_range
-    velocidad = random.uniform(vel_min, vel_max) * dificultad
-    puntaje = tipo.puntaje
 
-    return Fruta(x, y, tipo, velocidad, tipo.tam, puntaje)
+class PoolFrutas:
+    """Frutas activas guardadas en arrays NumPy paralelos.
 
+    En lugar de un objeto `Fruta` por fruta, cada atributo vive en su
+    propio array y las frutas vivas ocupan las primeras `n` posiciones:
+    - x, y: posición del centro (float32)
+    - velocidad: caída en píxeles por frame (float32)
+    - tam: tamaño de referencia (int32)
+    - tipo: id del tipo, índice en `TIPOS` (int16)
+    - vivo: máscara de frutas que siguen en juego
 
-def atrapada_por_boca(fruta, boca_x, boca_y, boca_radio, boca_abierta):
+    `paso` mueve, prueba capturas y descarta todas las frutas de una vez;
+    `paso_bocas` hace lo mismo con varias bocas (modo multijugador).
     """
-    Verifica si la fruta está cerca de la boca abierta.
-    El rango efectivo de atrape aumenta con el tamaño de la fruta.
-    """
-    if not boca_abierta:
-        return False
-
-    # Rango efectivo: boca_radio + parte proporcional al tamaño de la fruta
-    rango_efectivo = boca_radio + fruta.tam * 0.4
-
-    distancia = ((fruta.x - boca_x) ** 2 + (fruta.y - boca_y) ** 2) ** 0.5
-    return distancia <= rango_efectivo
-
+    def __init__(self, capacidad=64, rng=None):
+        self.n = 0
+        # Generador para `generar` (random.Random); por defecto el global de `random`
+        self.rng = rng if rng is not None else random
+        self._reservar(capacidad)
+
+    def _reservar(self, capacidad):
+        viejos = getattr(self, "x", None)
+        nuevos = {
+            "x": np.zeros(capacidad, dtype=np.float32),
+            "y": np.zeros(capacidad, dtype=np.float32),
+            "velocidad": np.zeros(capacidad, dtype=np.float32),
+            "tam": np.zeros(capacidad, dtype=np.int32),
+            "tipo": np.zeros(capacidad, dtype=np.int16),
+            "vivo": np.zeros(capacidad, dtype=bool),
+        }
+        for nombre, arr in nuevos.items():
+            if viejos is not None:
+                arr[:self.n] = getattr(self, nombre)[:self.n]
+            setattr(self, nombre, arr)
+        self.capacidad = capacidad
+
+    def __len__(self):
+        return self.n
+
+    def vaciar(self):
+        self.n = 0
+        self.vivo[:] = False
+
+    def agregar(self, tipo: TipoFruta, x, y, velocidad):
+        """Añade una fruta al final del pool (duplica la capacidad si hace falta)."""
+        if self.n == self.capacidad:
+            self._reservar(self.capacidad * 2)
+        i = self.n
+        self.x[i], self.y[i] = x, y
+        self.velocidad[i] = velocidad
+        self.tam[i] = tam_escalado(tipo)
+        self.tipo[i] = TIPO_ID[tipo]
+        self.vivo[i] = True
+        self.n += 1
+        return i
+
+    def generar(self, frame_width, dificultad=1):
+        """Añade una fruta de tipo aleatorio arriba de la pantalla.
+
+        La dificultad multiplica la velocidad base del tipo.
+        """
+        x = self.rng.randint(50, frame_width - 50)
+        tipo = self.rng.choice(TIPOS)
+        vel_min, vel_max = tipo.vel_range
+        return self.agregar(tipo, x, -40, self.rng.uniform(vel_min, vel_max) * dificultad)
+
+    def paso(self, boca_x, boca_y, boca_radio, boca_abierta, frame_height):
+        """Mueve todas las frutas, detecta capturas y las que salieron de pantalla.
+
+        Devuelve (atrapadas, perdidas): arrays de índices de las frutas
+        atrapadas por la boca y de las que cayeron fuera. Ambas quedan con
+        `vivo=False`; sus datos siguen accesibles por índice hasta llamar a
+        `compactar()`.
+        """
+        n = self.n
+        x, y, tam, vivo = self.x[:n], self.y[:n], self.tam[:n], self.vivo[:n]
+        y += self.velocidad[:n]
+
+        if boca_abierta and boca_x and boca_y:
+            # Rango efectivo: boca_radio + parte proporcional al tamaño (sin raíz cuadrada)
+            rango = boca_radio + tam * 0.4
+            dx, dy = x - boca_x, y - boca_y
+            atrapada = dx * dx + dy * dy <= rango * rango
+        else:
+            atrapada = np.zeros(n, dtype=bool)
+
+        fuera = ~atrapada & (y - tam // 2 > frame_height)
+        vivo &= ~(atrapada | fuera)
+        return np.flatnonzero(atrapada), np.flatnonzero(fuera)
+
+    def paso_bocas(self, bocas_x, bocas_y, abiertas, boca_radio, frame_height, rejilla):
+        """`paso` con varias bocas, usando una `RejillaEspacial`.
+
+        `bocas_x`/`bocas_y`/`abiertas` tienen un valor por boca (x None si
+        esa boca no está). Cada boca solo prueba las frutas de las celdas
+        vecinas; si una fruta está al alcance de varias, la atrapa la más
+        cercana. Devuelve (atrapadas, quien, perdidas), donde `quien[k]` es
+        la boca que atrapó la fruta `atrapadas[k]`.
+        """
+        n = self.n
+        x, y, tam, vivo = self.x[:n], self.y[:n], self.tam[:n], self.vivo[:n]
+        y += self.velocidad[:n]
+
+        quien = np.full(n, -1, dtype=np.intp)
+        mejor = np.full(n, np.inf, dtype=np.float32)
+        if n and any(abiertas):
+            rejilla.indexar(x, y)
+            for j, (bx, by, abierta) in enumerate(zip(bocas_x, bocas_y, abiertas)):
+                if not abierta or bx is None or by is None:
+                    continue
+                cand = rejilla.cercanos(bx, by)
+                if len(cand) == 0:
+                    continue
+                rango = boca_radio + tam[cand] * 0.4
+                dx, dy = x[cand] - bx, y[cand] - by
+                d2 = dx * dx + dy * dy
+                gana = (d2 <= rango * rango) & (d2 < mejor[cand])
+                mejor[cand[gana]] = d2[gana]
+                quien[cand[gana]] = j
+
+        atrapada = quien >= 0
+        fuera = ~atrapada & (y - tam // 2 > frame_height)
+        vivo &= ~(atrapada | fuera)
+        atrapadas = np.flatnonzero(atrapada)
+        return atrapadas, quien[atrapadas], np.flatnonzero(fuera)
+
+    def compactar(self):
+        """Elimina las frutas muertas moviendo las vivas al principio."""
+        n = self.n
+        vivas = np.flatnonzero(self.vivo[:n])
+        if len(vivas) == n:
+            return
+        m = len(vivas)
+        for arr in (self.x, self.y, self.velocidad, self.tam, self.tipo):
+            arr[:m] = arr[vivas]
+        self.vivo[:m] = True
+        self.vivo[m:n] = False
+        self.n = m
@@ -1,243 +1,501 @@
 """
 Lógica principal del juego: manejo de frutas, detección de boca y estados.
 
-Contiene la clase `CrazyFruitsGame` que encapsula el estado del juego,
-la física simple de las frutas, efectos visuales (partículas) y la
-gestión de vidas y puntaje.
+Contiene la clase `CrazyFruitsGame`, que une las reglas de la partida
+(`partida.Partida`: frutas, vidas, puntaje y dificultad) con la cámara, la
+detección de cara y boca, los efectos visuales (partículas), el sonido y
+el dibujo.
 """
 
 import cv2
-from fruta import TipoFruta, Fruta, generar_fruta, atrapada_por_boca
-from particulas import Particula
-from detectors import detectar_boca
-from vida import Vida
+import numpy as np
+from fruta import ID_MIX, ID_BOMB
+from particulas import EmisorParticulas
+from partida import Partida
+from detectors import (LocalizadorCara, LocalizadorCaras, roi_boca, punto_boca, estimar_apertura_boca,
+                       estimar_aperturas_boca, FACTOR_BOCA, TAM_ROI_BOCA)
 from score_manager import guardar_puntaje, obtener_mejores
 import graphics
-import threading
-import time
-import os
+from perfilador import PERFILADOR_NULO
+from reloj import RelojSimulacion
 
 BUFFER_SIZE = 5
+# Histéresis sobre la apertura media: abre por encima de uno, cierra por debajo del otro
+UMBRAL_ABRIR = 0.5
+UMBRAL_CERRAR = 0.3
 
-class CrazyFruitsGame:
+
+class EstadoBoca:
+    """Boca abierta o cerrada de un jugador, promediando las últimas aperturas.
+
+    Mantiene un buffer circular de las últimas `BUFFER_SIZE` aperturas
+    (reducción de ruido en detección) y usa histéresis: la boca pasa a
+    abierta cuando la media supera `UMBRAL_ABRIR` y vuelve a cerrada cuando
+    baja de `UMBRAL_CERRAR`.
+    """
+    def __init__(self):
+        self.estados = np.zeros(BUFFER_SIZE, dtype=np.float32)
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.estados[:] = 0.0
+        self._idx = 0
+        self.abierta = False
+
+    def actualizar(self, apertura):
+        """Añade una apertura (0..1) y devuelve si la boca está abierta."""
+        self.estados[self._idx] = float(apertura)
+        self._idx = (self._idx + 1) % BUFFER_SIZE
+        media = float(self.estados.mean())
+        if self.abierta:
+            self.abierta = media >= UMBRAL_CERRAR
+        else:
+            self.abierta = media > UMBRAL_ABRIR
+        return self.abierta
+
+
+class CrazyFruitsGame(Partida):
     """Clase que representa una sesión de juego.
 
-    Atributos clave:
-    - frutas: lista de objetos `Fruta` activos
-    - particulas: partículas para efectos visuales al comer
-    - vidas: instancia de `Vida` que controla la vida del jugador
-    - score: puntaje acumulado
+    Atributos clave (además de los de `Partida`: frutas, vidas, score...):
+    - particulas: `EmisorParticulas` para efectos visuales al comer
+    - motor: `MotorDeteccion` opcional que detecta cara/boca en otro proceso
+      (con varios jugadores, creado con `max_caras=jugadores`)
+    - localizador: `LocalizadorCara` que alterna detección y seguimiento
+      (configurable con `intervalo_deteccion` y `umbral_confianza`), o
+      `LocalizadorCaras` con varios jugadores; None con `motor`, que tiene
+      el suyo en el otro proceso
+    - bocas: `EstadoBoca` de cada jugador
+    - semilla: si se indica, la aparición de frutas y las partículas son
+      reproducibles (útil para benchmarks y para repetir rondas grabadas)
+    - perfil: `Perfilador` que cronometra cada etapa de `procesar_frame`
+    - reloj: `RelojSimulacion`; las frutas y partículas se mueven en pasos
+      fijos y, con `interpolar`, se dibujan adelantadas la fracción de paso
+      pendiente
     """
-    def __init__(self, face_cascade, mouth_cascade, frame_width, frame_height, nombre_jugador="Player", sonidos=None):
+    def __init__(self, face_cascade, mouth_cascade, frame_width, frame_height, nombre_jugador="Player", sonidos=None, motor=None,
+                 intervalo_deteccion=5, umbral_confianza=0.6, semilla=None,
+                 perfilador=None, interpolar=True, grabador=None, jugadores=1):
+        super().__init__(frame_width, frame_height, semilla, jugadores=jugadores)
         self.face_cascade = face_cascade
         self.mouth_cascade = mouth_cascade
-        self.frame_width = frame_width
-        self.frame_height = frame_height
-        self.nombre_jugador = nombre_jugador.strip() or "Player"
-
-        self.frutas = []
-        self.particulas = []
-        self.mouth_states = []
-        self.score = 0
-        self.vidas = Vida(4)
-        self.frame_counter = 0
-        self.generar_cada = 30 # Frutas cada n frames
-        self.dificultad = 1 
-        self.last_dificultad_time = time.time()
-        self.game_over = False
+        # MotorDeteccion opcional: si se pasa, la detección corre en otro proceso
+        self.motor = motor
+        self._seq_motor = 0
+        # Segundos que tardó el motor en su último frame (None sin motor o sin resultados)
+        self.duracion_deteccion = None
+        # Detección periódica de la cara y seguimiento barato entre detecciones
+        # (solo sin motor: con él la cara se busca en el otro proceso)
+        self.localizador = None
+        if motor is None and face_cascade is not None:
+            if jugadores == 1:
+                self.localizador = LocalizadorCara(face_cascade, intervalo_deteccion, umbral_confianza)
+            else:
+                self.localizador = LocalizadorCaras(face_cascade, jugadores, intervalo_deteccion, umbral_confianza)
         self.sonidos = sonidos
-
-    def boca_abierta_promediada(self, is_open):
-        """Mantiene un buffer de últimos estados de la boca y devuelve
-        si en promedio la boca está abierta (reducción de ruido en detección).
+        self.perfil = perfilador if perfilador is not None else PERFILADOR_NULO
+        # Parámetros del cascade de boca (los ajusta `aplicar_calidad`)
+        self.factor_boca = FACTOR_BOCA
+        self.intervalo_boca = 1
+        self._frames_boca = 0
+        # Física a paso fijo, independiente de los frames dibujados
+        self.reloj = RelojSimulacion()
+        self.interpolar = interpolar
+        # `simulacion.GrabadorEntrada` opcional: guarda la boca de cada paso
+        # (solo en partidas de un jugador)
+        self.grabador = grabador
+
+        # Recursos que se conservan entre partidas (los buffers se vacían en reset)
+        self.particulas = EmisorParticulas(rng=np.random.default_rng(semilla))
+        self.bocas = [EstadoBoca() for _ in range(jugadores)]
+        self._buffer_bocas = None
+
+        # Pantalla de Game Over: capa estática y TOP 5 consultado una vez
+        self._capa_game_over = graphics.CapaEstatica(self._renderizar_game_over)
+
+        # `reset` empieza la primera ronda; la que preparó `Partida.__init__`
+        # no se juega, así que la ronda 0 sigue usando `semilla`
+        self.ronda = -1
+        self.reset(nombre_jugador)
+
+    def reset(self, nombre_jugador=None):
+        """Prepara una nueva partida reutilizando todos los recursos cargados.
+
+        Conserva detectores, sprites, sonidos y buffers preasignados; solo
+        limpia el estado de la ronda: puntaje, vidas, frutas, partículas,
+        estado de la boca y temporizadores de dificultad.
+
+        Con varios jugadores, `nombre_jugador` puede traer un nombre por
+        jugador separado por comas ("Ana, Luis").
         """
-        self.mouth_states.append(is_open)
-        if len(self.mouth_states) > BUFFER_SIZE:
-            self.mouth_states.pop(0)
-        return sum(self.mouth_states) > BUFFER_SIZE // 2
+        if nombre_jugador is not None:
+            self.nombre_jugador = nombre_jugador.strip() or "Player"
+            if len(self.jugadores) == 1:
+                self.nombrar([self.nombre_jugador])
+            else:
+                self.nombrar([n.strip() for n in nombre_jugador.split(",")])
+
+        self.reiniciar_ronda()
+        if self.grabador is not None and len(self.jugadores) == 1:
+            # Un archivo por ronda, con lo necesario para repetirla en simulacion.py
+            self.grabador.nueva_ronda(self.semilla_ronda, self.frame_width, self.frame_height)
+        self.particulas.vaciar()
+        for boca in self.bocas:
+            boca.reiniciar()
+        self.reloj.reiniciar()
+        self._pasos_dibujados = 0
+
+        # Frames de cámara que se saltaron porque el juego iba más lento
+        self.ultimo_seq = None
+        self.frames_perdidos = 0
+
+        self.top = None
+        self.boton_reiniciar = None
+
+    @property
+    def frames_detectados(self):
+        """Frames en los que se ejecutó el cascade de cara."""
+        return self.localizador.frames_detectados if self.localizador else 0
+
+    @property
+    def frames_seguidos(self):
+        """Frames en los que la cara se actualizó con el seguidor."""
+        return self.localizador.frames_seguidos if self.localizador else 0
+
+    @property
+    def boca_abierta(self):
+        """Estado de la boca del primer jugador."""
+        return self.bocas[0].abierta
+
+    def boca_abierta_promediada(self, apertura):
+        """Añade una apertura de la boca del primer jugador (ver `EstadoBoca`)."""
+        return self.bocas[0].actualizar(apertura)
 
     def procesar_cara(self, frame):
-        """Detecta la cara y retorna la región de interés (ROI) en escala de grises
-        que se usará para detectar si la boca está abierta. Además dibuja
-        indicaciones en el frame (rectángulo de cara y punto de boca).
+        """Detecta la cara y el estado de la boca, y dibuja indicaciones en el
+        frame (rectángulo de cara y punto de boca).
+
+        Devuelve (frame, boca_x, boca_y, apertura). Si no hay cara boca_x y
+        boca_y son None. `apertura` (0..1) es None cuando no hay una
+        observación nueva de la boca (el motor de detección aún no publicó
+        otro resultado).
         """
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
-        if len(faces) > 0:
-            x, y, w, h = faces[0]
-            face_center_x = graphics.dibujar_face(frame, x, y, w, h)
-            boca_x = x + w // 2
-            boca_y = y + int(h * 0.75)
+        if self.motor is not None:
+            caras, aperturas = self._detectar_con_motor(frame)
+            cara, apertura = caras[0], aperturas[0]
+            self.perfil.marca("cara")
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            cara = self.localizador.localizar(gray)
+            self.perfil.marca("cara")
+            # La boca se estima cada `intervalo_boca` frames; en medio no hay observación
+            self._frames_boca += 1
+            apertura = None
+            if cara and self._frames_boca >= self.intervalo_boca:
+                apertura = estimar_apertura_boca(roi_boca(gray, cara), self.mouth_cascade, self.factor_boca)
+                self._frames_boca = 0
+            self.perfil.marca("boca")
+
+        if cara:
+            x, y, w, h = cara
+            graphics.dibujar_face(frame, x, y, w, h)
+            boca_x, boca_y = punto_boca(cara)
             graphics.dibujar_boca(frame, boca_x, boca_y)
-            face_roi_gray = gray[y + int(h * 0.55):y + h, x:x + w]
-            return frame, face_roi_gray, boca_x, boca_y
+            return frame, boca_x, boca_y, apertura
         else:
-            # Si no detecta cara, muestra un aviso y devuelve None en ROI
+            # Si no detecta cara, muestra un aviso
             sombra = (30, 30, 30)
             color = (255, 220, 100)
-            cv2.putText(frame, "Cara no detectada", (22, 42),
-                        cv2.FONT_HERSHEY_DUPLEX, 0.8, sombra, 2, cv2.LINE_AA)
-            cv2.putText(frame, "Cara no detectada", (20, 40),
-                        cv2.FONT_HERSHEY_DUPLEX, 0.8, color, 1, cv2.LINE_AA)
+            graphics.dibujar_texto(frame, "Cara no detectada", (20, 40), 0.8, color, 1, sombra=sombra)
             return frame, None, None, None
 
-    def aumentar_dificultad(self):
+    def procesar_caras(self, frame):
+        """`procesar_cara` para varios jugadores: una cara por hueco.
+
+        Devuelve (frame, puntos, aperturas): por jugador, el punto (x, y) de
+        su boca o None y su apertura o None. Las bocas de todas las caras se
+        clasifican juntas (`estimar_aperturas_boca`).
+        """
+        if self.motor is not None:
+            caras, aperturas = self._detectar_con_motor(frame)
+            self.perfil.marca("cara")
+        else:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            caras = self.localizador.localizar(gray)
+            self.perfil.marca("cara")
+            self._frames_boca += 1
+            aperturas = [None] * len(caras)
+            if any(caras) and self._frames_boca >= self.intervalo_boca:
+                if self._buffer_bocas is None:
+                    self._buffer_bocas = np.empty((len(caras), TAM_ROI_BOCA[1], TAM_ROI_BOCA[0]), dtype=np.uint8)
+                aperturas = estimar_aperturas_boca(gray, caras, self.mouth_cascade, self.factor_boca,
+                                                   self._buffer_bocas)
+                self._frames_boca = 0
+            self.perfil.marca("boca")
+
+        puntos = []
+        for i, (cara, jugador) in enumerate(zip(caras, self.jugadores)):
+            if cara is None or jugador.eliminado:
+                puntos.append(None)
+                continue
+            x, y, w, h = cara
+            color = graphics.COLORES_JUGADORES[i % len(graphics.COLORES_JUGADORES)]
+            graphics.dibujar_face(frame, x, y, w, h, color)
+            boca_x, boca_y = punto_boca(cara)
+            graphics.dibujar_boca(frame, boca_x, boca_y, color=color)
+            graphics.dibujar_texto(frame, jugador.nombre, (x, max(y - 10, 20)), 0.7, color, 1, sombra=(30, 30, 30))
+            puntos.append((boca_x, boca_y))
+        if not any(puntos):
+            graphics.dibujar_texto(frame, "Cara no detectada", (20, 40), 0.8, (255, 220, 100), 1,
+                                   sombra=(30, 30, 30))
+        return frame, puntos, aperturas
+
+    def _detectar_con_motor(self, frame):
+        """Envía el frame al `MotorDeteccion` y lee su último resultado.
+
+        Devuelve (caras, aperturas) con un valor por hueco. No espera al
+        detector: las caras devueltas pueden corresponder a un frame
+        anterior. El estado de las bocas solo se devuelve la primera vez que
+        se ve cada resultado, para no contarlo varias veces en el promedio.
         """
-        Aumenta progresivamente la dificultad del juego:
-        - Incrementa la velocidad de caída de las frutas (multiplicador)
-        - Disminuye el tiempo entre la generación de frutas
+        self.motor.enviar(frame)
+        res = self.motor.resultado()
+        nuevo = res.seq != self._seq_motor
+        self._seq_motor = res.seq
+        if res.seq:
+            self.duracion_deteccion = res.duracion
+        return res.caras, (res.aperturas if nuevo else (None,) * len(res.caras))
+
+    def aplicar_calidad(self, config):
+        """Aplica los parámetros de detección de un `calidad.NivelCalidad`.
+
+        Con `MotorDeteccion` los parámetros se envían al proceso detector.
         """
-        now = time.time()
-        # Cada 10 segundos reales: aumentar la dificultad y reducir la frecuencia de generación
-        if now - self.last_dificultad_time > 10:
-            self.dificultad += 0.3
-            if self.generar_cada > 10:
-                self.generar_cada -= 2
-            self.last_dificultad_time = now
-            print("[DIFICULTAD]:", self.dificultad, "Generar cada:", self.generar_cada)
-        return
-
-    def procesar_frame(self, frame):
+        self.factor_boca = config.factor_boca
+        self.intervalo_boca = config.intervalo_boca
+        if self.localizador is not None:
+            self.localizador.intervalo_deteccion = config.intervalo_deteccion
+            self.localizador.buscador.escala = config.escala_deteccion
+        if self.motor is not None:
+            self.motor.configurar(config.intervalo_deteccion, config.escala_deteccion,
+                                  config.factor_boca, config.intervalo_boca)
+
+    def sonar(self, evento):
+        """Encola un efecto de sonido para este frame (si hay gestor de sonido)."""
+        if self.sonidos:
+            self.sonidos.emitir(evento)
+
+    def registrar_seq(self, seq):
+        """Contabiliza los frames de cámara saltados a partir del número de secuencia."""
+        if seq is None:
+            return
+        if self.ultimo_seq is not None and seq > self.ultimo_seq + 1:
+            self.frames_perdidos += seq - self.ultimo_seq - 1
+        self.ultimo_seq = seq
+
+    def procesar_frame(self, frame, seq=None, dt=None):
         """Procesa un frame: detección de cara/boca, movimiento y colisiones de frutas,
         actualiza partículas, dibuja HUD y devuelve el frame modificado listo para mostrar.
+
+        La detección se hace una vez por frame; la simulación avanza los pasos
+        fijos que correspondan al tiempo transcurrido (ver `RelojSimulacion`),
+        que pueden ser cero o varios. `dt` fija ese tiempo en segundos en vez
+        de medirlo (para reproducir a ritmo constante).
+
+        `seq` es el número de secuencia que entrega `LectorCamara`; se usa para
+        contar los frames que se descartaron entre llamadas.
         """
-        self.aumentar_dificultad()
+        perfil = self.perfil
+        self.registrar_seq(seq)
         if self.game_over:
             self.mostrar_game_over(frame)
+            perfil.marca("hud")
             return frame
 
-        frame, face_roi_gray, boca_x, boca_y = self.procesar_cara(frame)
-
-        if face_roi_gray is not None:
-            is_open = detectar_boca(face_roi_gray, self.mouth_cascade)
-            boca_abierta = self.boca_abierta_promediada(is_open)
+        if len(self.jugadores) == 1:
+            frame, boca_x, boca_y, apertura = self.procesar_cara(frame)
+            puntos, aperturas = [(boca_x, boca_y) if boca_x is not None else None], [apertura]
         else:
-            boca_abierta = False
-
-        self.frame_counter += 1
-        if self.frame_counter % self.generar_cada == 0:
-            self.frutas.append(generar_fruta(frame.shape[1], self.dificultad))
-
-        nuevas_frutas = []
-
-        # --- Recorremos todas las frutas ---
-        for fruta in self.frutas:
-            fruta.mover()
-
-            atrapada = (
-                boca_x and boca_y and
-                atrapada_por_boca(fruta, boca_x, boca_y, 50, boca_abierta)
-            )
-
-            if atrapada:
-                if fruta.tipo == TipoFruta.MIX:
-                    self.vidas.ganar_vida()
-                    threading.Thread(target=self.sonidos.play_ganar, daemon=True).start()
-                elif fruta.tipo == TipoFruta.BOMB:
-                    self.vidas.perder_vida()
-                    threading.Thread(target=self.sonidos.play_perder, daemon=True).start()
-                else:
-                    self.score += fruta.puntaje
-                    threading.Thread(target=self.sonidos.play_comer, daemon=True).start()
-
-                # --- Efecto visual ---
-                self.particulas.extend([
-                    Particula(
-                        fruta.x, fruta.y,
-                        graphics.FRUTA_COLORES_BGR.get(fruta.tipo.name, (255, 255, 255))  # default blanco
-                    )
-                    for _ in range(15)
-                ])
-                continue
+            frame, puntos, aperturas = self.procesar_caras(frame)
 
-            elif fruta.fuera_de_pantalla(frame.shape[0]):
-                if fruta.tipo != TipoFruta.MIX and fruta.tipo != TipoFruta.BOMB:
-                    self.vidas.perder_vida()
-                    threading.Thread(target=self.sonidos.play_perder, daemon=True).start()
-                    if self.vidas.actual <= 0:
-                        guardar_puntaje(self.score, self.nombre_jugador)
-                        threading.Thread(target=self.sonidos.play_game_over, daemon=True).start()
-                        self.game_over = True
+        bocas = []
+        for boca, punto, apertura in zip(self.bocas, puntos, aperturas):
+            if punto is None:
+                boca.abierta = False
+                bocas.append((None, None, False))
                 continue
-
-            # --- Solo dibujar frutas activas ---
-            graphics.dibujar_fruta(frame, fruta)
-            nuevas_frutas.append(fruta)
-
-        self.frutas = nuevas_frutas
-
-        # --- Actualizar partículas ---
-        nuevas_particulas = []
-        for p in self.particulas:
-            p.mover()
-            if p.vida > 0:
-                graphics.dibujar_particula(frame, p)
-                nuevas_particulas.append(p)
-        self.particulas = nuevas_particulas
+            if apertura is not None:
+                boca.actualizar(apertura)
+            bocas.append((punto[0], punto[1], boca.abierta))
+        perfil.marca("boca")
+
+        # --- Simulación a paso fijo ---
+        for _ in range(self.reloj.avanzar(dt)):
+            self.paso_jugadores(bocas)
+            if self.game_over:
+                break
+        # Fracción de paso pendiente: se dibuja adelantando el movimiento
+        alfa = self.reloj.alfa if self.interpolar and not self.game_over else 0.0
+
+        graphics.dibujar_frutas(frame, self.frutas, alfa)
+        perfil.marca("frutas")
+        graphics.dibujar_particulas(frame, self.particulas, alfa)
+        perfil.marca("particulas")
+
+        # --- Sonidos del frame (fusionados) al hilo de audio ---
+        if self.sonidos:
+            self.sonidos.despachar()
 
         # --- Dibujar HUD ---
-        graphics.dibujar_puntaje(frame, self.score, x=20, y=80)
-        graphics.dibujar_vidas(frame, self.vidas.actual, x=20, y=120, animaciones=self.vidas.animaciones, animaciones_ganar=self.vidas.animaciones_ganar)
+        pasos = self._pasos_sin_dibujar()
+        if len(self.jugadores) == 1:
+            graphics.dibujar_puntaje(frame, self.score, x=20, y=80)
+            graphics.dibujar_vidas(frame, self.vidas.actual, x=20, y=120, animaciones=self.vidas.animaciones,
+                                   animaciones_ganar=self.vidas.animaciones_ganar, pasos=pasos)
+        else:
+            # Una columna por jugador: nombre, puntaje y corazones
+            for i, jugador in enumerate(self.jugadores):
+                x = 20 + i * 300
+                color = graphics.COLORES_JUGADORES[i % len(graphics.COLORES_JUGADORES)]
+                graphics.dibujar_marcador_jugador(frame, jugador.nombre, jugador.score, color,
+                                                  jugador.eliminado, x=x, y=80)
+                graphics.dibujar_vidas(frame, jugador.vidas.actual, x=x, y=120,
+                                       animaciones=jugador.vidas.animaciones,
+                                       animaciones_ganar=jugador.vidas.animaciones_ganar, pasos=pasos)
         # Dibujar dificultad
         dificultad_texto = f"Dificultad: {self.dificultad:.1f}"
-        cv2.putText(frame, dificultad_texto, (20, 200),
-            cv2.FONT_HERSHEY_DUPLEX, 0.6, (255, 200, 0), 1, cv2.LINE_AA)
-
+        graphics.dibujar_texto(frame, dificultad_texto, (20, 200), 0.6, (255, 200, 0), 1)
+        perfil.marca("hud")
 
         return frame
 
+    def _pasos_sin_dibujar(self):
+        """Pasos simulados desde el último HUD dibujado (avance de las animaciones)."""
+        pasos = self.reloj.pasos - self._pasos_dibujados
+        self._pasos_dibujados = self.reloj.pasos
+        return pasos
+
+    def paso_jugadores(self, bocas):
+        """Avanza la partida un paso fijo (ver `Partida.paso_jugadores`) y
+        las partículas."""
+        if self.grabador is not None and len(bocas) == 1:
+            self.grabador.registrar(*bocas[0])
+        super().paso_jugadores(bocas)
+        self.perfil.marca("fisica")
+
+        self.particulas.actualizar()
+        self.perfil.marca("particulas")
+
+    def al_atrapar(self, indices, tipos, quien):
+        es_mix = tipos == ID_MIX
+        es_bomba = tipos == ID_BOMB
+        # Un sonido por categoría y frame, aunque se atrapen varias frutas
+        if es_mix.any():
+            self.sonar("ganar")
+        if es_bomba.any():
+            self.sonar("perder")
+        if not (es_mix | es_bomba).all():
+            self.sonar("comer")
+
+        # --- Efecto visual: una ráfaga de 15 partículas por fruta ---
+        pool = self.frutas
+        self.particulas.emitir(pool.x[indices], pool.y[indices],
+                               graphics.COLORES_TIPOS[tipos], cantidad=15)
+
+    def al_perder(self, n):
+        self.sonar("perder")
+
+    def jugadores_puntuados(self):
+        """Jugadores cuyo puntaje cuenta: el único jugador o, con varios,
+        los que llegaron a aparecer en cámara."""
+        if len(self.jugadores) == 1:
+            return self.jugadores
+        return [j for j in self.jugadores if j.visto]
+
+    def al_terminar(self):
+        for jugador in self.jugadores_puntuados():
+            guardar_puntaje(jugador.score, jugador.nombre)
+        self.sonar("game_over")
+        print("[CAMARA] Frames descartados en la partida:", self.frames_perdidos)
+        print("[CARA] Detectados:", self.frames_detectados, "Seguidos:", self.frames_seguidos)
+
     def mostrar_game_over(self, frame):
-        gameover_path = os.path.join("assets", "icons", "gameOverBackground.png")
-        gameOverBackground = cv2.imread(gameover_path)
-        if gameOverBackground is None:
-            print("No se pudo cargar gameOverBackground, usando fondo negro.")
         """
         Muestra la pantalla de Game Over con fondo de frutas si se proporciona.
 
         Dibuja además el TOP 5 de puntajes y un botón para reiniciar la partida.
+        La pantalla es estática: se renderiza una vez en una capa cacheada y en
+        cada frame solo se copia. El TOP 5 se consulta una sola vez al entrar.
+        """
+        if self.top is None:
+            self.top = tuple((t["nombre"], t["score"]) for t in obtener_mejores(5))
+        resultados = tuple((j.nombre, j.score) for j in self.jugadores_puntuados())
+        self.boton_reiniciar = self._capa_game_over.dibujar(frame, resultados, self.top)
+
+    @staticmethod
+    def _renderizar_game_over(frame, resultados, top):
+        """Dibuja la parte estática de la pantalla de Game Over.
+
+        `resultados` son los (nombre, puntaje) de los jugadores de la ronda.
+        Devuelve el rectángulo del botón "VOLVER A JUGAR".
         """
         h, w = frame.shape[:2]
 
         # --- Fondo ---
+        gameOverBackground = graphics.cargar_fondo(graphics.GAME_OVER_BG_PATH, w, h)
         if gameOverBackground is not None:
-            # Redimensionar al tamaño del frame
-            fondo_resized = cv2.resize(gameOverBackground, (w, h))
-            frame[:] = fondo_resized
+            frame[:] = gameOverBackground
         else:
+            print("No se pudo cargar gameOverBackground, usando fondo negro.")
             frame[:] = (0, 0, 0)  # fallback negro
 
         font = cv2.FONT_HERSHEY_DUPLEX
+        dibujar_texto, medir_texto = graphics.dibujar_texto, graphics.medir_texto
 
         # --- Título ---
         title = "GAME OVER"
-        (tw, th), _ = cv2.getTextSize(title, font, 2, 4)
+        (tw, th), _ = medir_texto(title, 2, 4, font)
         cx, cy = (w - tw)//2, h//2 - 220
-        cv2.putText(frame, title, (cx+4, cy+4), font, 2, (50, 50, 50), 6, cv2.LINE_AA)  # sombra
-        cv2.putText(frame, title, (cx, cy), font, 2, (0, 0, 255), 4, cv2.LINE_AA)
-
-        # --- Nombre del jugador ---
-        jugador_text = f"Jugador: {self.nombre_jugador}"
-        (jw, jh), _ = cv2.getTextSize(jugador_text, font, 1, 2)
-        cv2.putText(frame, jugador_text, ((w - jw)//2, h//2 - 150), font, 1, (50, 30, 100), 2)  # violeta oscuro
-
-        # --- Puntaje final ---
-        final_score = f"Puntaje: {self.score}"
-        (sw, sh), _ = cv2.getTextSize(final_score, font, 1.5, 3)
-        cv2.putText(frame, final_score, ((w - sw)//2, h//2 - 90), font, 1.5, (39, 245, 42), 3)  # verde
+        dibujar_texto(frame, title, (cx, cy), 2, (0, 0, 255), 4, font,
+                      sombra=(50, 50, 50), grosor_sombra=6, desplazamiento=4)
+
+        if len(resultados) == 1:
+            nombre_jugador, score = resultados[0]
+            # --- Nombre del jugador ---
+            jugador_text = f"Jugador: {nombre_jugador}"
+            (jw, jh), _ = medir_texto(jugador_text, 1, 2, font)
+            dibujar_texto(frame, jugador_text, ((w - jw)//2, h//2 - 150), 1, (50, 30, 100), 2, font,
+                          linea=cv2.LINE_8)  # violeta oscuro
+
+            # --- Puntaje final ---
+            final_score = f"Puntaje: {score}"
+            (sw, sh), _ = medir_texto(final_score, 1.5, 3, font)
+            dibujar_texto(frame, final_score, ((w - sw)//2, h//2 - 90), 1.5, (39, 245, 42), 3, font,
+                          linea=cv2.LINE_8)  # verde
+        else:
+            # --- Puntaje de cada jugador, de mayor a menor ---
+            orden = sorted(resultados, key=lambda r: -r[1])
+            for i, (nombre, score) in enumerate(orden):
+                texto = f"{nombre}: {score}"
+                (jw, _), _ = medir_texto(texto, 1, 2, font)
+                color = (39, 160, 42) if i == 0 else (50, 30, 100)  # verde para el ganador
+                dibujar_texto(frame, texto, ((w - jw)//2, h//2 - 150 + i * 32), 1, color, 2, font,
+                              linea=cv2.LINE_8)
 
         # --- TOP 5 ---
-        top = obtener_mejores(5)
         top_title = "TOP 5"
-        (top_tw, _), _ = cv2.getTextSize(top_title, font, 1, 2)
-        cv2.putText(frame, top_title, ((w - top_tw)//2, h//2 - 20), font, 1, (0, 60, 150), 2)  # azul oscuro
+        (top_tw, _), _ = medir_texto(top_title, 1, 2, font)
+        dibujar_texto(frame, top_title, ((w - top_tw)//2, h//2 - 20), 1, (0, 60, 150), 2, font,
+                      linea=cv2.LINE_8)  # azul oscuro
 
         # Ajustar listado de jugadores centrado
-        for i, t in enumerate(top):
-            text = f"{i+1}. {t['nombre']} - {t['score']}"
-            (text_w, text_h), _ = cv2.getTextSize(text, font, 0.8, 2)
+        for i, (nombre, puntos) in enumerate(top):
+            text = f"{i+1}. {nombre} - {puntos}"
+            (text_w, text_h), _ = medir_texto(text, 0.8, 2, font)
             x = (w - text_w)//2
             y = h//2 + 40 + i*30
-            cv2.putText(frame, text, (x, y-15), font, 0.8, (80, 80, 80), 2)  # gris oscuro para buen contraste
+            dibujar_texto(frame, text, (x, y-15), 0.8, (80, 80, 80), 2, font,
+                          linea=cv2.LINE_8)  # gris oscuro para buen contraste
 
         # --- Botón volver a jugar ---
         btn_w, btn_h = 300, 70
@@ -253,9 +511,9 @@ class CrazyFruitsGame:
 
         # Texto centrado en el botón
         btn_text = "VOLVER A JUGAR"
-        (bw, bh), _ = cv2.getTextSize(btn_text, font, 1, 3)
+        (bw, bh), _ = medir_texto(btn_text, 1, 3, font)
         bx = btn_x1 + (btn_w - bw)//2
         by = btn_y1 + (btn_h + bh)//2 - 5
-        cv2.putText(frame, btn_text, (bx, by), font, 1, (0, 0, 0), 3)
+        dibujar_texto(frame, btn_text, (bx, by), 1, (0, 0, 0), 3, font, linea=cv2.LINE_8)
 
-        self.boton_reiniciar = (btn_x1, btn_y1, btn_x2, btn_y2)
\ No newline at end of file
+        return (btn_x1, btn_y1, btn_x2, btn_y2)
@@ -0,0 +1,126 @@
+"""
+Grabación de las rondas en vídeo sin frenar el bucle del juego.
+
+`cv2.VideoWriter.write` comprime cada frame y tarda varios milisegundos;
+hecho en el bucle principal, ese tiempo se sumaría a cada frame. Aquí el
+bucle solo deja el frame ya compuesto en una cola acotada y un hilo
+codificador lo escribe. Si el codificador se atrasa y la cola está llena,
+el frame se descarta y se cuenta, en vez de esperar.
+
+Cada ronda va a su propio archivo: `terminar_ronda()` (cuando `game_over`
+pasa a True) cierra el archivo actual y el siguiente frame abre uno nuevo.
+
+Uso:
+    video = GrabadorVideo("grabaciones", fps=30)
+    video.agregar(frame)        # no bloquea; no modificar el frame después
+    video.terminar_ronda()
+    video.cerrar()
+"""
+
+import os
+import queue
+import threading
+from datetime import datetime
+
+import cv2
+
+TAM_COLA_VIDEO = 16
+CODEC_VIDEO = "MJPG"
+EXTENSION_VIDEO = ".avi"
+
+# Marcas de la cola (además de los frames)
+_FIN_RONDA = "fin_ronda"
+_FIN = "fin"
+
+
+class GrabadorVideo:
+    """Escribe en `carpeta` un vídeo por ronda desde un hilo codificador.
+
+    Atributos (contadores):
+    - escritos: frames escritos en total
+    - descartados: frames descartados por cola llena en total
+    - archivos: rutas de los vídeos creados, en orden
+
+    Los frames se encolan por referencia: quien llama no debe modificarlos
+    después de `agregar` (el bucle del juego crea un frame nuevo en cada
+    vuelta). El vídeo se escribe a `fps` fijos, así que los frames
+    descartados lo aceleran un poco.
+    """
+    def __init__(self, carpeta, fps=30.0, codec=CODEC_VIDEO, extension=EXTENSION_VIDEO,
+                 tam_cola=TAM_COLA_VIDEO):
+        self.carpeta = carpeta
+        self.fps = fps
+        self.fourcc = cv2.VideoWriter_fourcc(*codec)
+        self.extension = extension
+        os.makedirs(carpeta, exist_ok=True)
+
+        self.escritos = 0
+        self.descartados = 0
+        self.archivos = []
+        self._descartados_ronda = 0  # solo lo toca el hilo que llama a agregar
+
+        self._cola = queue.Queue(maxsize=tam_cola)
+        self._hilo = threading.Thread(target=self._bucle, name="GrabadorVideo", daemon=True)
+        self._hilo.start()
+
+    # -------------------------------
+    # Hilo del juego
+    # -------------------------------
+    def agregar(self, frame):
+        """Encola un frame para la ronda actual; si la cola está llena lo descarta."""
+        try:
+            self._cola.put_nowait(frame)
+        except queue.Full:
+            self.descartados += 1
+            self._descartados_ronda += 1
+
+    def terminar_ronda(self):
+        """Cierra el vídeo de la ronda actual cuando se hayan escrito sus frames.
+
+        La marca no se descarta: si la cola está llena se espera a que el
+        codificador libere un hueco (una vez por ronda).
+        """
+        self._cola.put((_FIN_RONDA, self._descartados_ronda))
+        self._descartados_ronda = 0
+
+    def cerrar(self, timeout=5.0):
+        """Escribe lo que quede en la cola, cierra el vídeo y detiene el hilo."""
+        try:
+            self._cola.put((_FIN, self._descartados_ronda), timeout=timeout)
+        except queue.Full:
+            print("[WARN] El grabador de vídeo no responde; se pierden los frames en cola")
+        self._hilo.join(timeout=timeout)
+
+    # -------------------------------
+    # Hilo codificador
+    # -------------------------------
+    def _abrir(self, frame):
+        fecha = datetime.now().strftime("%Y%m%d-%H%M%S")
+        ruta = os.path.join(self.carpeta, f"ronda-{fecha}-{len(self.archivos) + 1:03d}{self.extension}")
+        h, w = frame.shape[:2]
+        escritor = cv2.VideoWriter(ruta, self.fourcc, self.fps, (w, h))
+        if not escritor.isOpened():
+            print(f"[WARN] No se pudo crear el vídeo {ruta}")
+            return None, ruta
+        self.archivos.append(ruta)
+        return escritor, ruta
+
+    def _bucle(self):
+        escritor, ruta, frames = None, None, 0
+        while True:
+            item = self._cola.get()
+            if isinstance(item, tuple):
+                marca, descartados = item
+                if escritor is not None:
+                    escritor.release()
+                    print(f"[VIDEO] {ruta}: {frames} frames, {descartados} descartados")
+                escritor, ruta, frames = None, None, 0
+                if marca == _FIN:
+                    break
+                continue
+            if ruta is None:
+                escritor, ruta = self._abrir(item)
+            if escritor is not None:
+                escritor.write(item)
+                frames += 1
+                self.escritos += 1
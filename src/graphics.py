@@ -2,17 +2,20 @@
 Funciones y utilidades para dibujar la UI del juego en frames OpenCV.
 
 Este módulo centraliza la lógica de renderizado: menú, HUD (puntaje/vidas),
-dibujado de frutas con transparencia, efectos de partículas y animaciones
-de corazones.
+textos cacheados, dibujado de frutas con transparencia, efectos de partículas
+y animaciones de corazones.
 """
 
 import cv2
 import os
 import random
 import math
+import functools
+from collections import OrderedDict, namedtuple
 import numpy as np
 
-from fruta import TipoFruta
+from fruta import TipoFruta, TIPOS
+from sprites import preparar_sprite, obtener_sprite
 
 # -------------------------------
 
@@ -25,17 +28,302 @@ ICON_PATH_OFF = os.path.join(SCRIPT_DIR, "../assets/icons/sound_off.png")
 ICON_ON = cv2.imread(ICON_PATH_ON, cv2.IMREAD_UNCHANGED)
 ICON_OFF = cv2.imread(ICON_PATH_OFF, cv2.IMREAD_UNCHANGED)
 FRUIT_BG_PATH = os.path.join(SCRIPT_DIR, "../assets/icons/fruit-background.jpg")
+GAME_OVER_BG_PATH = os.path.join(SCRIPT_DIR, "../assets/icons/gameOverBackground.png")
+
+# -------------------------------
+# Composición de sprites
+# -------------------------------
+def componer_sprite(frame, sprite, x, y, opacidad=1.0):
+    """Compone un `Sprite` premultiplicado sobre el frame, en el sitio.
+
+    (x, y) es la esquina superior izquierda y puede quedar fuera del frame:
+    el sprite se recorta a la zona visible en lugar de descartarse.
+    Toda la mezcla se hace en uint8 con OpenCV (destino * (255 - alfa) / 255
+    + color premultiplicado), sin matrices float intermedias.
+    """
+    fh, fw = frame.shape[:2]
+    x, y = int(x), int(y)
+    x1, y1 = max(x, 0), max(y, 0)
+    x2, y2 = min(x + sprite.ancho, fw), min(y + sprite.alto, fh)
+    if x1 >= x2 or y1 >= y2 or opacidad <= 0:
+        return
+
+    sx, sy = x1 - x, y1 - y
+    destino = frame[y1:y2, x1:x2]
+    color = sprite.color[sy:sy + (y2 - y1), sx:sx + (x2 - x1)]
+
+    if sprite.inv_alfa is None:
+        if opacidad >= 1.0:
+            destino[:] = color
+        else:
+            cv2.addWeighted(color, opacidad, destino, 1.0 - opacidad, 0, dst=destino)
+        return
+
+    inv_alfa = sprite.inv_alfa[sy:sy + (y2 - y1), sx:sx + (x2 - x1)]
+    if opacidad < 1.0:
+        color = cv2.convertScaleAbs(color, alpha=opacidad)
+        inv_alfa = cv2.bitwise_not(cv2.convertScaleAbs(cv2.bitwise_not(inv_alfa), alpha=opacidad))
+    cv2.multiply(destino, inv_alfa, dst=destino, scale=1 / 255.0)
+    cv2.add(destino, color, dst=destino)
+
+
+# -------------------------------
+# Capas estáticas (fondos de pantalla cacheados)
+# -------------------------------
+@functools.lru_cache(maxsize=8)
+def cargar_fondo(ruta, w, h):
+    """Lee una imagen de fondo y la redimensiona a (w, h) una sola vez.
+
+    Devuelve None si no se puede cargar.
+    """
+    img = cv2.imread(ruta)
+    if img is None:
+        return None
+    img = cv2.resize(img, (w, h))
+    img.setflags(write=False)
+    return img
+
+
+class CapaEstatica:
+    """Capa de fondo que se renderiza una vez y se copia en cada frame.
+
+    `renderizar(imagen, *args)` dibuja la parte estática de una pantalla
+    sobre `imagen` y devuelve datos asociados (rectángulos de botones, etc.).
+    La capa solo se vuelve a renderizar cuando cambian el tamaño del frame
+    o los argumentos recibidos.
+    """
+    def __init__(self, renderizar):
+        self._renderizar = renderizar
+        self._clave = None
+        self._imagen = None
+        self.datos = None
+
+    def dibujar(self, frame, *args):
+        """Copia la capa en el frame (re-renderizándola si hace falta) y devuelve sus datos."""
+        clave = (frame.shape, args)
+        if clave != self._clave:
+            self._imagen = np.zeros_like(frame)
+            self.datos = self._renderizar(self._imagen, *args)
+            self._clave = clave
+        np.copyto(frame, self._imagen)
+        return self.datos
+
+    def invalidar(self):
+        """Fuerza un nuevo renderizado en la próxima llamada a `dibujar`."""
+        self._clave = None
+
+# -------------------------------
+# Textos cacheados
+# -------------------------------
+FUENTE = cv2.FONT_HERSHEY_DUPLEX
+# Memoria máxima de los textos rasterizados (color + alfa)
+MEMORIA_TEXTOS = 8 * 1024 * 1024
+
+# sprite: `Sprite` con texto y sombra; dx, dy: desplazamiento de su esquina
+# superior izquierda respecto del origen de `cv2.putText`
+TextoRasterizado = namedtuple("TextoRasterizado", ["sprite", "dx", "dy", "bytes"])
+
+
+class CacheTexto:
+    """Caché LRU de textos rasterizados con un tope de memoria.
+
+    Cuando los bytes guardados superan `max_bytes` se descartan los textos
+    usados hace más tiempo. Un texto que por sí solo supera el tope se
+    devuelve sin guardarlo.
+
+    Atributos: bytes, aciertos, fallos, descartados.
+    """
+    def __init__(self, max_bytes=MEMORIA_TEXTOS):
+        self.max_bytes = max_bytes
+        self._textos = OrderedDict()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.descartados = 0
+
+    def __len__(self):
+        return len(self._textos)
+
+    def obtener(self, clave, crear):
+        """Devuelve el texto de `clave`, creándolo con `crear()` si no está."""
+        texto = self._textos.get(clave)
+        if texto is not None:
+            self._textos.move_to_end(clave)
+            self.aciertos += 1
+            return texto
+
+        self.fallos += 1
+        texto = crear()
+        if texto.bytes > self.max_bytes:
+            return texto
+        self._textos[clave] = texto
+        self.bytes += texto.bytes
+        while self.bytes > self.max_bytes:
+            _, viejo = self._textos.popitem(last=False)
+            self.bytes -= viejo.bytes
+            self.descartados += 1
+        return texto
+
+    def vaciar(self):
+        self._textos.clear()
+        self.bytes = 0
+
+
+cache_textos = CacheTexto()
+
+
+@functools.lru_cache(maxsize=256)
+def medir_texto(texto, escala, grosor=1, fuente=FUENTE):
+    """`cv2.getTextSize` cacheado: devuelve ((ancho, alto), baseline)."""
+    return cv2.getTextSize(texto, fuente, escala, grosor)
+
+
+def _rasterizar_texto(texto, fuente, escala, color, grosor, sombra, grosor_sombra, desplazamiento, linea):
+    """Dibuja sombra y texto en un lienzo propio y los convierte en `Sprite`.
+
+    Las dos capas se componen con su cobertura como alfa, que es lo mismo
+    que hace `cv2.putText` al dibujar sobre el frame.
+    """
+    (w, h), base = medir_texto(texto, escala, max(grosor, grosor_sombra), fuente)
+    margen = max(grosor, grosor_sombra) // 2 + 2
+    d = desplazamiento if sombra is not None else 0
+    alto, ancho = h + base + d + 2 * margen, w + d + 2 * margen
+    origen = (margen, margen + h)
+
+    color_acum = np.zeros((alto, ancho, 3), dtype=np.float32)
+    alfa_acum = np.zeros((alto, ancho, 1), dtype=np.float32)
+    capas = [(color, grosor, origen)]
+    if sombra is not None:
+        capas.insert(0, (sombra, grosor_sombra, (origen[0] + d, origen[1] + d)))
+    for bgr, g, (ox, oy) in capas:
+        mascara = np.zeros((alto, ancho), dtype=np.uint8)
+        cv2.putText(mascara, texto, (ox, oy), fuente, escala, 255, g, linea)
+        a = mascara[:, :, None].astype(np.float32) / 255.0
+        color_acum = np.float32(bgr) * a + color_acum * (1.0 - a)
+        alfa_acum = a + alfa_acum * (1.0 - a)
+
+    # Sprite espera BGRA sin premultiplicar
+    bgr = np.divide(color_acum, alfa_acum, out=np.zeros_like(color_acum), where=alfa_acum > 0)
+    bgra = np.dstack([bgr, alfa_acum * 255.0])
+    sprite = preparar_sprite(np.clip(bgra + 0.5, 0, 255).astype(np.uint8))
+    n_bytes = sprite.color.nbytes + sprite.inv_alfa.nbytes
+    return TextoRasterizado(sprite, -origen[0], -origen[1], n_bytes)
+
+
+def dibujar_texto(frame, texto, org, escala, color, grosor=1, fuente=FUENTE,
+                  sombra=None, grosor_sombra=None, desplazamiento=2, linea=cv2.LINE_AA):
+    """Equivalente a `cv2.putText` (más una sombra opcional) con caché.
+
+    `org` es el mismo origen que en `cv2.putText` (izquierda de la línea
+    base). Si se da `sombra`, primero se dibuja el texto en ese color
+    desplazado `desplazamiento` píxeles hacia abajo y a la derecha, con
+    `grosor_sombra` (por defecto grosor + 1). Cada combinación de texto,
+    fuente, escala, grosores y colores se rasteriza una sola vez; después
+    dibujarla es una composición de sprite.
+    """
+    if grosor_sombra is None:
+        grosor_sombra = grosor + 1 if sombra is not None else grosor
+    clave = (texto, fuente, escala, color, grosor, sombra, grosor_sombra, desplazamiento, linea)
+    r = cache_textos.obtener(clave, lambda: _rasterizar_texto(
+        texto, fuente, escala, color, grosor, sombra, grosor_sombra, desplazamiento, linea))
+    componer_sprite(frame, r.sprite, org[0] + r.dx, org[1] + r.dy)
+
+# -------------------------------
+# Tablas precalculadas de corazones
+# -------------------------------
+FRAMES_PERDER = 12  # duración de la animación de pérdida
+FRAMES_GANAR = 30   # duración de la animación de ganancia (latido, partículas y fundido)
+NUM_PARTICULAS_GANAR = 20
+TAM_CORAZON = 44
+
+
+def _escalar_corazon(tam, escala=1.0):
+    """Redimensiona `HEART_IMG` para que su lado mayor mida `tam * escala`."""
+    h, w = HEART_IMG.shape[:2]
+    new_w = max(1, int(w * tam * escala / max(h, w)))
+    new_h = max(1, int(h * tam * escala / max(h, w)))
+    return preparar_sprite(cv2.resize(HEART_IMG, (new_w, new_h), interpolation=cv2.INTER_AREA))
+
+
+def _curva_perder(t):
+    """Escala y opacidad de la animación de pérdida para t en [0, 1]."""
+    # Curva de escala (más rápida y con un segundo pulso corto)
+    if t < 0.25:
+        escala = 1.0 + 0.3 * (t / 0.25)         # crece rápido
+    elif t < 0.45:
+        escala = 1.3 - 0.25 * ((t - 0.25) / 0.2) # se encoge un poco
+    elif t < 0.65:
+        escala = 1.05 + 0.2 * ((t - 0.45) / 0.2) # segundo pulso corto
+    else:
+        escala = 1.25 + 0.4 * ((t - 0.65) / 0.35) # se expande y desvanece
+
+    # Opacidad: visible casi todo el tiempo, luego se desvanece suave
+    opacidad = 1.0 if t < 0.75 else max(0, 1.0 - (t - 0.75) / 0.25)
+    return escala, opacidad
+
+
+def _curva_ganar(t):
+    """Escala y opacidad de la animación de ganancia para t en [0, 1]."""
+    escala = 1.0 + 0.5 * math.sin(math.pi * t * 2)  # dos pulsos rápidos
+    opacidad = 1.0 if t < 0.8 else max(0, 1.0 - (t - 0.8)/0.2)
+    return escala, opacidad
+
+
+class TablasCorazon:
+    """Sprites y parámetros de las animaciones de corazón para un tamaño dado.
+
+    Atributos:
+    - sprite: corazón escalado a `tam` (None si no hay imagen)
+    - perder / ganar: por frame, tupla (sprite, opacidad, escala)
+    - particulas_ganar: por frame, tupla (offsets Nx2 desde el centro, color)
+    """
+    def __init__(self, tam):
+        self.tam = tam
+        self.sprite = _escalar_corazon(tam) if HEART_IMG is not None else None
+        self.perder = [self._fotograma(tam, *_curva_perder(f / FRAMES_PERDER))
+                       for f in range(FRAMES_PERDER + 1)]
+        self.ganar = [self._fotograma(tam, *_curva_ganar(f / FRAMES_GANAR))
+                      for f in range(FRAMES_GANAR + 1)]
+
+        # --- Explosión de partículas alrededor del corazón ---
+        base = 2 * math.pi * np.arange(NUM_PARTICULAS_GANAR) / NUM_PARTICULAS_GANAR
+        self.particulas_ganar = []
+        for f in range(FRAMES_GANAR + 1):
+            t = f / FRAMES_GANAR
+            angulos = base + f * 0.2
+            radio_max = tam * (1.5 + t*2)  # partículas se expanden
+            offsets = np.stack([np.cos(angulos), np.sin(angulos)], axis=1) * radio_max
+            intensidad = int(255 * (1 - t))
+            self.particulas_ganar.append((offsets.astype(np.int32), (intensidad, 255, intensidad)))
+
+    def _fotograma(self, tam, escala, opacidad):
+        sprite = _escalar_corazon(tam, escala) if HEART_IMG is not None else None
+        return sprite, opacidad, escala
+
+
+@functools.lru_cache(maxsize=4)
+def tablas_corazon(tam=TAM_CORAZON):
+    """Devuelve (y construye la primera vez) las tablas para un tamaño."""
+    return TablasCorazon(tam)
+
+
+# Se construyen al cargar el módulo para que el HUD no redimensione en el bucle
+tablas_corazon(TAM_CORAZON)
 
 # -------------------------------
 # Dibujo de cara y boca
 # -------------------------------
-def dibujar_face(frame, x, y, w, h):
+# Color de cada jugador en el modo multijugador (cara, nombre y marcador)
+COLORES_JUGADORES = ((255, 150, 0), (0, 140, 255), (200, 60, 220), (60, 200, 60))
+
+
+def dibujar_face(frame, x, y, w, h, color=(255, 150, 0)):
     """Dibuja un rectángulo sobre la cara y una línea vertical central.
 
     Devuelve la coordenada X central de la cara (útil para alinear elementos).
     """
     face_center_x = x + w // 2
-    cv2.rectangle(frame, (x, y), (x + w, y + h), (255, 150, 0), 2)
+    cv2.rectangle(frame, (x, y), (x + w, y + h), color, 2)
     cv2.line(frame, (face_center_x, 0), (face_center_x, frame.shape[0]), (0, 255, 255), 1)
     return face_center_x
 
@@ -57,29 +345,7 @@ def dibujar_corazon(frame, x, y, tam=42):
         cv2.circle(frame, (x + tam // 2, y + tam // 2), 12, (0, 0, 255), -1)
         return
 
-    h, w = HEART_IMG.shape[:2]
-    escala = tam / max(h, w)
-    new_w, new_h = int(w * escala), int(h * escala)
-    heart_resized = cv2.resize(HEART_IMG, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-    x1, y1 = x, y
-    x2, y2 = x1 + new_w, y1 + new_h
-    if x1 < 0 or y1 < 0 or x2 > frame.shape[1] or y2 > frame.shape[0]:
-        return
-
-    heart_crop = heart_resized[:(y2 - y1), :(x2 - x1)]
-
-    # Combinar con alfa
-    if heart_crop.shape[2] == 4:
-        alpha_s = heart_crop[:, :, 3] / 255.0
-        alpha_l = 1.0 - alpha_s
-        for c in range(3):
-            frame[y1:y2, x1:x2, c] = (
-                alpha_s * heart_crop[:, :, c] +
-                alpha_l * frame[y1:y2, x1:x2, c]
-            )
-    else:
-        frame[y1:y2, x1:x2] = heart_crop[:, :, :3]
+    componer_sprite(frame, tablas_corazon(tam).sprite, x, y)
 
 
 # -------------------------------
@@ -89,88 +355,53 @@ def dibujar_animacion_corazon(frame, x, y, tam=44, frame_idx=0):
     """
     Animación rápida de pérdida de vida: doble latido ágil + desvanecimiento elegante.
     """
-    total_frames = 12  # duración más corta → latido más rápido
-    t = frame_idx / total_frames
-
-    # Curva de escala (más rápida y con un segundo pulso corto)
-    if t < 0.25:
-        escala = 1.0 + 0.3 * (t / 0.25)         # crece rápido
-    elif t < 0.45:
-        escala = 1.3 - 0.25 * ((t - 0.25) / 0.2) # se encoge un poco
-    elif t < 0.65:
-        escala = 1.05 + 0.2 * ((t - 0.45) / 0.2) # segundo pulso corto
-    else:
-        escala = 1.25 + 0.4 * ((t - 0.65) / 0.35) # se expande y desvanece
-
-    # Opacidad: visible casi todo el tiempo, luego se desvanece suave
-    opacidad = 1.0 if t < 0.75 else max(0, 1.0 - (t - 0.75) / 0.25)
+    tabla = tablas_corazon(tam).perder
+    sprite, opacidad, escala = tabla[min(frame_idx, len(tabla) - 1)]
 
     # Si no hay imagen, usa un corazón dibujado (fallback)
-    if HEART_IMG is None:
+    if sprite is None:
         color = (int(255 * opacidad), int(100 + 100 * opacidad), int(180 * opacidad))
         cv2.circle(frame, (x + tam // 2, y + tam // 2), int(12 * escala), color, -1)
         return
 
-    # Escalar y posicionar el corazón
-    h, w = HEART_IMG.shape[:2]
-    new_w, new_h = int(w * tam * escala / max(h, w)), int(h * tam * escala / max(h, w))
-    heart_scaled = cv2.resize(HEART_IMG, (new_w, new_h), interpolation=cv2.INTER_AREA)
+    componer_sprite(frame, sprite, x, y, opacidad)
+
+# Animaciones de corazones: "completa", "simple" (sin explosión de
+# partículas) o "ninguna" (los corazones cambian sin animación)
+MODOS_CORAZONES = ("completa", "simple", "ninguna")
+_modo_corazones = "completa"
 
-    x1, y1 = x, y
-    x2, y2 = x1 + new_w, y1 + new_h
-    if x2 > frame.shape[1] or y2 > frame.shape[0]:
-        return
 
-    heart_crop = heart_scaled[:(y2 - y1), :(x2 - x1)]
-    if heart_crop.shape[2] == 4:
-        alpha_s = (heart_crop[:, :, 3] / 255.0) * opacidad
-        alpha_l = 1.0 - alpha_s
-        for c in range(3):
-            frame[y1:y2, x1:x2, c] = (
-                alpha_s * heart_crop[:, :, c] +
-                alpha_l * frame[y1:y2, x1:x2, c]
-            )
+def fijar_modo_corazones(modo):
+    """Elige cómo se dibujan las animaciones de corazones (ver `MODOS_CORAZONES`)."""
+    global _modo_corazones
+    if modo not in MODOS_CORAZONES:
+        raise ValueError(f"Modo de corazones desconocido: {modo}")
+    _modo_corazones = modo
+
 
 def dibujar_animacion_ganar_corazon(frame, x, y, tam=44, frame_idx=0):
     """
     Animación de vida ganada mejorada: latido marcado + explosión de partículas + fade.
     """
-    total_frames = 30
-    t = frame_idx / total_frames
-
-    # --- Latido del corazón ---
-    escala = 1.0 + 0.5 * math.sin(math.pi * t * 2)  # dos pulsos rápidos
-    opacidad = 1.0 if t < 0.8 else max(0, 1.0 - (t - 0.8)/0.2)
+    tablas = tablas_corazon(tam)
+    f = min(frame_idx, FRAMES_GANAR)
+    sprite, opacidad, escala = tablas.ganar[f]
 
     # Dibujar el corazón
-    if HEART_IMG is None:
+    if sprite is None:
         color = (0, int(255 * opacidad), int(100 * opacidad))
         cv2.circle(frame, (x + tam//2, y + tam//2), int(12 * escala), color, -1)
     else:
-        h, w = HEART_IMG.shape[:2]
-        new_w, new_h = int(w * tam * escala / max(h, w)), int(h * tam * escala / max(h, w))
-        heart_scaled = cv2.resize(HEART_IMG, (new_w, new_h), interpolation=cv2.INTER_AREA)
-
-        x1, y1 = x, y
-        x2, y2 = x1 + new_w, y1 + new_h
-        if x2 <= frame.shape[1] and y2 <= frame.shape[0]:
-            heart_crop = heart_scaled[:(y2 - y1), :(x2 - x1)]
-            if heart_crop.shape[2] == 4:
-                alpha_s = (heart_crop[:, :, 3]/255.0) * opacidad
-                alpha_l = 1.0 - alpha_s
-                for c in range(3):
-                    frame[y1:y2, x1:x2, c] = alpha_s * heart_crop[:, :, c] + alpha_l * frame[y1:y2, x1:x2, c]
+        componer_sprite(frame, sprite, x, y, opacidad)
 
     # --- Explosión de partículas alrededor del corazón ---
-    num_particulas = 20
-    for i in range(num_particulas):
-        angle = 2 * math.pi * i / num_particulas + frame_idx * 0.2
-        radio_max = tam * (1.5 + t*2)  # partículas se expanden
-        dx = int(math.cos(angle) * radio_max)
-        dy = int(math.sin(angle) * radio_max)
-        intensidad = int(255 * (1 - t))
-        color = (intensidad, 255, intensidad)
-        cv2.circle(frame, (x + tam//2 + dx, y + tam//2 + dy), 3, color, -1)
+    if _modo_corazones != "completa":
+        return
+    offsets, color = tablas.particulas_ganar[f]
+    cx, cy = x + tam//2, y + tam//2
+    for dx, dy in offsets.tolist():
+        cv2.circle(frame, (cx + dx, cy + dy), 3, color, -1)
 
 
 def dibujar_puntaje(frame, score, x=30, y=60):
@@ -178,30 +409,39 @@ def dibujar_puntaje(frame, score, x=30, y=60):
     sombra_color = (30, 30, 30)
     texto_color = (0, 255, 200)
 
-    cv2.putText(
-        frame, f"Puntaje: {score}", (x + 2, y + 2),
-        cv2.FONT_HERSHEY_DUPLEX, 0.9, sombra_color, 2, cv2.LINE_AA
-    )
-    cv2.putText(
-        frame, f"Puntaje: {score}", (x, y),
-        cv2.FONT_HERSHEY_DUPLEX, 0.9, texto_color, 1, cv2.LINE_AA
-    )
+    dibujar_texto(frame, f"Puntaje: {score}", (x, y), 0.9, texto_color, 1, sombra=sombra_color)
+
+
 
+def dibujar_marcador_jugador(frame, nombre, score, color, eliminado=False, x=30, y=60):
+    """Nombre y puntaje de un jugador (modo multijugador) con el color del jugador."""
+    texto = f"{nombre}: {score}" + (" (fuera)" if eliminado else "")
+    dibujar_texto(frame, texto, (x, y), 0.8, (160, 160, 160) if eliminado else color, 1,
+                  sombra=(30, 30, 30))
 
 
-def dibujar_vidas(frame, vidas_actual, x=30, y=80, animaciones=None, animaciones_ganar=None):
+def dibujar_vidas(frame, vidas_actual, x=30, y=80, animaciones=None, animaciones_ganar=None, pasos=1):
+    """Dibuja los corazones y avanza sus animaciones `pasos` fotogramas
+    (los pasos de simulación transcurridos desde el dibujo anterior)."""
     separacion = 48
     for i in range(vidas_actual):
-        dibujar_corazon(frame, x + i * separacion, y, tam=44)
+        dibujar_corazon(frame, x + i * separacion, y, tam=TAM_CORAZON)
+
+    if _modo_corazones == "ninguna":
+        if animaciones:
+            animaciones.clear()
+        if animaciones_ganar:
+            animaciones_ganar.clear()
+        return
 
     # Animaciones de pérdida
     if animaciones:
         nuevas_anim = []
         for anim in animaciones:
             idx, f = anim["indice"], anim["frame"]
-            dibujar_animacion_corazon(frame, x + idx * separacion, y, tam=44, frame_idx=f)
-            if f < 12:
-                nuevas_anim.append({"indice": idx, "frame": f + 1})
+            dibujar_animacion_corazon(frame, x + idx * separacion, y, tam=TAM_CORAZON, frame_idx=f)
+            if f < FRAMES_PERDER:
+                nuevas_anim.append({"indice": idx, "frame": min(f + pasos, FRAMES_PERDER)})
         animaciones[:] = nuevas_anim
 
     # Animaciones de vida ganada
@@ -209,9 +449,9 @@ def dibujar_vidas(frame, vidas_actual, x=30, y=80, animaciones=None, animaciones
         nuevas_anim_ganar = []
         for anim in animaciones_ganar:
             idx, f = anim["indice"], anim["frame"]
-            dibujar_animacion_ganar_corazon(frame, x + idx * separacion, y, tam=44, frame_idx=f)
-            if f < 20:
-                nuevas_anim_ganar.append({"indice": idx, "frame": f + 1})
+            dibujar_animacion_ganar_corazon(frame, x + idx * separacion, y, tam=TAM_CORAZON, frame_idx=f)
+            if f < FRAMES_GANAR:
+                nuevas_anim_ganar.append({"indice": idx, "frame": min(f + pasos, FRAMES_GANAR)})
         animaciones_ganar[:] = nuevas_anim_ganar
 
 
@@ -220,24 +460,24 @@ def dibujar_vidas(frame, vidas_actual, x=30, y=80, animaciones=None, animaciones
 # Dibujo de menú
 # -------------------------------
 
-def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
+def _renderizar_menu(frame, opciones, nombre_jugador):
+    """Dibuja la parte estática del menú (fondo, título, campo y botones).
+
+    Devuelve (campo_nombre_rect, rectángulos de los botones).
+    """
     h, w = frame.shape[:2]
 
     # --- Fondo con imagen ---
-    fondo_img = cv2.imread(FRUIT_BG_PATH)
+    fondo_img = cargar_fondo(FRUIT_BG_PATH, w, h)
     if fondo_img is not None:
-        # Redimensionar al tamaño del frame
-        fondo_img = cv2.resize(fondo_img, (w, h))
-        frame[:] = fondo_img.copy()
+        frame[:] = fondo_img
     else:
         # Si falla, dejar degradado pastel como fallback
-        fondo = np.zeros_like(frame, dtype=np.uint8)
         for i in range(h):
             r = int(150 + i * 0.05)
             g = int(200 + i * 0.1)
             b = int(255 - i * 0.05)
-            cv2.line(fondo, (0, i), (w, i), (b, g, r), 1)
-        frame[:] = cv2.addWeighted(fondo, 0.7, frame, 0.3, 0)
+            cv2.line(frame, (0, i), (w, i), (b, g, r), 1)
 
     # --- Título ---
     titulo = "CRAZY FRUITS"
@@ -245,10 +485,10 @@ def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
     sombra = (50, 50, 50)
     color_principal = (255, 255, 255)
 
-    (tw, th), _ = cv2.getTextSize(titulo, font, 2, 4)
+    (tw, th), _ = medir_texto(titulo, 2, 4, font)
     cx, cy = (w - tw)//2, int(h*0.25)
-    cv2.putText(frame, titulo, (cx + 3, cy + 3), font, 2, sombra, 5, cv2.LINE_AA)
-    cv2.putText(frame, titulo, (cx, cy), font, 2, color_principal, 3, cv2.LINE_AA)
+    dibujar_texto(frame, titulo, (cx, cy), 2, color_principal, 3, font,
+                  sombra=sombra, grosor_sombra=5, desplazamiento=3)
 
     # --- Campo para nombre ---
     campo_w, campo_h = 420, 60
@@ -259,14 +499,14 @@ def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
     cv2.rectangle(frame, (campo_x, campo_y), (campo_x + campo_w, campo_y + campo_h), (0, 200, 180), 2)
     texto = nombre_jugador if nombre_jugador else "Escribe tu nombre..."
     color_texto = (60, 60, 60) if nombre_jugador else (160, 160, 160)
-    cv2.putText(frame, texto, (campo_x + 15, campo_y + 40), font, 0.9, color_texto, 2, cv2.LINE_AA)
+    dibujar_texto(frame, texto, (campo_x + 15, campo_y + 40), 0.9, color_texto, 2, font)
     campo_nombre_rect = (campo_x, campo_y, campo_x + campo_w, campo_y + campo_h)
 
     # --- Botones ---
     btn_w, btn_h = 300, 70
     start_y = int(h * 0.62)
     espacio = 90
-    menu_rects.clear()
+    menu_rects = []
 
     for i, texto_btn in enumerate(opciones):
         bx = (w - btn_w)//2
@@ -279,25 +519,53 @@ def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
         cv2.rectangle(frame, (bx, by), (bx + btn_w, by + btn_h), color_btn, -1)
         cv2.rectangle(frame, (bx, by), (bx + btn_w, by + btn_h), borde, 3)
 
-        (tw, th), _ = cv2.getTextSize(texto_btn, font, 1.1, 3)
+        (tw, th), _ = medir_texto(texto_btn, 1.1, 3, font)
         tx = bx + (btn_w - tw)//2
         ty = by + (btn_h + th)//2
-        cv2.putText(frame, texto_btn, (tx + 2, ty + 2), font, 1.1, sombra, 3, cv2.LINE_AA)
-        cv2.putText(frame, texto_btn, (tx, ty), font, 1.1, (0, 150, 130), 2, cv2.LINE_AA)
+        dibujar_texto(frame, texto_btn, (tx, ty), 1.1, (0, 150, 130), 2, font, sombra=sombra, grosor_sombra=3)
 
-    # --- Destellos ---
-    NUM_DESTELLOS = 20  # ahora habrá más destellos
+    return campo_nombre_rect, menu_rects
 
-    if not hasattr(dibujar_menu, "_destellos"):
-        # Inicializamos posiciones y velocidades de cada destello
-        dibujar_menu._destellos = [
-            {"x": random.uniform(0, w), "y": random.uniform(0, h),
+
+_capa_menu = CapaEstatica(_renderizar_menu)
+
+# Destellos animados del menú (lo ajusta el gobernador de calidad)
+_num_destellos = 20
+
+
+def fijar_destellos(n):
+    """Cambia cuántos destellos se animan en el menú (0 los desactiva)."""
+    global _num_destellos
+    _num_destellos = max(0, int(n))
+
+
+def _nuevo_destello(w, h):
+    return {"x": random.uniform(0, w), "y": random.uniform(0, h),
             "vx": random.uniform(-1, 1), "vy": random.uniform(-0.5, 0.5),
             "radio": random.randint(2, 4)}  # tamaño aleatorio para más naturalidad
-            for _ in range(NUM_DESTELLOS)
-        ]
 
-    for d in dibujar_menu._destellos:
+
+def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
+    """Dibuja el menú principal sobre el frame.
+
+    La parte estática sale de una capa cacheada que solo se vuelve a
+    renderizar si cambian el tamaño del frame, las opciones o el nombre;
+    en cada frame solo se animan los destellos.
+    """
+    h, w = frame.shape[:2]
+    campo_nombre_rect, rects = _capa_menu.dibujar(frame, tuple(opciones), nombre_jugador)
+    menu_rects[:] = rects
+
+    # --- Destellos ---
+    if not hasattr(dibujar_menu, "_destellos"):
+        dibujar_menu._destellos = []
+    destellos = dibujar_menu._destellos
+    # Inicializamos posiciones y velocidades de los destellos que falten
+    while len(destellos) < _num_destellos:
+        destellos.append(_nuevo_destello(w, h))
+    del destellos[_num_destellos:]
+
+    for d in destellos:
         # Mover con velocidad propia
         d["x"] += d["vx"] * 2
         d["y"] += d["vy"] * 2
@@ -319,19 +587,22 @@ def dibujar_menu(frame, opciones, menu_rects, nombre_jugador):
 # -------------------------------
 # Icono de sonido
 # -------------------------------
+@functools.lru_cache(maxsize=8)
+def _sprite_icono(muted, tam):
+    """Icono de sonido redimensionado y preparado (se calcula una vez por tamaño)."""
+    icon = ICON_OFF if muted else ICON_ON
+    return preparar_sprite(cv2.resize(icon, (tam, tam)))
+
+
 def dibujar_icono_sonido(frame, muted, x=20, y=20, tam=40):
     icon = ICON_OFF if muted else ICON_ON
     if icon is None:
         print("Icono de sonido no encontrado, usando texto.")
-        cv2.putText(frame, "Mute" if muted else "Sound", (x, y+30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255,255,255), 2)
+        dibujar_texto(frame, "Mute" if muted else "Sound", (x, y+30), 1, (255,255,255), 2,
+                      cv2.FONT_HERSHEY_SIMPLEX, linea=cv2.LINE_8)
         return (x, y, x+tam, y+tam)
-    
-    icon = cv2.resize(icon, (tam, tam))
-    h, w = icon.shape[:2]
-    alpha = icon[:, :, 3] / 255.0
-    for c in range(3):
-        frame[y:y+h, x:x+w, c] = alpha * icon[:, :, c] + (1 - alpha) * frame[y:y+h, x:x+w, c]
+
+    componer_sprite(frame, _sprite_icono(muted, tam), x, y)
     return (x, y, x+tam, y+tam)
 
 # -------------------------------
@@ -354,38 +625,69 @@ FRUTA_COLORES_BGR = {
 }
 
 
-def dibujar_fruta(frame, fruta):
-    """Dibuja una fruta usando su imagen PNG con transparencia."""
-    if fruta.imagen is not None:
-        fh, fw = fruta.imagen.shape[:2]
-        x1 = int(fruta.x - fw // 2)
-        y1 = int(fruta.y - fh // 2)
-        x2 = x1 + fw
-        y2 = y1 + fh
+# Color de las partículas por id de tipo (mismo orden que `TIPOS`)
+COLORES_TIPOS = np.array(
+    [FRUTA_COLORES_BGR.get(t.name, (255, 255, 255)) for t in TIPOS],  # default blanco
+    dtype=np.uint8,
+)
 
-        if x1 < 0 or y1 < 0 or x2 > frame.shape[1] or y2 > frame.shape[0]:
-            return
 
-        fruta_crop = fruta.imagen[:(y2 - y1), :(x2 - x1)]
+def dibujar_frutas(frame, pool, alfa=0.0):
+    """Dibuja todas las frutas vivas de un `PoolFrutas`.
 
-        if fruta_crop.shape[2] == 4:
-            alpha = fruta_crop[:, :, 3] / 255.0
-            for c in range(3):
-                frame[y1:y2, x1:x2, c] = (
-                    alpha * fruta_crop[:, :, c] +
-                    (1 - alpha) * frame[y1:y2, x1:x2, c]
-                )
+    `alfa` (fracción de paso de simulación) adelanta la caída para dibujar
+    entre dos pasos.
+    """
+    n = pool.n
+    if n == 0:
+        return
+    sprites = [obtener_sprite(t) for t in TIPOS]
+    xs = pool.x[:n].astype(np.int32).tolist()
+    ys = pool.y[:n]
+    if alfa:
+        ys = ys + pool.velocidad[:n] * alfa
+    ys = ys.astype(np.int32).tolist()
+    for x, y, t, tam in zip(xs, ys, pool.tipo[:n].tolist(), pool.tam[:n].tolist()):
+        sprite = sprites[t]
+        if sprite is not None:
+            componer_sprite(frame, sprite, x - sprite.ancho // 2, y - sprite.alto // 2)
         else:
-            frame[y1:y2, x1:x2] = fruta_crop
-    else:
-        # fallback: círculo si no hay imagen
-        color = (255, 255, 255) if fruta.tipo != TipoFruta.BOMB else (0, 0, 0)
-        cv2.circle(frame, (int(fruta.x), int(fruta.y)), fruta.tam // 2, color, -1)
+            # fallback: círculo si no hay imagen
+            color = (255, 255, 255) if TIPOS[t] != TipoFruta.BOMB else (0, 0, 0)
+            cv2.circle(frame, (x, y), tam // 2, color, -1)
 
 # -------------------------------
 # Dibujo de partículas
 # -------------------------------
-def dibujar_particula(frame, particula):
-    """Dibuja una partícula si está activa."""
-    if particula.vida > 0:
-        cv2.circle(frame, (int(particula.x), int(particula.y)), 3, particula.color, -1)
\ No newline at end of file
+RADIO_PARTICULA = 3
+
+def _disco(radio):
+    """Offsets (dy, dx) de los píxeles de un disco relleno de radio dado."""
+    r = np.arange(-radio, radio + 1)
+    dy, dx = np.meshgrid(r, r, indexing="ij")
+    dentro = dy * dy + dx * dx <= radio * radio
+    return dy[dentro].astype(np.int32), dx[dentro].astype(np.int32)
+
+_DISCO_DY, _DISCO_DX = _disco(RADIO_PARTICULA)
+
+
+def dibujar_particulas(frame, emisor, alfa=0.0):
+    """Dibuja todas las partículas de un `EmisorParticulas` de una sola vez.
+
+    Estampa un disco precalculado en la posición de cada partícula con
+    indexado vectorizado, en lugar de una llamada a `cv2.circle` por partícula.
+    `alfa` adelanta el movimiento una fracción de paso, como en `dibujar_frutas`.
+    """
+    n = emisor.n
+    if n == 0:
+        return
+    h, w = frame.shape[:2]
+    xs, ys = emisor.x[:n], emisor.y[:n]
+    if alfa:
+        xs = xs + emisor.dx[:n] * alfa
+        ys = ys + emisor.dy[:n] * alfa
+    ys = ys.astype(np.int32)[:, None] + _DISCO_DY
+    xs = xs.astype(np.int32)[:, None] + _DISCO_DX
+    dentro = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+    colores = np.broadcast_to(emisor.color[:n, None, :], ys.shape + (3,))
+    frame[ys[dentro], xs[dentro]] = colores[dentro]
@@ -2,156 +2,60 @@
 Módulo principal del juego CrazyFruits.
 
 Responsabilidades:
-- Inicializar la cámara y los detectores (face/mouth).
-- Mostrar el menú principal y gestionar eventos de mouse/teclado.
-- Crear y manejar la instancia de `CrazyFruitsGame` durante la ejecución.
+- Leer las opciones de la línea de comandos.
+- Ejecutar una `Estacion` (cámara, ventana, menú y partida) hasta salir.
 
+Para varias cámaras en la misma máquina, ver `estaciones.py`.
 """
 
-import cv2
-from detectors import cargar_cascades
-from camera_utils import inicializar_camara
-from game import CrazyFruitsGame
-import graphics
-from sound_manager import SoundManager
+import argparse
+import sys
 
-# -------------------------------
-# Configuración del menú
-# -------------------------------
-menu_opciones = ["JUGAR", "SALIR"]
-menu_rects = []
-estado = "MENU"  # MENU, JUEGO, GAME_OVER, SALIR
-campo_nombre_rect = (0, 0, 0, 0)
-campo_activo = False
-nombre_jugador = ""
-
-# -------------------------------
-# Variables de sonido
-# -------------------------------
-vol_rect = (0, 0, 0, 0)
-sonidos = None
-game = None
-
-# -------------------------------
-# Callback del mouse
-# -------------------------------
-def click_event(event, x, y, flags, param):
-    """Manejador de eventos del mouse usado por la ventana OpenCV.
-
-    Detecta pulsaciones sobre:
-    - Icono de sonido (mute/unmute)
-    - Campo de texto del nombre
-    - Botones del menú (JUGAR, SALIR)
-    - Botón de reiniciar en pantalla de GAME_OVER
-
-    Las coordenadas del click se comparan contra rectángulos previamente
-    calculados y almacenados.
-    """
-    global estado, sonidos, vol_rect, game, campo_activo, nombre_jugador
-    if event == cv2.EVENT_LBUTTONDOWN:
-        # --- Icono de sonido ---
-        x1, y1, x2, y2 = vol_rect
-        if x1 <= x <= x2 and y1 <= y <= y2:
-            if sonidos:
-                sonidos.toggle_mute()
-            return
+from estacion import Estacion
+from calidad import NIVELES, NIVEL_INICIAL
+from partida import MAX_JUGADORES
 
-        # --- Campo de texto nombre ---
-        if estado == "MENU":
-            x1, y1, x2, y2 = campo_nombre_rect
-            if x1 <= x <= x2 and y1 <= y <= y2:
-                campo_activo = True
-                return
-            else:
-                campo_activo = False
-
-            # --- Botones menú ---
-            for i, (bx1, by1, bx2, by2) in enumerate(menu_rects):
-                if bx1 <= x <= bx2 and by1 <= y <= by2:
-                    seleccion = menu_opciones[i]
-                    if seleccion == "JUGAR":
-                        game = CrazyFruitsGame(face_cascade, mouth_cascade, w, h, nombre_jugador=nombre_jugador, sonidos=sonidos)
-                        estado = "JUEGO"
-                    elif seleccion == "SALIR":
-                        estado = "SALIR"
-
-        elif estado == "GAME_OVER":
-            if game and hasattr(game, "boton_reiniciar"):
-                x1, y1, x2, y2 = game.boton_reiniciar
-                if x1 <= x <= x2 and y1 <= y <= y2:
-                    sonido_nuevo = SoundManager()
-                    game = CrazyFruitsGame(face_cascade, mouth_cascade, w, h, nombre_jugador=nombre_jugador, sonidos=sonido_nuevo)
-                    estado = "JUEGO"
 
 # -------------------------------
 # Función principal
 # -------------------------------
+def main(argv=None):
+    """Función principal: lee las opciones y ejecuta una estación.
 
-def main():
-    """Función principal: inicializa recursos y ejecuta el loop principal.
+    - Con `--perfil archivo.csv` guarda los tiempos por etapa de cada frame.
+    - Ajusta la calidad para sostener `--fps-objetivo` (o la fija con `--calidad-fija`).
+    - Con `--grabar-entrada archivo.csv` guarda la boca de cada paso de simulación
+      (un archivo por ronda, con su semilla y resolución).
+    - `--semilla` fija la aparición de frutas.
+    - Con `--grabar-video carpeta` guarda un vídeo de cada ronda.
+    - Con `--jugadores N` cada cara detectada es un jugador (hasta N).
+    - `--camara` elige el índice de la cámara.
 
-    - Carga los clasificadores en cascada (cara y boca).
-    - Inicia la cámara y la ventana OpenCV.
-    - Maneja estados: MENU, JUEGO, GAME_OVER, SALIR.
+    Devuelve el código de salida de la estación (ver `estacion.py`).
     """
-    global estado, sonidos, vol_rect, campo_nombre_rect, game, face_cascade, mouth_cascade, w, h, nombre_jugador
-
-    # Cargar cascades y cámara
-    face_cascade, mouth_cascade = cargar_cascades()
-    cap = inicializar_camara()
-
-    sonidos = SoundManager()
-
-    ret, frame = cap.read()
-    if not ret:
-        print("Error al iniciar la cámara")
-        return
-
-    h, w = frame.shape[:2]
-    cv2.namedWindow("CrazyFruits")
-    cv2.setMouseCallback("CrazyFruits", click_event)
-
-    while True:
-        ret, frame = cap.read()
-        frame = cv2.flip(frame, 1)
-
-        if not ret:
-            break
-
-        if estado == "MENU":
-            campo_nombre_rect = graphics.dibujar_menu(frame, menu_opciones, menu_rects, nombre_jugador)
-
-        elif estado == "JUEGO":
-            frame = game.procesar_frame(frame)
-            if game.game_over:
-                estado = "GAME_OVER"
-
-        elif estado == "GAME_OVER":
-            game.mostrar_game_over(frame)
-
-        elif estado == "SALIR":
-            break
-
-        # --- Icono de sonido ---
-        if sonidos:
-            vol_rect = graphics.dibujar_icono_sonido(frame, sonidos.muted, x=w - 70, y=20, tam=40)
-
-        cv2.imshow("CrazyFruits", frame)
-        key = cv2.waitKey(20) & 0xFF
-
-        # --- Salir ---
-        if key in (ord('q'), ord('Q')):
-            break
-
-        # --- Escribir nombre ---
-        if campo_activo and estado == "MENU":
-            if 32 <= key <= 126:
-                nombre_jugador += chr(key)
-            elif key in (8, 127):
-                nombre_jugador = nombre_jugador[:-1]
-
-    cap.release()
-    cv2.destroyAllWindows()
+    parser = argparse.ArgumentParser(description="CrazyFruits")
+    parser.add_argument("--camara", type=int, default=0, help="índice de la cámara")
+    parser.add_argument("--perfil", metavar="CSV", help="guarda los tiempos por etapa de cada frame en un CSV")
+    parser.add_argument("--fps-objetivo", type=float, default=30.0,
+                        help="frames por segundo que intenta sostener el gobernador de calidad")
+    parser.add_argument("--calidad", type=int, default=NIVEL_INICIAL, choices=range(len(NIVELES)),
+                        help="nivel de calidad inicial (0 = máxima)")
+    parser.add_argument("--calidad-fija", action="store_true", help="no ajustar la calidad automáticamente")
+    parser.add_argument("--grabar-entrada", metavar="CSV",
+                        help="guarda la posición y apertura de la boca de cada paso (ver simulacion.py)")
+    parser.add_argument("--semilla", type=int, help="semilla de la aparición de frutas (por defecto, al azar)")
+    parser.add_argument("--grabar-video", metavar="CARPETA",
+                        help="guarda un vídeo de cada ronda en la carpeta (sin frenar el juego)")
+    parser.add_argument("--jugadores", type=int, default=1, choices=range(1, MAX_JUGADORES + 1),
+                        help="jugadores simultáneos, uno por cara (nombres separados por comas)")
+    args = parser.parse_args(argv)
+
+    estacion = Estacion(camara=args.camara, perfil_csv=args.perfil, fps_objetivo=args.fps_objetivo,
+                        calidad=args.calidad, calidad_fija=args.calidad_fija,
+                        grabar_entrada=args.grabar_entrada, grabar_video=args.grabar_video,
+                        semilla=args.semilla,
+                        jugadores=args.jugadores)
+    return estacion.ejecutar()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,236 @@
+# motor_deteccion.py
+
+"""
+Motor de detección de cara y boca en un proceso separado.
+
+Los dos `detectMultiScale` de Haar son lo más caro de cada frame. Este módulo
+los ejecuta en otro proceso para que el render y la física de las frutas
+avancen al ritmo de la pantalla, sin esperar al detector.
+
+Los frames viajan en escala de grises por un buffer circular en memoria
+compartida (`multiprocessing.shared_memory`), sin serializar nada. El proceso
+trabajador publica el último rostro encontrado y el estado de la boca en un
+array compartido que el bucle del juego lee sin bloquear. Con `max_caras > 1`
+(multijugador) publica una cara y una boca por hueco de `LocalizadorCaras`.
+
+Si el proceso que creó el motor muere sin llamar a `cerrar()` (por ejemplo,
+una estación colgada que el supervisor mata con SIGKILL), el trabajador lo
+nota, libera la memoria compartida y termina en vez de quedar huérfano.
+"""
+
+import math
+import multiprocessing as mp
+import os
+import time
+from collections import namedtuple
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+
+from detectors import (cargar_cascades, LocalizadorCara, LocalizadorCaras, estimar_aperturas_boca, FACTOR_BOCA,
+                       TAM_ROI_BOCA)
+
+# Índices del array de control
+_SLOT_PUBLICADO, _SEQ_PUBLICADO, _SLOT_EN_USO = 0, 1, 2
+
+# Índices del array de resultados: cabecera y, a partir de _R_CARAS, un
+# bloque de _CAMPOS_CARA valores por hueco
+_R_SEQ, _R_SEQ_FRAME, _R_DURACION, _R_CARAS = 0, 1, 2, 3
+_R_HAY_CARA, _R_X, _R_Y, _R_W, _R_H, _R_BOCA = range(6)
+_CAMPOS_CARA = 6
+
+# Índices del array de configuración (lo cambia el gobernador de calidad)
+_C_INTERVALO, _C_ESCALA, _C_FACTOR_BOCA, _C_INTERVALO_BOCA = range(4)
+
+ResultadoDeteccion = namedtuple("ResultadoDeteccion", ["seq", "seq_frame", "cara", "apertura", "caras", "aperturas",
+                                                       "duracion"])
+ResultadoDeteccion.__doc__ = """Último resultado publicado por el trabajador.
+
+- seq: contador de resultados (0 si todavía no hay ninguno)
+- seq_frame: número del frame enviado sobre el que se calculó
+- cara: (x, y, w, h) o None si no se detectó rostro
+- apertura: apertura de la boca entre 0 y 1, o None si no había cara o
+  en ese frame no se estimó la boca
+- caras, aperturas: lo mismo para cada hueco (cara y apertura son los del
+  primero)
+- duracion: segundos que tardó el trabajador en procesar ese frame (cara y
+  boca); lo usa el gobernador de calidad
+"""
+
+
+def _trabajador(nombre_shm, forma, control, resultado, config, hay_frame, parar, max_caras):
+    """Bucle del proceso detector: toma el frame más reciente y publica el resultado."""
+    padre = os.getppid()
+    face_cascade, mouth_cascade = cargar_cascades()
+    if max_caras == 1:
+        localizador = LocalizadorCara(face_cascade)
+    else:
+        localizador = LocalizadorCaras(face_cascade, max_caras)
+    shm = shared_memory.SharedMemory(name=nombre_shm)
+    frames = np.ndarray(forma, dtype=np.uint8, buffer=shm.buf)
+    # ROI de las bocas al tamaño canónico, reutilizadas en cada frame
+    buffer_bocas = np.empty((max_caras, TAM_ROI_BOCA[1], TAM_ROI_BOCA[0]), dtype=np.uint8)
+    gray = None
+    ultimo_seq = 0
+    n_resultados = 0
+    frames_boca = 0
+    huerfano = False
+    try:
+        while not parar.is_set():
+            if not hay_frame.wait(0.1):
+                if os.getppid() != padre:
+                    huerfano = True
+                    break
+                continue
+            hay_frame.clear()
+
+            with control.get_lock():
+                slot, seq = control[_SLOT_PUBLICADO], control[_SEQ_PUBLICADO]
+                if seq == ultimo_seq:
+                    continue
+                control[_SLOT_EN_USO] = slot
+            ultimo_seq = seq
+
+            with config.get_lock():
+                intervalo, escala, factor_boca, intervalo_boca = config[:]
+            localizador.intervalo_deteccion = int(intervalo)
+            localizador.buscador.escala = escala
+
+            t0 = time.perf_counter()
+            gray = frames[slot]
+            caras = localizador.localizar(gray)
+            if max_caras == 1:
+                caras = [caras]
+            # Las bocas se estiman cada `intervalo_boca` frames; en medio no hay observación (NaN)
+            frames_boca += 1
+            aperturas = [None] * max_caras
+            if any(caras) and frames_boca >= intervalo_boca:
+                aperturas = estimar_aperturas_boca(gray, caras, mouth_cascade, factor_boca, buffer_bocas)
+                frames_boca = 0
+            duracion = time.perf_counter() - t0
+
+            with control.get_lock():
+                control[_SLOT_EN_USO] = -1
+
+            n_resultados += 1
+            with resultado.get_lock():
+                resultado[_R_SEQ] = n_resultados
+                resultado[_R_SEQ_FRAME] = seq
+                resultado[_R_DURACION] = duracion
+                for i, (cara, apertura) in enumerate(zip(caras, aperturas)):
+                    b = _R_CARAS + i * _CAMPOS_CARA
+                    resultado[b + _R_HAY_CARA] = 1 if cara else 0
+                    if cara:
+                        resultado[b + _R_X:b + _R_H + 1] = cara
+                        resultado[b + _R_BOCA] = math.nan if apertura is None else apertura
+    finally:
+        del gray, frames
+        shm.close()
+        if huerfano:
+            # Nadie más va a llamar a `cerrar()`
+            try:
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+class MotorDeteccion:
+    """Ejecuta la detección de cara/boca en un proceso aparte.
+
+    Uso:
+        motor = MotorDeteccion(ancho, alto)
+        motor.enviar(frame)          # no bloquea; copia el frame en gris al buffer
+        res = motor.resultado()      # último ResultadoDeteccion publicado
+        motor.cerrar()
+
+    El buffer circular tiene `slots` huecos; el principal nunca escribe en el
+    hueco que el trabajador está leyendo ni en el último publicado, así que
+    con 3 huecos siempre hay uno libre y `enviar` nunca espera.
+
+    `max_caras` es el número de jugadores: con más de uno el trabajador
+    busca todas las caras y publica una por hueco.
+    """
+    def __init__(self, ancho, alto, slots=3, max_caras=1):
+        if slots < 3:
+            raise ValueError("MotorDeteccion necesita al menos 3 huecos")
+        self.forma = (slots, alto, ancho)
+        self._shm = shared_memory.SharedMemory(create=True, size=slots * alto * ancho)
+        self._frames = np.ndarray(self.forma, dtype=np.uint8, buffer=self._shm.buf)
+
+        self._control = mp.Array("q", [-1, 0, -1])
+        self.max_caras = max_caras
+        self._resultado = mp.Array("d", _R_CARAS + max_caras * _CAMPOS_CARA)
+        self._config = mp.Array("d", [5, 0.5, FACTOR_BOCA, 1])
+        self._hay_frame = mp.Event()
+        self._parar = mp.Event()
+        self._seq = 0
+        self._siguiente = 0
+
+        self._proceso = mp.Process(
+            target=_trabajador,
+            args=(self._shm.name, self.forma, self._control, self._resultado,
+                  self._config, self._hay_frame, self._parar, max_caras),
+            name="MotorDeteccion",
+            daemon=True,
+        )
+        self._proceso.start()
+
+    def enviar(self, frame):
+        """Convierte el frame BGR a gris dentro del buffer compartido y lo publica.
+
+        Devuelve el número de secuencia asignado al frame.
+        """
+        slots = self.forma[0]
+        with self._control.get_lock():
+            ocupados = (self._control[_SLOT_EN_USO], self._control[_SLOT_PUBLICADO])
+        slot = self._siguiente
+        while slot in ocupados:
+            slot = (slot + 1) % slots
+        self._siguiente = (slot + 1) % slots
+
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._frames[slot])
+
+        self._seq += 1
+        with self._control.get_lock():
+            self._control[_SLOT_PUBLICADO] = slot
+            self._control[_SEQ_PUBLICADO] = self._seq
+        self._hay_frame.set()
+        return self._seq
+
+    def resultado(self):
+        """Devuelve el último `ResultadoDeteccion` publicado (no bloquea)."""
+        with self._resultado.get_lock():
+            r = self._resultado[:]
+        caras, bocas = [], []
+        for i in range(self.max_caras):
+            c = r[_R_CARAS + i * _CAMPOS_CARA:_R_CARAS + (i + 1) * _CAMPOS_CARA]
+            cara = None
+            boca = None
+            if c[_R_HAY_CARA]:
+                cara = (int(c[_R_X]), int(c[_R_Y]), int(c[_R_W]), int(c[_R_H]))
+                boca = None if math.isnan(c[_R_BOCA]) else c[_R_BOCA]
+            caras.append(cara)
+            bocas.append(boca)
+        return ResultadoDeteccion(int(r[_R_SEQ]), int(r[_R_SEQ_FRAME]), caras[0], bocas[0],
+                                  tuple(caras), tuple(bocas), r[_R_DURACION])
+
+    def configurar(self, intervalo_deteccion, escala_deteccion, factor_boca, intervalo_boca):
+        """Cambia los parámetros de detección del trabajador (desde el próximo frame)."""
+        with self._config.get_lock():
+            self._config[:] = [intervalo_deteccion, escala_deteccion, factor_boca, intervalo_boca]
+
+    @property
+    def vivo(self):
+        return self._proceso.is_alive()
+
+    def cerrar(self):
+        """Detiene el proceso trabajador y libera la memoria compartida."""
+        self._parar.set()
+        self._hay_frame.set()
+        self._proceso.join(timeout=2.0)
+        if self._proceso.is_alive():
+            self._proceso.terminate()
+        del self._frames
+        self._shm.close()
+        self._shm.unlink()
@@ -1,27 +1,104 @@
 """
-Módulo de partículas sencillo usado para efectos visuales cuando se come una fruta.
+Módulo de partículas usado para efectos visuales cuando se come una fruta.
 
-Cada `Particula` tiene posición, velocidad (dx, dy) y una vida que decrece con el tiempo.
+`EmisorParticulas` guarda todas las partículas en arrays NumPy de capacidad
+fija (posición, velocidad, vida y color): las ráfagas se crean en bloque con
+un generador aleatorio vectorizado y todas envejecen y se descartan en un
+solo paso. Existe además un presupuesto global que limita cuántas
+partículas puede haber vivas entre todos los emisores.
 """
 
-import random
+import numpy as np
 
-class Particula:
-    """Partícula simple con movimiento lineal y vida finita.
+# Máximo de partículas vivas entre todos los emisores
+PRESUPUESTO_PARTICULAS = 600
+_vivas_global = 0
 
-    Se usa para representar pequeños destellos que aparecen al comer frutas.
+
+def fijar_presupuesto(maximo):
+    """Cambia el presupuesto global (las partículas ya vivas no se eliminan)."""
+    global PRESUPUESTO_PARTICULAS
+    PRESUPUESTO_PARTICULAS = max(0, int(maximo))
+
+
+def particulas_vivas():
+    """Número de partículas vivas sumando todos los emisores."""
+    return _vivas_global
+
+
+class EmisorParticulas:
+    """Partículas con movimiento lineal y vida finita en arrays preasignados.
+
+    Atributos (las partículas vivas ocupan las primeras `n` posiciones):
+    - x, y: posición (float32)
+    - dx, dy: velocidad por frame (float32)
+    - vida: frames restantes (int16)
+    - color: BGR (uint8, n x 3)
+    - descartadas: partículas que no se crearon por falta de capacidad/presupuesto
     """
-    def __init__(self, x, y, color, vida=15):
-        self.x = x
-        self.y = y
-        self.color = color
+    def __init__(self, capacidad=PRESUPUESTO_PARTICULAS, rng=None):
+        self.capacidad = capacidad
+        self.rng = rng if rng is not None else np.random.default_rng()
+        self.x = np.zeros(capacidad, dtype=np.float32)
+        self.y = np.zeros(capacidad, dtype=np.float32)
+        self.dx = np.zeros(capacidad, dtype=np.float32)
+        self.dy = np.zeros(capacidad, dtype=np.float32)
+        self.vida = np.zeros(capacidad, dtype=np.int16)
+        self.color = np.zeros((capacidad, 3), dtype=np.uint8)
+        self.n = 0
+        self.descartadas = 0
+
+    def __len__(self):
+        return self.n
+
+    def _cambiar_n(self, n):
+        global _vivas_global
+        _vivas_global += n - self.n
+        self.n = n
+
+    def emitir(self, xs, ys, colores, cantidad=15, vida=15):
+        """Crea `cantidad` partículas por cada origen (xs[i], ys[i]) con su color.
+
+        Devuelve cuántas partículas se crearon; el resto se cuenta en
+        `descartadas` si se alcanzó la capacidad o el presupuesto global.
+        """
+        xs = np.asarray(xs, dtype=np.float32).ravel()
+        ys = np.asarray(ys, dtype=np.float32).ravel()
+        colores = np.asarray(colores, dtype=np.uint8).reshape(-1, 3)
+        pedidas = len(xs) * cantidad
+        libres = min(self.capacidad - self.n, PRESUPUESTO_PARTICULAS - _vivas_global)
+        k = max(0, min(pedidas, libres))
+        self.descartadas += pedidas - k
+        if k == 0:
+            return 0
+
+        i, j = self.n, self.n + k
+        origen = np.repeat(np.arange(len(xs)), cantidad)[:k]
+        self.x[i:j] = xs[origen]
+        self.y[i:j] = ys[origen]
+        self.color[i:j] = colores[origen]
         # Velocidad inicial aleatoria para dar variedad a las partículas
-        self.dx = random.randint(-5, 5)
-        self.dy = random.randint(-5, -1)
-        self.vida = vida
-
-    def mover(self):
-        """Actualiza la posición y reduce la vida; cuando vida<=0 se descarta."""
-        self.x += self.dx
-        self.y += self.dy
-        self.vida -= 1
+        self.dx[i:j] = self.rng.integers(-5, 6, k)
+        self.dy[i:j] = self.rng.integers(-5, 0, k)
+        self.vida[i:j] = vida
+        self._cambiar_n(j)
+        return k
+
+    def actualizar(self):
+        """Mueve todas las partículas, reduce su vida y descarta las que llegan a 0."""
+        n = self.n
+        if n == 0:
+            return
+        self.x[:n] += self.dx[:n]
+        self.y[:n] += self.dy[:n]
+        self.vida[:n] -= 1
+
+        vivas = np.flatnonzero(self.vida[:n] > 0)
+        m = len(vivas)
+        if m < n:
+            for arr in (self.x, self.y, self.dx, self.dy, self.vida, self.color):
+                arr[:m] = arr[vivas]
+            self._cambiar_n(m)
+
+    def vaciar(self):
+        self._cambiar_n(0)
@@ -0,0 +1,264 @@
+"""
+Núcleo de simulación de una partida: reglas sin cámara, detección ni dibujo.
+
+`Partida` contiene todo lo que decide el resultado de una ronda (frutas,
+vidas, puntaje y dificultad) y avanza en pasos fijos de
+1/`PASOS_POR_SEGUNDO` s. La única entrada de cada paso es dónde está la boca
+y si está abierta, así que la misma partida puede jugarse con la cámara
+(`CrazyFruitsGame`) o con una entrada sintética o grabada (`simulacion`).
+
+Con varios jugadores (`jugadores > 1`) cada uno tiene su boca, su puntaje
+y su `Vida`: cada fruta la atrapa la boca abierta más cercana (buscada con
+una `RejillaEspacial`), y una fruta que cae le quita la vida al jugador
+presente más cercano en horizontal. Un jugador sin vidas queda fuera; la
+ronda termina cuando no queda ninguno en juego.
+
+Las subclases reaccionan a lo que pasa en cada paso sobrescribiendo
+`al_atrapar`, `al_perder` y `al_terminar` (sonidos, partículas, guardar el
+puntaje); la partida base no hace nada en ellos.
+"""
+
+import math
+import random
+
+import numpy as np
+
+from fruta import PoolFrutas, PUNTAJES, TIPOS, ID_MIX, ID_BOMB, tam_escalado
+from rejilla import RejillaEspacial
+from reloj import PASOS_POR_SEGUNDO
+from vida import Vida
+
+VIDAS_INICIALES = 4
+GENERAR_CADA_INICIAL = 30  # pasos entre frutas al empezar
+# Segundos de juego (simulados) entre aumentos de dificultad
+INTERVALO_DIFICULTAD = 10
+# Radio base de la boca para atrapar frutas (px)
+RADIO_BOCA = 50
+MAX_JUGADORES = 4
+
+
+class Jugador:
+    """Puntaje y vidas de un jugador en la ronda.
+
+    - visto: su cara apareció alguna vez en la ronda
+    - ultimo_x: última posición horizontal de su boca (None si nunca se vio)
+    """
+    def __init__(self, nombre, verbose=True):
+        self.nombre = nombre
+        self.vidas = Vida(VIDAS_INICIALES, verbose=verbose)
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.score = 0
+        self.vidas.reiniciar()
+        self.ultimo_x = None
+
+    @property
+    def visto(self):
+        return self.ultimo_x is not None
+
+    @property
+    def eliminado(self):
+        return self.vidas.actual <= 0
+
+
+class Partida:
+    """Estado y reglas de una ronda.
+
+    Atributos:
+    - frutas: `PoolFrutas` con las frutas activas
+    - jugadores: lista de `Jugador` (uno por defecto)
+    - score, vidas: los del primer jugador (la partida de un jugador)
+    - dificultad, generar_cada
+    - frame_counter: pasos simulados en la ronda
+    - game_over: la ronda terminó (sin vidas)
+    - generadas: frutas aparecidas en la ronda
+    - atrapadas, perdidas: contadores por id de tipo (índices de `TIPOS`)
+    - ronda: número de ronda desde que se creó la partida (0, 1, ...)
+    - semilla_ronda: semilla de la aparición de frutas de la ronda actual
+
+    `semilla` hace reproducible la aparición de frutas (sin ella se elige
+    una al azar). Cada ronda vuelve a sembrar el generador con
+    `semilla + ronda`, así que una ronda se puede repetir por separado con
+    `Partida(semilla=semilla_ronda)`. Con `verbose=False` no se imprime nada
+    (para simular muchas rondas).
+    """
+    def __init__(self, frame_width, frame_height, semilla=None, verbose=True, jugadores=1):
+        if not 1 <= jugadores <= MAX_JUGADORES:
+            raise ValueError(f"jugadores debe estar entre 1 y {MAX_JUGADORES}")
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        self.verbose = verbose
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        self.ronda = -1
+        self.frutas = PoolFrutas(rng=random.Random())
+        self.jugadores = [Jugador(f"Jugador {i + 1}", verbose) for i in range(jugadores)]
+        # Celdas del tamaño del alcance máximo de una boca
+        alcance = RADIO_BOCA + max(tam_escalado(t) for t in TIPOS) * 0.4
+        self.rejilla = RejillaEspacial(frame_width, frame_height, math.ceil(alcance))
+        self.atrapadas = np.zeros(len(TIPOS), dtype=np.int64)
+        self.perdidas = np.zeros(len(TIPOS), dtype=np.int64)
+        self.reiniciar_ronda()
+
+    @property
+    def score(self):
+        return self.jugadores[0].score
+
+    @property
+    def vidas(self):
+        return self.jugadores[0].vidas
+
+    def nombrar(self, nombres):
+        """Pone nombre a los jugadores en orden; los que falten conservan el suyo."""
+        for jugador, nombre in zip(self.jugadores, nombres):
+            if nombre:
+                jugador.nombre = nombre
+
+    def reiniciar_ronda(self):
+        """Vuelve al estado inicial de una ronda (conserva el pool y vuelve a
+        sembrar su generador con la semilla de la ronda)."""
+        self.ronda += 1
+        self.semilla_ronda = self.semilla + self.ronda
+        self.frutas.rng.seed(self.semilla_ronda)
+        self.frutas.vaciar()
+        for jugador in self.jugadores:
+            jugador.reiniciar()
+        self.frame_counter = 0  # pasos de simulación de la partida
+        self.generar_cada = GENERAR_CADA_INICIAL # Frutas cada n pasos
+        self.dificultad = 1
+        self.last_dificultad_time = 0.0  # tiempo simulado del último aumento
+        self.game_over = False
+        self.generadas = 0
+        self.atrapadas[:] = 0
+        self.perdidas[:] = 0
+
+    @property
+    def tiempo(self):
+        """Segundos de juego simulados en la ronda."""
+        return self.frame_counter / PASOS_POR_SEGUNDO
+
+    def aumentar_dificultad(self):
+        """
+        Aumenta progresivamente la dificultad del juego:
+        - Incrementa la velocidad de caída de las frutas (multiplicador)
+        - Disminuye el tiempo entre la generación de frutas
+
+        Usa el tiempo simulado: si el juego va lento, la dificultad también
+        espera.
+        """
+        now = self.tiempo
+        # Cada 10 segundos de juego: aumentar la dificultad y reducir la frecuencia de generación
+        if now - self.last_dificultad_time > INTERVALO_DIFICULTAD:
+            self.dificultad += 0.3
+            if self.generar_cada > 10:
+                self.generar_cada -= 2
+            self.last_dificultad_time = now
+            if self.verbose:
+                print("[DIFICULTAD]:", self.dificultad, "Generar cada:", self.generar_cada)
+
+    def paso_simulacion(self, boca_x, boca_y, boca_abierta):
+        """Avanza la partida un paso fijo: dificultad, aparición de frutas,
+        caída, capturas y vidas.
+
+        `boca_x`/`boca_y` son None si no hay cara. Con varios jugadores,
+        ver `paso_jugadores`.
+        """
+        self.paso_jugadores(((boca_x, boca_y, boca_abierta),))
+
+    def paso_jugadores(self, bocas):
+        """Avanza un paso con la boca de cada jugador: una tupla
+        (x, y, abierta) por jugador, con x/y None si su cara no está."""
+        self.aumentar_dificultad()
+        self.frame_counter += 1
+        if self.frame_counter % self.generar_cada == 0:
+            self.frutas.generar(self.frame_width, self.dificultad)
+            self.generadas += 1
+
+        presentes = []
+        for jugador, (bx, by, _) in zip(self.jugadores, bocas):
+            presente = bx is not None and by is not None and not jugador.eliminado
+            if presente:
+                jugador.ultimo_x = bx
+            presentes.append(presente)
+
+        # --- Mover, atrapar y descartar todas las frutas de una vez ---
+        pool = self.frutas
+        if len(self.jugadores) == 1:
+            bx, by, abierta = bocas[0]
+            atrapadas, perdidas = pool.paso(bx, by, RADIO_BOCA, abierta and presentes[0], self.frame_height)
+            quien = np.zeros(len(atrapadas), dtype=np.intp)
+        else:
+            abiertas = [abierta and p for (_, _, abierta), p in zip(bocas, presentes)]
+            atrapadas, quien, perdidas = pool.paso_bocas(
+                [b[0] for b in bocas], [b[1] for b in bocas], abiertas,
+                RADIO_BOCA, self.frame_height, self.rejilla)
+
+        if len(atrapadas):
+            tipos = pool.tipo[atrapadas]
+            es_mix = tipos == ID_MIX
+            es_bomba = tipos == ID_BOMB
+            normales = ~(es_mix | es_bomba)
+
+            for j in np.unique(quien):
+                jugador = self.jugadores[j]
+                suyas = quien == j
+                for _ in range(int((es_mix & suyas).sum())):
+                    jugador.vidas.ganar_vida()
+                for _ in range(int((es_bomba & suyas).sum())):
+                    jugador.vidas.perder_vida()
+                jugador.score += int(PUNTAJES[tipos[normales & suyas]].sum())
+            self.atrapadas += np.bincount(tipos, minlength=len(TIPOS))
+            self.al_atrapar(atrapadas, tipos, quien)
+
+        if len(perdidas):
+            tipos = pool.tipo[perdidas]
+            self.perdidas += np.bincount(tipos, minlength=len(TIPOS))
+            # Las frutas especiales (MIX, BOMB) no quitan vida al caer
+            normales = perdidas[(tipos != ID_MIX) & (tipos != ID_BOMB)]
+            if len(normales):
+                for i in normales:
+                    jugador = self._responsable(float(pool.x[i]), presentes)
+                    if jugador is not None:
+                        jugador.vidas.perder_vida()
+                self.al_perder(len(normales))
+                if self._terminada():
+                    self.game_over = True
+                    self.al_terminar()
+
+        # Las frutas atrapadas o perdidas salen del pool antes del siguiente paso
+        pool.compactar()
+
+    def _responsable(self, x, presentes):
+        """Jugador que pierde la vida por una fruta caída en `x`: el presente
+        más cercano; si no hay nadie, el último visto más cercano; si nunca se
+        vio a nadie, el primero que siga en juego."""
+        en_juego = [j for j in self.jugadores if not j.eliminado]
+        if len(en_juego) <= 1:
+            return en_juego[0] if en_juego else None
+        candidatos = [j for j, p in zip(self.jugadores, presentes) if p]
+        if not candidatos:
+            candidatos = [j for j in en_juego if j.visto]
+        if not candidatos:
+            return en_juego[0]
+        return min(candidatos, key=lambda j: abs(j.ultimo_x - x))
+
+    def _terminada(self):
+        """Sin jugadores en juego: todos eliminados, o alguno eliminado y
+        ninguno de los que quedan llegó a aparecer."""
+        restantes = [j for j in self.jugadores if not j.eliminado]
+        if len(restantes) < len(self.jugadores):
+            return not any(j.visto for j in restantes)
+        return False
+
+    # -------------------------------
+    # Eventos (para subclases)
+    # -------------------------------
+    def al_atrapar(self, indices, tipos, quien):
+        """Se atraparon las frutas `indices` del pool (válidos hasta compactar);
+        `quien` dice qué jugador atrapó cada una."""
+
+    def al_perder(self, n):
+        """Cayeron `n` frutas normales y se perdieron vidas."""
+
+    def al_terminar(self):
+        """La ronda terminó por quedarse sin vidas."""
@@ -0,0 +1,198 @@
+"""
+Medición de tiempos por etapa del bucle de juego.
+
+`Perfilador` cronometra cada etapa de un frame con marcas consecutivas: la
+llamada `marca("cara")` atribuye a la etapa "cara" el tiempo transcurrido
+desde la marca anterior. Así instrumentar cuesta una llamada a
+`time.perf_counter` por etapa, sin context managers ni diccionarios nuevos.
+
+Por cada frame guarda los tiempos en una ventana circular (para media, p95 y
+máximo recientes), puede dibujar un overlay de depuración sobre el frame y,
+si se indica un archivo, escribe una fila CSV por frame. El archivo se vuelca
+a disco cada `VOLCAR_CADA` frames, así que si el proceso muere (un fallo, o el
+supervisor de `estaciones.py` lo mata) se pierden como mucho esas filas.
+
+`PERFILADOR_NULO` tiene la misma interfaz y no hace nada; es el que usa el
+juego cuando no se mide.
+"""
+
+import csv
+import time
+
+import cv2
+import numpy as np
+
+# Etapas en el orden en que ocurren en un frame de `main`
+ETAPAS = (
+    "captura",     # espera del frame nuevo (LectorCamara)
+    "espejo",      # cv2.flip
+    "cara",        # localizar la cara (o enviar/leer el motor de detección)
+    "boca",        # estimar la apertura de la boca y promediarla
+    "fisica",      # pasos de simulación: aparición, caída, capturas, vidas y puntaje
+    "frutas",      # dibujar frutas
+    "particulas",  # actualizar y dibujar partículas
+    "hud",         # puntaje, vidas, dificultad, menús e icono de sonido
+    "video",       # encolar el frame para el grabador de vídeo
+    "imshow",
+    "waitkey",
+)
+# Etapas que son espera y no trabajo (no cuentan en `trabajo`)
+ETAPAS_ESPERA = ("captura",)
+# Frames entre volcados del CSV a disco (~1 s a 30 fps)
+VOLCAR_CADA = 30
+
+
+class Perfilador:
+    """Tiempos por etapa con estadísticas móviles, overlay y CSV opcional.
+
+    Uso:
+        perfil = Perfilador(ruta_csv="sesion.csv")
+        perfil.marca("captura")      # tras cada etapa del frame
+        ...
+        perfil.fin_frame()           # cierra el frame (y escribe la fila CSV)
+        perfil.cerrar()
+
+    El tiempo entre `fin_frame` y la primera marca del frame siguiente se
+    atribuye a esa primera marca.
+    """
+    def __init__(self, ventana=120, ruta_csv=None, etapas=ETAPAS):
+        self.etapas = tuple(etapas)
+        self._indice = {nombre: i for i, nombre in enumerate(self.etapas)}
+        self.ventana = ventana
+        # Historial circular en segundos: una fila por frame, una columna por etapa
+        self._historial = np.zeros((ventana, len(self.etapas)), dtype=np.float64)
+        self._actual = np.zeros(len(self.etapas), dtype=np.float64)
+        self.frames = 0
+        self.trabajo = 0.0  # segundos de trabajo del último frame (sin esperas)
+        self._espera = [self._indice[e] for e in ETAPAS_ESPERA if e in self._indice]
+        self.visible = False
+        self._t0 = time.perf_counter()
+        self._ultima = self._t0
+
+        self._archivo = None
+        self._csv = None
+        if ruta_csv:
+            self._archivo = open(ruta_csv, "w", newline="", encoding="utf-8")
+            self._csv = csv.writer(self._archivo)
+            self._csv.writerow(["frame", "t_s"] + [f"{e}_ms" for e in self.etapas] + ["total_ms"])
+            self._archivo.flush()
+
+    def marca(self, etapa):
+        """Suma a `etapa` el tiempo desde la marca anterior."""
+        ahora = time.perf_counter()
+        self._actual[self._indice[etapa]] += ahora - self._ultima
+        self._ultima = ahora
+
+    def reiniciar_marca(self):
+        """Descarta el tiempo desde la última marca (p. ej. tras una pausa)."""
+        self._ultima = time.perf_counter()
+
+    def fin_frame(self):
+        """Guarda los tiempos del frame en la ventana y en el CSV, y empieza otro."""
+        self._historial[self.frames % self.ventana] = self._actual
+        self.trabajo = float(self._actual.sum() - self._actual[self._espera].sum())
+        if self._csv is not None:
+            ms = self._actual * 1000.0
+            self._csv.writerow([self.frames, f"{self._ultima - self._t0:.4f}"]
+                               + [f"{v:.3f}" for v in ms] + [f"{ms.sum():.3f}"])
+            if (self.frames + 1) % VOLCAR_CADA == 0:
+                self._archivo.flush()
+        self.frames += 1
+        self._actual[:] = 0.0
+
+    def descartar_frame(self):
+        """Olvida los tiempos acumulados del frame en curso."""
+        self._actual[:] = 0.0
+
+    def alternar(self):
+        """Muestra u oculta el overlay."""
+        self.visible = not self.visible
+
+    def estadisticas(self):
+        """Dict etapa -> (media, p95, máximo) en ms sobre la ventana, con 'total'."""
+        n = min(self.frames, self.ventana)
+        if n == 0:
+            return {}
+        ms = self._historial[:n] * 1000.0
+        medias = ms.mean(axis=0)
+        p95 = np.percentile(ms, 95, axis=0)
+        maximos = ms.max(axis=0)
+        total = ms.sum(axis=1)
+        stats = {e: (medias[i], p95[i], maximos[i]) for i, e in enumerate(self.etapas)}
+        stats["total"] = (total.mean(), np.percentile(total, 95), total.max())
+        return stats
+
+    def dibujar(self, frame, x=None, y=20, extra=()):
+        """Dibuja la tabla de tiempos (si el overlay está visible).
+
+        `extra` son líneas de texto adicionales que se añaden debajo.
+        """
+        if not self.visible:
+            return
+        stats = self.estadisticas()
+        if not stats:
+            return
+        alto_linea = 18
+        ancho = 280
+        if x is None:
+            x = max(0, frame.shape[1] - ancho - 90)
+        alto = alto_linea * (len(stats) + 2 + len(extra))
+        # Fondo oscurecido para que se lea sobre cualquier imagen
+        roi = frame[y:y + alto, x:x + ancho]
+        roi[:] = roi // 3
+
+        fuente = cv2.FONT_HERSHEY_PLAIN
+        columnas = (x + 6, x + 115, x + 175, x + 230)
+        for cx, titulo in zip(columnas, ("etapa", "media", "p95", "max")):
+            cv2.putText(frame, titulo, (cx, y + 14), fuente, 1.0, (200, 200, 200), 1, cv2.LINE_AA)
+        for i, (etapa, valores) in enumerate(stats.items(), start=1):
+            color = (0, 255, 255) if etapa == "total" else (255, 255, 255)
+            fila_y = y + 14 + i * alto_linea
+            textos = (etapa,) + tuple(f"{v:.1f}" for v in valores)
+            for cx, texto in zip(columnas, textos):
+                cv2.putText(frame, texto, (cx, fila_y), fuente, 1.0, color, 1, cv2.LINE_AA)
+        fps = 1000.0 / stats["total"][0] if stats["total"][0] > 0 else 0.0
+        cv2.putText(frame, f"{fps:.1f} fps  (tiempos en ms)", (x + 6, y + 14 + (len(stats) + 1) * alto_linea),
+                    fuente, 1.0, (0, 255, 0), 1, cv2.LINE_AA)
+        for i, texto in enumerate(extra, start=len(stats) + 2):
+            cv2.putText(frame, texto, (x + 6, y + 14 + i * alto_linea),
+                        fuente, 1.0, (0, 200, 255), 1, cv2.LINE_AA)
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+            self._csv = None
+
+
+class _PerfiladorNulo:
+    """Misma interfaz que `Perfilador`, sin medir nada."""
+    visible = False
+    trabajo = 0.0
+
+    def marca(self, etapa):
+        pass
+
+    def reiniciar_marca(self):
+        pass
+
+    def fin_frame(self):
+        pass
+
+    def descartar_frame(self):
+        pass
+
+    def alternar(self):
+        pass
+
+    def estadisticas(self):
+        return {}
+
+    def dibujar(self, frame, x=None, y=20, extra=()):
+        pass
+
+    def cerrar(self):
+        pass
+
+
+PERFILADOR_NULO = _PerfiladorNulo()
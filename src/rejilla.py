@@ -0,0 +1,60 @@
+"""
+Rejilla espacial uniforme para buscar frutas cercanas a un punto.
+
+Con varios jugadores, probar cada boca contra todas las frutas cuesta
+jugadores x frutas. La rejilla reparte las frutas en celdas cuadradas de
+lado `celda` (una ordenación por celda en cada paso) y cada boca solo mira
+las 3x3 celdas a su alrededor. Si `celda` es al menos el alcance máximo de
+una boca, ninguna fruta atrapable queda fuera de esas celdas.
+
+Los puntos fuera del área (por ejemplo, frutas que aún no entraron por
+arriba) se guardan en la celda del borde más cercana: solo añaden
+candidatos, nunca hacen perder uno.
+"""
+
+import numpy as np
+
+
+class RejillaEspacial:
+    """Índice de puntos por celdas de un área de `ancho` x `alto` píxeles.
+
+    Uso (una vez por paso):
+        rejilla.indexar(x, y)              # arrays de coordenadas
+        candidatos = rejilla.cercanos(px, py)
+    """
+    def __init__(self, ancho, alto, celda):
+        self.celda = float(celda)
+        self.columnas = max(1, int(np.ceil(ancho / self.celda)))
+        self.filas = max(1, int(np.ceil(alto / self.celda)))
+        self._orden = np.zeros(0, dtype=np.intp)
+        self._inicio = np.zeros(self.columnas * self.filas + 1, dtype=np.intp)
+
+    def _celdas(self, x, y):
+        cx = np.clip((x // self.celda).astype(np.intp), 0, self.columnas - 1)
+        cy = np.clip((y // self.celda).astype(np.intp), 0, self.filas - 1)
+        return cx, cy
+
+    def indexar(self, x, y):
+        """Reparte los puntos (x[i], y[i]) en sus celdas."""
+        cx, cy = self._celdas(np.asarray(x), np.asarray(y))
+        ids = cy * self.columnas + cx
+        # Los puntos de una misma celda quedan contiguos en `_orden`, y las
+        # celdas de una fila, en orden de columna
+        self._orden = np.argsort(ids, kind="stable")
+        conteo = np.bincount(ids, minlength=self.columnas * self.filas)
+        self._inicio[0] = 0
+        np.cumsum(conteo, out=self._inicio[1:])
+
+    def cercanos(self, x, y):
+        """Índices de los puntos en las 3x3 celdas alrededor de (x, y)."""
+        cx, cy = self._celdas(np.float64(x), np.float64(y))
+        c1, c2 = max(cx - 1, 0), min(cx + 1, self.columnas - 1)
+        partes = []
+        for fila in range(max(cy - 1, 0), min(cy + 1, self.filas - 1) + 1):
+            base = fila * self.columnas
+            a, b = self._inicio[base + c1], self._inicio[base + c2 + 1]
+            if b > a:
+                partes.append(self._orden[a:b])
+        if not partes:
+            return self._orden[:0]
+        return np.concatenate(partes) if len(partes) > 1 else partes[0]
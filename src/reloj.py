@@ -0,0 +1,71 @@
+"""
+Reloj de simulación con paso fijo.
+
+La física del juego (caída de frutas, aparición, partículas, dificultad)
+avanza en pasos de duración fija, independientes de cuántos frames por
+segundo se dibujen. En cada frame el reloj suma el tiempo real transcurrido
+a un acumulador y dice cuántos pasos hay que simular (cero, uno o varios).
+Lo que sobra en el acumulador, como fracción de un paso (`alfa`), sirve para
+dibujar las posiciones interpoladas entre pasos.
+
+Las velocidades y contadores del juego están expresados por paso. El paso
+por defecto (1/30 s) coincide con los 30 fps de la cámara para los que se
+ajustaron, así que a 30 fps el juego se comporta igual que antes.
+"""
+
+import time
+
+PASOS_POR_SEGUNDO = 30
+# Límite de pasos por frame: si el frame tardó mucho más, el resto se descarta
+# en vez de intentar ponerse al día (evita la espiral de frames cada vez más lentos)
+MAX_PASOS_POR_FRAME = 5
+
+
+class RelojSimulacion:
+    """Acumulador de tiempo real que se consume en pasos fijos.
+
+    Atributos:
+    - paso: duración de un paso en segundos
+    - tiempo: tiempo simulado (segundos) desde `reiniciar`
+    - pasos: pasos simulados desde `reiniciar`
+    - alfa: fracción (0..1) de paso pendiente en el acumulador
+    - tiempo_descartado: tiempo real no simulado por superar `max_pasos`
+    """
+    def __init__(self, pasos_por_segundo=PASOS_POR_SEGUNDO, max_pasos=MAX_PASOS_POR_FRAME):
+        self.paso = 1.0 / pasos_por_segundo
+        self.max_pasos = max_pasos
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Vuelve el tiempo simulado a cero; el próximo `avanzar` solo toma referencia."""
+        self.tiempo = 0.0
+        self.pasos = 0
+        self.alfa = 0.0
+        self.tiempo_descartado = 0.0
+        self._acumulado = 0.0
+        self._ultimo = None
+
+    def avanzar(self, dt=None):
+        """Suma el tiempo de un frame y devuelve cuántos pasos hay que simular.
+
+        Sin `dt` se mide el tiempo real desde la llamada anterior (la primera
+        llamada tras `reiniciar` devuelve 0). Con `dt` se usa ese intervalo,
+        lo que permite reproducir partidas a un ritmo fijo.
+        """
+        if dt is None:
+            ahora = time.perf_counter()
+            dt = 0.0 if self._ultimo is None else ahora - self._ultimo
+            self._ultimo = ahora
+
+        self._acumulado += dt
+        # El épsilon evita perder un paso por redondeo cuando dt es justo un paso
+        n = int(self._acumulado / self.paso + 1e-9)
+        if n > self.max_pasos:
+            self.tiempo_descartado += (n - self.max_pasos) * self.paso
+            self._acumulado -= (n - self.max_pasos) * self.paso
+            n = self.max_pasos
+        self._acumulado -= n * self.paso
+        self.pasos += n
+        self.tiempo = self.pasos * self.paso
+        self.alfa = min(max(self._acumulado / self.paso, 0.0), 1.0)
+        return n
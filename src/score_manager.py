@@ -1,47 +1,319 @@
 """
-Gestión simple de puntajes usando un archivo JSON local.
+Gestión de puntajes sobre una base SQLite local.
 
 Funciones:
-- cargar_puntajes: lee y devuelve la lista de puntajes (o una lista vacía)
+- cargar_puntajes: devuelve la lista completa de puntajes (orden de llegada)
 - guardar_puntaje: añade un nuevo puntaje con timestamp
 - obtener_mejores: devuelve los N mejores puntajes ordenados
+- mejor_de_jugador: mejor puntaje de un jugador
+- ranking_dia / ranking_semana: mejor puntaje por jugador en un día o semana
+- vaciar_pendientes: espera a que se escriban los puntajes pendientes
+- fijar_compartida: avisa de que otros procesos escriben en la misma base
+
+Los puntajes viven en `scores.db`, con índices por puntaje, nombre y fecha.
+La primera vez que se abre la base se importa el histórico de `scores.json`.
+
+La escritura la hace un hilo en segundo plano: `guardar_puntaje` solo deja
+el puntaje en una lista de pendientes, así que el paso a Game Over nunca
+espera al disco. Los pendientes que llegan seguidos se insertan en una sola
+transacción. Las consultas combinan la base con los pendientes, de modo que
+un puntaje se ve en cuanto se guarda.
+
+Además se mantiene en memoria un TOP de `TAM_TOP` puntajes que se actualiza
+con cada inserción: `obtener_mejores(n)` con n <= TAM_TOP no consulta la base.
+Ese TOP solo ve los puntajes de su proceso; si varios procesos escriben en la
+misma base (varias estaciones, ver `estaciones.py`), `fijar_compartida()`
+hace que `obtener_mejores` consulte siempre la base.
 """
 
+import atexit
+import bisect
 import json
 import os
-from datetime import datetime
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
 
-SCORES_FILE = "scores.json"
+SCORES_DB = "scores.db"
+SCORES_FILE = "scores.json"   # histórico a importar (solo la primera vez)
+FORMATO_FECHA = "%Y-%m-%d %H:%M:%S"
+# Espera antes de escribir, para agrupar varios puntajes en una transacción
+RETARDO_ESCRITURA = 0.5
+# Tamaño del TOP que se mantiene en memoria
+TAM_TOP = 10
 
-def cargar_puntajes():
-    """Carga los puntajes desde el archivo JSON (si existe) y los devuelve.
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS puntajes (
+    id     INTEGER PRIMARY KEY,
+    nombre TEXT    NOT NULL,
+    score  INTEGER NOT NULL,
+    fecha  TEXT    NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_puntajes_score  ON puntajes (score DESC);
+CREATE INDEX IF NOT EXISTS idx_puntajes_nombre ON puntajes (nombre, score DESC);
+CREATE INDEX IF NOT EXISTS idx_puntajes_fecha  ON puntajes (fecha);
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
 
-    Si el archivo no existe o está corrupto devuelve una lista vacía.
-    """
-    if os.path.exists(SCORES_FILE):
-        with open(SCORES_FILE, "r", encoding="utf-8") as f:
-            try:
-                return json.load(f)
-            except json.JSONDecodeError:
-                return []
+_lock = threading.Lock()      # protege _pendientes, _top y el estado de inicio
+_lock_bd = threading.Lock()   # consulta a la base + lectura de pendientes, atómicas
+_local = threading.local()    # una conexión por hilo
+_listo = False
+_pendientes = []              # puntajes aún no insertados en la base
+_top = []                     # TOP en memoria (de mayor a menor)
+_claves_top = []              # -score de cada entrada de _top (para bisect)
+_hay_pendientes = threading.Event()
+_escrito = threading.Condition(_lock)
+_hilo = None
+_compartida = False           # otros procesos escriben en la misma base
+
+
+# -------------------------------
+# Conexión y arranque
+# -------------------------------
+def _conexion():
+    """Conexión SQLite del hilo actual (se abre la primera vez)."""
+    con = getattr(_local, "con", None)
+    if con is None:
+        con = sqlite3.connect(SCORES_DB, timeout=5.0)
+        con.row_factory = sqlite3.Row
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        _local.con = con
+    return con
+
+
+def _leer_json():
+    """Lee el histórico JSON. Si está corrupto lo aparta y devuelve una lista vacía."""
+    if not os.path.exists(SCORES_FILE):
+        return []
+    with open(SCORES_FILE, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            pass
+    respaldo = f"{SCORES_FILE}.corrupto-{datetime.now():%Y%m%d%H%M%S}"
+    os.replace(SCORES_FILE, respaldo)
+    print(f"[WARN] {SCORES_FILE} estaba corrupto; se movió a {respaldo}")
     return []
 
+
+def _importar_json(con):
+    """Copia `scores.json` a la base si todavía no se hizo."""
+    if con.execute("SELECT 1 FROM meta WHERE clave = 'json_importado'").fetchone():
+        return
+    filas = [
+        (p.get("nombre") or "Player", int(p.get("score", 0)), p.get("fecha") or "")
+        for p in _leer_json()
+    ]
+    with con:
+        con.executemany("INSERT INTO puntajes (nombre, score, fecha) VALUES (?, ?, ?)", filas)
+        con.execute("INSERT INTO meta (clave, valor) VALUES ('json_importado', ?)",
+                    (datetime.now().strftime(FORMATO_FECHA),))
+    if filas:
+        print(f"[INFO] Importados {len(filas)} puntajes de {SCORES_FILE}")
+
+
+def _a_dict(fila):
+    return {"nombre": fila["nombre"], "score": fila["score"], "fecha": fila["fecha"]}
+
+
+def inicializar():
+    """Abre la base, crea el esquema, importa el JSON y carga el TOP en memoria.
+
+    Se llama sola en el primer uso; `main` la llama al arrancar para que la
+    importación inicial no caiga en medio de una partida.
+    """
+    global _listo
+    with _lock:
+        if _listo:
+            return
+        con = _conexion()
+        con.executescript(_ESQUEMA)
+        _importar_json(con)
+        filas = con.execute(
+            "SELECT nombre, score, fecha FROM puntajes ORDER BY score DESC, id LIMIT ?", (TAM_TOP,)
+        ).fetchall()
+        _top[:] = [_a_dict(f) for f in filas]
+        _claves_top[:] = [-p["score"] for p in _top]
+        _listo = True
+
+
+def _despues_de_fork():
+    """En el hijo de un fork: no heredar la conexión, el hilo escritor ni los
+    pendientes del padre (una conexión SQLite no debe cruzar un fork)."""
+    global _lock, _lock_bd, _local, _listo, _hay_pendientes, _escrito, _hilo
+    _lock = threading.Lock()
+    _lock_bd = threading.Lock()
+    _local = threading.local()
+    _listo = False
+    _pendientes.clear()
+    _hay_pendientes = threading.Event()
+    _escrito = threading.Condition(_lock)
+    _hilo = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_despues_de_fork)
+
+
+# -------------------------------
+# Escritura en segundo plano
+# -------------------------------
+def _bucle_escritor():
+    while True:
+        _hay_pendientes.wait()
+        time.sleep(RETARDO_ESCRITURA)  # agrupar puntajes que lleguen seguidos
+        _hay_pendientes.clear()
+        with _lock:
+            lote = list(_pendientes)
+        if not lote:
+            continue
+        filas = [(p["nombre"], p["score"], p["fecha"]) for p in lote]
+        try:
+            con = _conexion()
+            with _lock_bd:
+                with con:
+                    con.executemany("INSERT INTO puntajes (nombre, score, fecha) VALUES (?, ?, ?)", filas)
+                with _lock:
+                    del _pendientes[:len(lote)]
+                    _escrito.notify_all()
+        except sqlite3.Error as e:
+            print(f"[WARN] No se pudieron guardar los puntajes: {e}")
+            time.sleep(1.0)
+            _hay_pendientes.set()
+
+
+def _iniciar_escritor():
+    global _hilo
+    if _hilo is None:
+        _hilo = threading.Thread(target=_bucle_escritor, name="EscritorPuntajes", daemon=True)
+        _hilo.start()
+
+
+def _consultar(sql, parametros=()):
+    """Ejecuta una consulta y devuelve (filas, copia de los pendientes) de forma coherente."""
+    inicializar()
+    with _lock_bd:
+        filas = _conexion().execute(sql, parametros).fetchall()
+        with _lock:
+            pendientes = list(_pendientes)
+    return [_a_dict(f) for f in filas], pendientes
+
+
+# -------------------------------
+# API pública
+# -------------------------------
+def cargar_puntajes():
+    """Devuelve todos los puntajes en orden de llegada (incluye los pendientes)."""
+    guardados, pendientes = _consultar("SELECT nombre, score, fecha FROM puntajes ORDER BY id")
+    return guardados + pendientes
+
+
 def guardar_puntaje(score, nombre):
-    """Guarda un nuevo puntaje en el archivo con la fecha actual.
+    """Guarda un nuevo puntaje con la fecha actual (sin esperar al disco).
 
-    El nombre se normaliza (espacios) y se adjunta el timestamp.
+    El nombre se normaliza (espacios) y se adjunta el timestamp. El puntaje
+    entra al TOP en memoria y a la lista de pendientes; el hilo escritor lo
+    inserta en la base.
     """
-    puntajes = cargar_puntajes()
+    inicializar()
     nuevo = {
         "nombre": nombre.strip() if nombre else "Player",
         "score": score,
-        "fecha": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        "fecha": datetime.now().strftime(FORMATO_FECHA)
     }
-    puntajes.append(nuevo)
-    with open(SCORES_FILE, "w", encoding="utf-8") as f:
-        json.dump(puntajes, f, indent=4, ensure_ascii=False)
+    with _lock:
+        _pendientes.append(nuevo)
+        # A igual puntaje, el más antiguo queda delante
+        i = bisect.bisect_right(_claves_top, -score)
+        if i < TAM_TOP:
+            _top.insert(i, nuevo)
+            _claves_top.insert(i, -score)
+            del _top[TAM_TOP:], _claves_top[TAM_TOP:]
+    _iniciar_escritor()
+    _hay_pendientes.set()
+
+
+def vaciar_pendientes(timeout=5.0):
+    """Espera a que los puntajes guardados estén en la base. Devuelve True si lo están."""
+    with _lock:
+        if not _pendientes:
+            return True
+        _hay_pendientes.set()
+        return _escrito.wait_for(lambda: not _pendientes, timeout)
+
+
+# Al salir, no perder puntajes aún en memoria
+atexit.register(vaciar_pendientes)
+
+
+def fijar_compartida(compartida=True):
+    """Indica si otros procesos guardan puntajes en la misma base.
+
+    Con la base compartida el TOP en memoria no está completo, así que
+    `obtener_mejores` la consulta siempre (una consulta por índice).
+    """
+    global _compartida
+    _compartida = compartida
+
 
 def obtener_mejores(n=5):
     """Devuelve los N mejores puntajes (ordenados de mayor a menor)."""
-    puntajes = cargar_puntajes()
-    return sorted(puntajes, key=lambda x: x["score"], reverse=True)[:n]
+    inicializar()
+    if n <= TAM_TOP and not _compartida:
+        with _lock:
+            return list(_top[:n])
+    guardados, pendientes = _consultar(
+        "SELECT nombre, score, fecha FROM puntajes ORDER BY score DESC, id LIMIT ?", (n,)
+    )
+    return sorted(guardados + pendientes, key=lambda x: x["score"], reverse=True)[:n]
+
+
+def mejor_de_jugador(nombre):
+    """Mejor puntaje registrado de un jugador (dict) o None si no tiene."""
+    nombre = nombre.strip() if nombre else "Player"
+    guardados, pendientes = _consultar(
+        "SELECT nombre, score, fecha FROM puntajes WHERE nombre = ? "
+        "ORDER BY score DESC, id LIMIT 1", (nombre,)
+    )
+    candidatos = guardados + [p for p in pendientes if p["nombre"] == nombre]
+    return max(candidatos, key=lambda x: x["score"], default=None)
+
+
+def ranking_periodo(desde, hasta, n=5):
+    """Mejor puntaje de cada jugador con fecha en [desde, hasta), los N primeros."""
+    a, b = desde.strftime(FORMATO_FECHA), hasta.strftime(FORMATO_FECHA)
+    guardados, pendientes = _consultar(
+        "SELECT nombre, MAX(score) AS score, fecha FROM puntajes "
+        "WHERE fecha >= ? AND fecha < ? GROUP BY nombre "
+        "ORDER BY score DESC LIMIT ?", (a, b, n)
+    )
+    # Un pendiente puede mejorar a un jugador o meter a uno nuevo en el ranking
+    mejores = {p["nombre"]: p for p in guardados}
+    for p in pendientes:
+        if a <= p["fecha"] < b and p["score"] > mejores.get(p["nombre"], {"score": -1})["score"]:
+            mejores[p["nombre"]] = p
+    return sorted(mejores.values(), key=lambda x: x["score"], reverse=True)[:n]
+
+
+def _fecha(dia):
+    dia = dia or datetime.now()
+    return dia.date() if isinstance(dia, datetime) else dia
+
+
+def ranking_dia(dia=None, n=5):
+    """Ranking de un día (`date` o `datetime`, por defecto hoy)."""
+    inicio = datetime.combine(_fecha(dia), datetime.min.time())
+    return ranking_periodo(inicio, inicio + timedelta(days=1), n)
+
+
+def ranking_semana(dia=None, n=5):
+    """Ranking de la semana (lunes a domingo) que contiene `dia` (por defecto hoy)."""
+    fecha = _fecha(dia)
+    inicio = datetime.combine(fecha - timedelta(days=fecha.weekday()), datetime.min.time())
+    return ranking_periodo(inicio, inicio + timedelta(days=7), n)
@@ -0,0 +1,306 @@
+"""
+Simulación sin cámara de rondas completas.
+
+Juega rondas de `Partida` (las mismas reglas que el juego: frutas, vidas,
+puntaje y dificultad) sin cámara, sin detección y sin dibujar, tan rápido
+como da la CPU. La entrada de cada paso (posición de la boca y si está
+abierta) la da un `JugadorSintetico` o un CSV grabado con `GrabadorEntrada`.
+Con la misma semilla y la misma entrada la ronda es siempre la misma, lo
+que sirve para ajustar la dificultad y para detectar cambios de reglas.
+
+Uso:
+    python src/simulacion.py --semillas 200 --habilidad 0.7
+    python src/simulacion.py --semillas 1000 --procesos 8 --csv rondas.csv
+    python src/simulacion.py --entrada partida-001.csv
+
+Las semillas se reparten entre procesos (`--procesos`, por defecto uno por
+núcleo). Cada ronda termina en game over, al agotarse la entrada grabada o
+al llegar a `--max-segundos` de juego simulado.
+
+Con `--entrada` se juega una sola ronda por archivo, con la semilla y la
+resolución que guardó `GrabadorEntrada` (`main.py --grabar-entrada`).
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+from functools import partial
+from multiprocessing import Pool
+
+import numpy as np
+
+from fruta import TIPOS, ID_BOMB
+from partida import Partida, RADIO_BOCA
+from reloj import PASOS_POR_SEGUNDO
+
+ANCHO, ALTO = 1280, 720
+MAX_SEGUNDOS = 600
+NOMBRES_TIPOS = tuple(t.name.lower() for t in TIPOS)
+
+
+# -------------------------------
+# Entradas
+# -------------------------------
+class JugadorSintetico:
+    """Entrada sintética: mueve la boca hacia la fruta que va a llegar antes.
+
+    `habilidad` (0..1) fija la velocidad máxima de la boca, el ruido de la
+    posición y la probabilidad de despistes (unos pasos sin moverse y con
+    la boca cerrada). Cierra la boca si una bomba está cerca.
+
+    Se llama una vez por paso con la partida y devuelve (x, y, abierta).
+    """
+    def __init__(self, habilidad=0.7, rng=None):
+        self.habilidad = min(max(habilidad, 0.0), 1.0)
+        self.rng = rng if rng is not None else random.Random()
+        self.velocidad = 10.0 + 30.0 * self.habilidad     # px por paso
+        self.ruido = 25.0 * (1.0 - self.habilidad)        # desviación en px
+        self.prob_despiste = 0.02 * (1.0 - self.habilidad)
+        self.x = None
+        self._despiste = 0
+
+    def __call__(self, partida):
+        if self.x is None:
+            self.x = partida.frame_width / 2.0
+        y = partida.frame_height * 0.6
+
+        if self._despiste > 0:
+            self._despiste -= 1
+            return self.x, y, False
+        if self.rng.random() < self.prob_despiste:
+            self._despiste = self.rng.randint(5, 20)
+
+        pool = partida.frutas
+        n = pool.n
+        fx, fy, vel, tipo = pool.x[:n], pool.y[:n], pool.velocidad[:n], pool.tipo[:n]
+        bombas = tipo == ID_BOMB
+
+        # Objetivo: la fruta (no bomba) que alcanza antes la altura de la boca
+        candidatas = np.flatnonzero(~bombas & (fy < y + RADIO_BOCA))
+        if len(candidatas):
+            llegada = (y - fy[candidatas]) / np.maximum(vel[candidatas], 0.1)
+            objetivo = candidatas[np.argmin(np.maximum(llegada, 0.0))]
+            destino = float(fx[objetivo]) + self.rng.gauss(0.0, self.ruido)
+            self.x += max(-self.velocidad, min(self.velocidad, destino - self.x))
+
+        # Boca cerrada si alguna bomba podría entrar en el próximo paso
+        alcance = RADIO_BOCA + pool.tam[:n] * 0.4 + vel
+        cerca = bombas & (np.abs(fx - self.x) < alcance) & (np.abs(fy - y) < alcance)
+        return self.x, y, not cerca.any()
+
+
+class EntradaGrabada:
+    """Entrada reproducida de un CSV de `GrabadorEntrada` (x, y, abierta por
+    paso). x/y vacíos significan que no había cara. Al agotarse las filas
+    lanza `StopIteration`.
+
+    La primera línea del archivo (`# semilla=... ancho=... alto=...`) trae
+    la semilla y la resolución de la ronda grabada; quedan en `semilla`,
+    `ancho` y `alto` (None si el archivo no la tiene).
+    """
+    def __init__(self, ruta):
+        self.semilla = self.ancho = self.alto = None
+        with open(ruta, "r", newline="", encoding="utf-8") as f:
+            primera = f.readline()
+            if primera.startswith("#"):
+                datos = dict(par.split("=", 1) for par in primera[1:].split())
+                self.semilla = int(datos["semilla"])
+                self.ancho, self.alto = int(datos["ancho"]), int(datos["alto"])
+            else:
+                f.seek(0)
+            self.filas = [
+                (float(fila["x"]) if fila["x"] else None,
+                 float(fila["y"]) if fila["y"] else None,
+                 fila["abierta"] == "1")
+                for fila in csv.DictReader(f)
+            ]
+        self._i = 0
+
+    def __call__(self, partida):
+        if self._i >= len(self.filas):
+            raise StopIteration
+        fila = self.filas[self._i]
+        self._i += 1
+        return fila
+
+
+class GrabadorEntrada:
+    """Guarda en CSV la entrada de cada paso de simulación del juego real,
+    para reproducirla después con `EntradaGrabada`.
+
+    Cada ronda va a su propio archivo: `nueva_ronda` cierra el anterior y
+    abre `<ruta>-<n>.csv` con una primera línea que guarda la semilla de la
+    ronda y la resolución del frame.
+    """
+    def __init__(self, ruta):
+        self.base, self.extension = os.path.splitext(ruta)
+        self.extension = self.extension or ".csv"
+        self.rondas = 0
+        self._archivo = None
+        self._csv = None
+
+    def nueva_ronda(self, semilla, ancho, alto):
+        self.cerrar()
+        self.rondas += 1
+        ruta = f"{self.base}-{self.rondas:03d}{self.extension}"
+        self._archivo = open(ruta, "w", newline="", encoding="utf-8")
+        self._archivo.write(f"# semilla={semilla} ancho={ancho} alto={alto}\n")
+        self._csv = csv.writer(self._archivo)
+        self._csv.writerow(["x", "y", "abierta"])
+        print(f"[INFO] Grabando la entrada de la ronda en {ruta}")
+
+    def registrar(self, boca_x, boca_y, boca_abierta):
+        if self._csv is None:
+            return
+        if boca_x is None or boca_y is None:
+            self._csv.writerow(["", "", int(bool(boca_abierta))])
+        else:
+            self._csv.writerow([round(float(boca_x), 1), round(float(boca_y), 1), int(bool(boca_abierta))])
+
+    def cerrar(self):
+        if self._archivo is not None and not self._archivo.closed:
+            self._archivo.close()
+
+
+# -------------------------------
+# Rondas
+# -------------------------------
+def simular_ronda(semilla, habilidad=0.7, ruta_entrada=None, ancho=ANCHO, alto=ALTO,
+                  max_segundos=MAX_SEGUNDOS):
+    """Juega una ronda completa y devuelve un dict con sus estadísticas.
+
+    Con `ruta_entrada`, la semilla y la resolución grabadas en el archivo
+    sustituyen a `semilla`, `ancho` y `alto`, para repetir la ronda real.
+    """
+    if ruta_entrada:
+        entrada = EntradaGrabada(ruta_entrada)
+        if entrada.semilla is not None:
+            semilla, ancho, alto = entrada.semilla, entrada.ancho, entrada.alto
+    partida = Partida(ancho, alto, semilla=semilla, verbose=False)
+    if not ruta_entrada:
+        # Generador propio para que el jugador no altere la aparición de frutas
+        entrada = JugadorSintetico(habilidad, random.Random(semilla + 1_000_003))
+
+    max_pasos = int(max_segundos * PASOS_POR_SEGUNDO)
+    motivo = "tiempo"
+    t0 = time.perf_counter()
+    while partida.frame_counter < max_pasos:
+        try:
+            boca_x, boca_y, abierta = entrada(partida)
+        except StopIteration:
+            motivo = "entrada"
+            break
+        partida.paso_simulacion(boca_x, boca_y, abierta)
+        if partida.game_over:
+            motivo = "game_over"
+            break
+    duracion = time.perf_counter() - t0
+
+    atrapadas = int(partida.atrapadas.sum())
+    resultado = {
+        "semilla": semilla,
+        "habilidad": None if ruta_entrada else habilidad,
+        "motivo": motivo,
+        "score": partida.score,
+        "segundos": round(partida.tiempo, 2),
+        "pasos": partida.frame_counter,
+        "dificultad": round(partida.dificultad, 2),
+        "vidas": partida.vidas.actual,
+        "generadas": partida.generadas,
+        "atrapadas": atrapadas,
+        "perdidas": int(partida.perdidas.sum()),
+        "bombas_comidas": int(partida.atrapadas[ID_BOMB]),
+        "pasos_por_segundo": partida.frame_counter / duracion if duracion > 0 else math.inf,
+    }
+    for nombre, n in zip(NOMBRES_TIPOS, partida.atrapadas):
+        resultado[f"atrapadas_{nombre}"] = int(n)
+    return resultado
+
+
+def simular_semillas(semillas, procesos=None, **opciones):
+    """Simula una ronda por semilla repartiendo el trabajo entre procesos.
+
+    Devuelve los resultados ordenados por semilla. `opciones` se pasan a
+    `simular_ronda`. Con `procesos=1` no se crean procesos.
+    """
+    semillas = list(semillas)
+    tarea = partial(simular_ronda, **opciones)
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(semillas) == 1:
+        resultados = [tarea(s) for s in semillas]
+    else:
+        with Pool(min(procesos, len(semillas))) as pool:
+            resultados = list(pool.imap_unordered(tarea, semillas, chunksize=8))
+    return sorted(resultados, key=lambda r: r["semilla"])
+
+
+def resumir(resultados):
+    """Medias y percentiles de puntaje y duración de un conjunto de rondas."""
+    puntajes = np.array([r["score"] for r in resultados], dtype=np.float64)
+    segundos = np.array([r["segundos"] for r in resultados], dtype=np.float64)
+    motivos = {}
+    for r in resultados:
+        motivos[r["motivo"]] = motivos.get(r["motivo"], 0) + 1
+    return {
+        "rondas": len(resultados),
+        "motivos": motivos,
+        "score_medio": float(puntajes.mean()),
+        "score_p10": float(np.percentile(puntajes, 10)),
+        "score_p50": float(np.percentile(puntajes, 50)),
+        "score_p90": float(np.percentile(puntajes, 90)),
+        "segundos_medio": float(segundos.mean()),
+        "segundos_max": float(segundos.max()),
+        "dificultad_media": float(np.mean([r["dificultad"] for r in resultados])),
+        "pasos": int(sum(r["pasos"] for r in resultados)),
+    }
+
+
+def guardar_csv(resultados, ruta):
+    with open(ruta, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=list(resultados[0].keys()))
+        escritor.writeheader()
+        escritor.writerows(resultados)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulación sin cámara de rondas de CrazyFruits")
+    parser.add_argument("--semillas", type=int, default=100, help="número de rondas (una por semilla)")
+    parser.add_argument("--desde", type=int, default=0, help="primera semilla")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos (por defecto, uno por núcleo)")
+    parser.add_argument("--habilidad", type=float, default=0.7, help="habilidad del jugador sintético (0..1)")
+    parser.add_argument("--entrada", metavar="CSV", nargs="+",
+                        help="reproduce rondas grabadas (una por archivo) en vez del jugador sintético")
+    parser.add_argument("--max-segundos", type=float, default=MAX_SEGUNDOS,
+                        help="segundos de juego simulado como máximo por ronda")
+    parser.add_argument("--csv", help="guarda las estadísticas de cada ronda")
+    args = parser.parse_args(argv)
+
+    t0 = time.perf_counter()
+    if args.entrada:
+        resultados = [simular_ronda(args.desde, ruta_entrada=ruta, max_segundos=args.max_segundos)
+                      for ruta in args.entrada]
+    else:
+        resultados = simular_semillas(range(args.desde, args.desde + args.semillas), args.procesos,
+                                      habilidad=args.habilidad, max_segundos=args.max_segundos)
+    duracion = time.perf_counter() - t0
+
+    r = resumir(resultados)
+    print(f"Rondas: {r['rondas']}  ({', '.join(f'{k}: {v}' for k, v in sorted(r['motivos'].items()))})")
+    print(f"Puntaje: medio {r['score_medio']:.1f}  p10 {r['score_p10']:.0f}  "
+          f"p50 {r['score_p50']:.0f}  p90 {r['score_p90']:.0f}")
+    print(f"Duración: media {r['segundos_medio']:.1f} s  máx {r['segundos_max']:.1f} s  "
+          f"|  dificultad media al final {r['dificultad_media']:.2f}")
+    print(f"Pasos simulados: {r['pasos']} en {duracion:.2f} s  ({r['pasos'] / duracion:.0f} pasos/s)")
+
+    if args.csv:
+        guardar_csv(resultados, args.csv)
+        print(f"Rondas guardadas en {args.csv}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,92 +3,213 @@ Gestor de sonidos del juego (usa pygame.mixer).
 
 Se encarga de:
 - Cargar efectos y música de fondo
-- Reproducir efectos en hilos separados cuando sea necesario desde el juego
+- Reproducir efectos desde un único hilo de audio alimentado por una cola
 - Silenciar / reanudar la música
 
+El juego no reproduce sonidos directamente: llama a `emitir(evento)` durante
+el frame y a `despachar()` al terminarlo. Los eventos repetidos en un mismo
+frame se fusionan (suenan en el orden en que se emitieron por primera vez)
+y el lote se entrega a un hilo de audio de larga vida por una cola acotada;
+si la cola está llena, el lote se descarta en vez de acumular hilos. Cada
+categoría de evento tiene canales reservados del mixer.
+
+El mixer se inicia y la música empieza en ese mismo hilo, así que crear un
+`SoundManager` no bloquea la apertura de la ventana. Los efectos se leen de
+un `BancoSonidos` (PCM ya decodificado en disco) y los poco frecuentes se
+cargan la primera vez que suenan.
 """
 
 import os
+import queue
+import threading
 import pygame
+from banco_sonidos import BancoSonidos
+
+SONIDO_PERDER = "vida_perdida.mp3"
+SONIDO_GANAR = "vida_ganada.mp3"
+SONIDO_GAME_OVER = "game_over.mp3"
+
+# Canales reservados del mixer por categoría de evento
+CANALES_POR_EVENTO = {"comer": 2, "perder": 1, "ganar": 1, "game_over": 1}
+# Qué hacer si todos los canales de la categoría están sonando
+POLITICA_CANAL_OCUPADO = {"comer": "robar", "perder": "robar", "ganar": "descartar", "game_over": "robar"}
+TAM_COLA_AUDIO = 8
 
 class SoundManager:
     """Encapsula la carga y reproducción de sonidos del juego.
 
     Métodos útiles:
     - toggle_mute: silencia o reanuda la música de fondo
-    - play_perder / play_ganar / play_comer / play_game_over: reproducen efectos
+    - emitir / despachar: encolan efectos para el hilo de audio
+    - play_perder / play_ganar / play_comer / play_game_over: reproducen
+      efectos (solo se llaman desde el hilo de audio)
+    - cerrar: detiene el hilo de audio
     """
     def __init__(self):
-        pygame.mixer.init()
         self.base_path = os.path.join(os.path.dirname(__file__), "../assets/music")
 
         # Rutas de sonido
         self.musica_fondo_path = os.path.join(self.base_path, "musica.mp3")
-        self.perder_vida_path = os.path.join(self.base_path, "vida_perdida.mp3")
-        self.ganar_vida_path = os.path.join(self.base_path, "vida_ganada.mp3")
-        self.comer_sonidos_paths = [
-            os.path.join(self.base_path, f"Comer_fruta{i}.mp3") for i in range(1, 5)
-        ]
-        self.game_over_path = os.path.join(self.base_path, "game_over.mp3")
-
-        # Cargar sonidos
-        self.sonido_ganar = pygame.mixer.Sound(self.ganar_vida_path)
-        self.sonido_perder = pygame.mixer.Sound(self.perder_vida_path)
-        self.sonidos_comer = [pygame.mixer.Sound(p) for p in self.comer_sonidos_paths]
-        self.sonido_game_over = pygame.mixer.Sound(self.game_over_path)
+        self.comer_sonidos = [f"Comer_fruta{i}.mp3" for i in range(1, 5)]
 
+        # Efectos decodificados una vez y cacheados en disco (ver BancoSonidos)
+        self.banco = BancoSonidos(self.base_path)
         # Volúmenes balanceados
-        self.sonido_perder.set_volume(0.4)
-        for s in self.sonidos_comer:
-            s.set_volume(0.35)
-        self.sonido_game_over.set_volume(0.5)
+        self.banco.fijar_volumen(SONIDO_PERDER, 0.4)
+        for nombre in self.comer_sonidos:
+            self.banco.fijar_volumen(nombre, 0.35)
+        self.banco.fijar_volumen(SONIDO_GAME_OVER, 0.5)
 
         self.muted = False
-        self.idx_comer = 0
+        self.idx_comer = 0  # solo lo modifica el hilo de audio
+        self.canales = {}
+        self.canales_robados = 0
+        self.eventos_descartados = 0
+
+        # El mixer se abre en el hilo de audio: la ventana no espera al audio
+        self.listo = threading.Event()
+        self._lock_musica = threading.Lock()
+
+        # Hilo de audio único alimentado por una cola acotada
+        # Eventos del frame en orden de emisión (un dict como conjunto ordenado)
+        self._pendientes = {}
+        self._cola = queue.Queue(maxsize=TAM_COLA_AUDIO)
+        self._hilo = threading.Thread(target=self._bucle_audio, name="AudioSoundManager", daemon=True)
+        self._hilo.start()
+
+    def _iniciar_mixer(self):
+        """Abre el mixer, reserva canales, precarga los efectos frecuentes e inicia la música.
+
+        Se ejecuta en el hilo de audio. Los efectos poco frecuentes (ganar
+        vida, game over) se cargan la primera vez que suenan.
+        """
+        pygame.mixer.init()
+
+        # Canales reservados: los efectos no compiten con la música ni entre categorías
+        total_reservados = sum(CANALES_POR_EVENTO.values())
+        pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), total_reservados + 4))
+        pygame.mixer.set_reserved(total_reservados)
+        siguiente = 0
+        for evento, cantidad in CANALES_POR_EVENTO.items():
+            self.canales[evento] = [pygame.mixer.Channel(siguiente + i) for i in range(cantidad)]
+            siguiente += cantidad
+
+        self.banco.precargar(self.comer_sonidos + [SONIDO_PERDER])
 
         # Reproducir música en loop
-        pygame.mixer.music.load(self.musica_fondo_path)
-        pygame.mixer.music.play(-1)
-        pygame.mixer.music.set_volume(0.3)
+        with self._lock_musica:
+            pygame.mixer.music.load(self.musica_fondo_path)
+            pygame.mixer.music.play(-1)
+            pygame.mixer.music.set_volume(0.3)
+            if self.muted:
+                pygame.mixer.music.pause()
+        self.listo.set()
+
+    # Encolar un efecto para el frame actual (se fusionan los repetidos)
+    def emitir(self, evento):
+        self._pendientes.setdefault(evento)
+
+    # Enviar al hilo de audio los efectos del frame; si la cola está llena se descartan
+    def despachar(self):
+        if not self._pendientes:
+            return
+        lote = tuple(self._pendientes)
+        self._pendientes.clear()
+        try:
+            self._cola.put_nowait(lote)
+        except queue.Full:
+            self.eventos_descartados += len(lote)
+
+    # Detener el hilo de audio
+    def cerrar(self):
+        try:
+            self._cola.put(None, timeout=0.5)
+        except queue.Full:
+            pass
+        self._hilo.join(timeout=1.0)
+
+    def _bucle_audio(self):
+        try:
+            self._iniciar_mixer()
+        except Exception as e:
+            print(f"[WARN] No se pudo iniciar el audio: {e!r}")
+            return
+        reproducir = {
+            "comer": self.play_comer,
+            "perder": self.play_perder,
+            "ganar": self.play_ganar,
+            "game_over": self.play_game_over,
+        }
+        while True:
+            lote = self._cola.get()
+            if lote is None:
+                break
+            for evento in lote:
+                # Un efecto que falla no debe dejar al juego sin sonido
+                try:
+                    reproducir[evento]()
+                except Exception as e:
+                    print(f"[WARN] No se pudo reproducir '{evento}': {e!r}")
+
+    # Reproducir en un canal reservado de la categoría (robándolo o descartando si están ocupados)
+    def _reproducir(self, evento, sonido):
+        canales = self.canales[evento]
+        for canal in canales:
+            if not canal.get_busy():
+                canal.play(sonido)
+                return
+        if POLITICA_CANAL_OCUPADO[evento] == "robar":
+            self.canales_robados += 1
+            canales[0].play(sonido)
+            # El canal robado pasa al final: la próxima vez se roba el siguiente
+            canales.append(canales.pop(0))
+        else:
+            self.eventos_descartados += 1
 
     # Silenciar o activar
     def toggle_mute(self):
-        self.muted = not self.muted
-        if self.muted:
-            pygame.mixer.music.pause()
-        else:
-            pygame.mixer.music.unpause()
+        with self._lock_musica:
+            self.muted = not self.muted
+            if not self.listo.is_set():
+                return  # se aplica al iniciar la música
+            if self.muted:
+                pygame.mixer.music.pause()
+            else:
+                pygame.mixer.music.unpause()
 
     # Detener música de fondo
     def detener_musica(self):
-        pygame.mixer.music.stop()
+        if self.listo.is_set():
+            with self._lock_musica:
+                pygame.mixer.music.stop()
 
     # Reanudar música (reiniciar)
     def reanudar_musica(self):
-        if not self.muted:
-            pygame.mixer.music.load(self.musica_fondo_path)
-            pygame.mixer.music.play(-1)
-            pygame.mixer.music.set_volume(0.3)
+        if not self.muted and self.listo.is_set():
+            with self._lock_musica:
+                pygame.mixer.music.load(self.musica_fondo_path)
+                pygame.mixer.music.play(-1)
+                pygame.mixer.music.set_volume(0.3)
 
     # Sonido al perder vida
     def play_perder(self):
         if not self.muted:
-            self.sonido_perder.play()
+            self._reproducir("perder", self.banco.obtener(SONIDO_PERDER))
 
     # Sonido al ganar vida
     def play_ganar(self):
         if not self.muted:
-            self.sonido_ganar.play()
+            self._reproducir("ganar", self.banco.obtener(SONIDO_GANAR))
 
     # Sonido al comer fruta
     def play_comer(self):
         if not self.muted:
-            sonido = self.sonidos_comer[self.idx_comer]
-            sonido.play()
-            self.idx_comer = (self.idx_comer + 1) % len(self.sonidos_comer)
+            sonido = self.banco.obtener(self.comer_sonidos[self.idx_comer])
+            self._reproducir("comer", sonido)
+            self.idx_comer = (self.idx_comer + 1) % len(self.comer_sonidos)
 
     # Música de game over
     def play_game_over(self):
         self.detener_musica()
         if not self.muted:
-            self.sonido_game_over.play()
+            self._reproducir("game_over", self.banco.obtener(SONIDO_GAME_OVER))
@@ -0,0 +1,114 @@
+"""
+Registro de sprites de frutas precargados.
+
+Decodifica y escala una sola vez la imagen PNG de cada `TipoFruta` y la
+guarda en una caché compartida. Todas las frutas del mismo tipo usan una
+referencia de solo lectura a la misma matriz de píxeles, de modo que generar
+una fruta ya no implica leer del disco ni redimensionar en el bucle de frames.
+
+Los sprites se guardan premultiplicados por su alfa (ver `Sprite`), que es el
+formato que consume `graphics.componer_sprite`.
+"""
+
+import os
+import cv2
+import numpy as np
+from tipo_fruta import TipoFruta
+
+
+class Sprite:
+    """Imagen lista para componer sobre un frame BGR con aritmética uint8.
+
+    Atributos:
+    - color: BGR premultiplicado por alfa (alto x ancho x 3, uint8)
+    - inv_alfa: 255 - alfa replicado en 3 canales (None si la imagen es opaca)
+    - alto, ancho: dimensiones en píxeles
+
+    Ambas matrices son de solo lectura para poder compartirse entre frutas.
+    """
+    def __init__(self, imagen):
+        if imagen.ndim == 2:
+            imagen = cv2.cvtColor(imagen, cv2.COLOR_GRAY2BGR)
+        if imagen.shape[2] == 4:
+            alfa = imagen[:, :, 3]
+            alfa3 = cv2.merge([alfa, alfa, alfa])
+            # color * alfa / 255 redondeado, sin pasar por float64
+            self.color = cv2.multiply(imagen[:, :, :3], alfa3, scale=1 / 255.0)
+            self.inv_alfa = cv2.bitwise_not(alfa3)
+            self.inv_alfa.setflags(write=False)
+        else:
+            self.color = np.ascontiguousarray(imagen[:, :, :3])
+            self.inv_alfa = None
+        self.color.setflags(write=False)
+        self.alto, self.ancho = self.color.shape[:2]
+
+    @property
+    def shape(self):
+        return self.color.shape
+
+
+def preparar_sprite(imagen):
+    """Convierte una imagen BGR/BGRA en `Sprite` (None si la imagen es None)."""
+    if imagen is None:
+        return None
+    return Sprite(imagen)
+
+
+# Caché: TipoFruta -> Sprite escalado (o None si no se pudo cargar)
+_sprites = {}
+_escala = 1.0
+
+
+def cargar_sprite(ruta, tam):
+    """Lee una imagen con canal alfa y la escala para que su lado mayor mida `tam`.
+
+    Devuelve un `Sprite` de solo lectura, o None si no existe o no puede
+    decodificarse.
+    """
+    if not os.path.exists(ruta):
+        print(f"[WARN] Imagen no encontrada: {ruta}")
+        return None
+    img = cv2.imread(ruta, cv2.IMREAD_UNCHANGED)
+    if img is None:
+        print(f"[WARN] No se pudo leer la imagen: {ruta}")
+        return None
+
+    h, w = img.shape[:2]
+    escala = tam / max(h, w)
+    new_w, new_h = max(1, int(w * escala)), max(1, int(h * escala))
+    return Sprite(cv2.resize(img, (new_w, new_h), interpolation=cv2.INTER_AREA))
+
+
+def precargar_sprites(escala=1.0):
+    """Carga en la caché los sprites de todos los tipos de fruta.
+
+    Se llama al inicio (antes del primer frame). Si cambia la escala, la
+    caché se invalida y se vuelve a construir.
+    """
+    global _escala
+    if escala != _escala:
+        invalidar_sprites()
+        _escala = escala
+    for tipo in TipoFruta:
+        if tipo not in _sprites:
+            _sprites[tipo] = cargar_sprite(tipo.ruta_imagen, int(tipo.tam * _escala))
+
+
+def invalidar_sprites():
+    """Vacía la caché; los sprites se recargan en el próximo acceso."""
+    _sprites.clear()
+
+
+def obtener_sprite(tipo: TipoFruta):
+    """Devuelve el sprite compartido (solo lectura) de un tipo de fruta.
+
+    Si el tipo aún no está en la caché se carga en ese momento.
+    """
+    if tipo not in _sprites:
+        _sprites[tipo] = cargar_sprite(tipo.ruta_imagen, int(tipo.tam * _escala))
+    return _sprites[tipo]
+
+
+def escala_actual():
+    """Escala con la que están construidos los sprites en caché."""
+    return _escala
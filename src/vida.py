@@ -17,9 +17,11 @@ class Vida:
     - actual: vidas restantes en la partida
     - animaciones: lista de animaciones de pérdida
     - animaciones_ganar: lista de animaciones de ganancia
+    - verbose: imprimir cada vida ganada/perdida
     """
-    def __init__(self, total):
+    def __init__(self, total, verbose=True):
         self.total = total
+        self.verbose = verbose
         self.actual = total
         self.animaciones = []  # animaciones de corazones que laten antes de desaparecer
         self.animaciones_ganar = []    # animaciones de vida ganada
@@ -35,7 +37,8 @@ class Vida:
             indice_perdida = self.actual - 1
             self.animaciones.append({"indice": indice_perdida, "frame": 0})
             self.actual -= 1
-            print("[VIDA] 1 vida perdida")
+            if self.verbose:
+                print("[VIDA] 1 vida perdida")
 
 
     def ganar_vida(self):
@@ -43,7 +46,8 @@ class Vida:
         self.actual += 1
         # Lanzamos animación de ganar vida en la posición de la nueva vida
         self.animaciones_ganar.append({"indice": self.actual - 1, "frame": 0})
-        print("[VIDA] +1 vida ganada")
+        if self.verbose:
+            print("[VIDA] +1 vida ganada")
 
     def reiniciar(self):
         """Restaura todas las vidas y limpia animaciones para una nueva partida."""
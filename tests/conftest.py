@@ -0,0 +1,30 @@
+"""
+Configuración común de las pruebas.
+
+Los módulos del juego viven sueltos en `src/` (se ejecutan como
+`python src/main.py`), así que se añade esa carpeta al path. Las pruebas
+guardan los puntajes en una base temporal para no tocar `scores.db`; es una
+sola para toda la sesión porque el hilo escritor de `score_manager` vive lo
+que dura el proceso.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir, "src"))
+
+import score_manager  # noqa: E402
+
+
+@pytest.fixture(autouse=True, scope="session")
+def base_temporal(tmp_path_factory):
+    """Puntajes en una base vacía dentro de un directorio temporal."""
+    carpeta = tmp_path_factory.mktemp("puntajes")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(score_manager, "SCORES_DB", str(carpeta / "scores.db"))
+        mp.setattr(score_manager, "SCORES_FILE", str(carpeta / "scores.json"))
+        mp.setattr(score_manager, "RETARDO_ESCRITURA", 0.01)
+        yield carpeta
+        score_manager.vaciar_pendientes()
@@ -0,0 +1,71 @@
+"""
+`Gobernador`: histéresis al bajar y subir de nivel.
+"""
+
+import pytest
+
+from calidad import Gobernador, NIVELES, VENTANAS_PARA_SUBIR
+
+FPS = 30
+VENTANA = 10
+PRESUPUESTO = 1.0 / FPS
+LENTO = PRESUPUESTO * 1.2
+MEDIO = PRESUPUESTO * 0.8
+HOLGADO = PRESUPUESTO * 0.3
+
+
+@pytest.fixture
+def gobernador():
+    g = Gobernador(FPS, ventana=VENTANA, nivel=1)
+    yield g
+    # Deja la configuración global como al empezar
+    Gobernador(FPS, ventana=VENTANA, nivel=1)
+
+
+def ventana(g, trabajo, deteccion=None):
+    """Registra una ventana completa; devuelve si cambió el nivel al final."""
+    cambios = [g.registrar(trabajo, deteccion) for _ in range(VENTANA)]
+    assert not any(cambios[:-1])
+    return cambios[-1]
+
+
+def test_baja_tras_una_ventana_lenta(gobernador):
+    assert ventana(gobernador, LENTO)
+    assert gobernador.nivel == 2
+    assert gobernador.config == NIVELES[2]
+    assert gobernador.ajustes[-1]["motivo"] == "lento"
+
+
+def test_no_baja_del_ultimo_nivel(gobernador):
+    for _ in range(len(NIVELES) + 2):
+        ventana(gobernador, LENTO)
+    assert gobernador.nivel == len(NIVELES) - 1
+
+
+def test_sube_solo_tras_varias_ventanas_con_holgura(gobernador):
+    for _ in range(VENTANAS_PARA_SUBIR - 1):
+        assert not ventana(gobernador, HOLGADO)
+    assert ventana(gobernador, HOLGADO)
+    assert gobernador.nivel == 0
+    assert gobernador.ajustes[-1]["motivo"] == "holgura"
+
+
+def test_una_ventana_sin_holgura_reinicia_la_cuenta(gobernador):
+    for _ in range(VENTANAS_PARA_SUBIR - 1):
+        ventana(gobernador, HOLGADO)
+    assert not ventana(gobernador, MEDIO)
+    for _ in range(VENTANAS_PARA_SUBIR - 1):
+        assert not ventana(gobernador, HOLGADO)
+    assert gobernador.nivel == 1
+
+
+def test_la_deteccion_lenta_tambien_baja(gobernador):
+    assert ventana(gobernador, HOLGADO, deteccion=LENTO)
+    assert gobernador.nivel == 2
+    assert gobernador.ajustes[-1]["motivo"] == "deteccion lenta"
+
+
+def test_no_sube_si_la_deteccion_no_tiene_holgura(gobernador):
+    for _ in range(VENTANAS_PARA_SUBIR + 1):
+        assert not ventana(gobernador, HOLGADO, deteccion=MEDIO)
+    assert gobernador.nivel == 1
@@ -0,0 +1,55 @@
+"""
+`PoolFrutas`: crecimiento, paso en bloque y compactación.
+"""
+
+import numpy as np
+
+from fruta import PoolFrutas, TIPOS, TIPO_ID, tam_escalado
+
+
+def test_agregar_crece_y_conserva_las_frutas():
+    pool = PoolFrutas(capacidad=2)
+    for i in range(5):
+        pool.agregar(TIPOS[i % len(TIPOS)], 100 + i, -40 + i, 2.0 + i)
+    assert len(pool) == 5
+    assert pool.capacidad == 8
+    np.testing.assert_array_equal(pool.x[:5], [100, 101, 102, 103, 104])
+    np.testing.assert_array_equal(pool.velocidad[:5], [2, 3, 4, 5, 6])
+    assert [pool.tipo[i] for i in range(5)] == [TIPO_ID[TIPOS[i % len(TIPOS)]] for i in range(5)]
+    assert pool.tam[0] == tam_escalado(TIPOS[0])
+    assert pool.vivo[:5].all() and not pool.vivo[5:].any()
+
+
+def test_paso_atrapa_descarta_y_compacta():
+    tipo = TIPOS[0]
+    pool = PoolFrutas()
+    pool.agregar(tipo, 100, 95, 5)    # llega a la boca
+    pool.agregar(tipo, 400, 100, 5)   # lejos de la boca
+    pool.agregar(tipo, 200, 595, 10)  # sale por abajo
+    pool.agregar(tipo, 300, 0, 5)
+
+    atrapadas, perdidas = pool.paso(100, 100, 50, True, frame_height=480)
+    assert list(atrapadas) == [0]
+    assert list(perdidas) == [2]
+    # Siguen accesibles por índice hasta compactar
+    assert pool.y[2] == 605
+
+    pool.compactar()
+    assert len(pool) == 2
+    np.testing.assert_array_equal(pool.x[:2], [400, 300])
+    np.testing.assert_array_equal(pool.y[:2], [105, 5])
+    assert pool.vivo[:2].all() and not pool.vivo[2:4].any()
+
+
+def test_boca_cerrada_no_atrapa():
+    pool = PoolFrutas()
+    pool.agregar(TIPOS[0], 100, 100, 0)
+    atrapadas, perdidas = pool.paso(100, 100, 50, False, frame_height=480)
+    assert len(atrapadas) == 0 and len(perdidas) == 0
+
+
+def test_vaciar():
+    pool = PoolFrutas()
+    pool.agregar(TIPOS[0], 100, 100, 1)
+    pool.vaciar()
+    assert len(pool) == 0 and not pool.vivo.any()
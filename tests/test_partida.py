@@ -0,0 +1,56 @@
+"""
+Reglas de `Partida` y su relación con el juego con cámara.
+"""
+
+import numpy as np
+
+from game import CrazyFruitsGame
+from partida import Partida
+from simulacion import ANCHO, ALTO
+
+PASOS = 900
+
+
+def estado_frutas(partida):
+    pool = partida.frutas
+    n = pool.n
+    return n, pool.x[:n].copy(), pool.y[:n].copy(), pool.tipo[:n].copy()
+
+
+def jugar_igual(a, b, pasos=PASOS):
+    """Avanza las dos partidas sin boca y comprueba que tengan las mismas frutas."""
+    for _ in range(pasos):
+        a.paso_simulacion(None, None, False)
+        b.paso_simulacion(None, None, False)
+        na, xa, ya, ta = estado_frutas(a)
+        nb, xb, yb, tb = estado_frutas(b)
+        assert na == nb
+        np.testing.assert_array_equal(xa, xb)
+        np.testing.assert_array_equal(ya, yb)
+        np.testing.assert_array_equal(ta, tb)
+        assert a.game_over == b.game_over
+        if a.game_over:
+            break
+    assert a.generadas > 0
+
+
+def test_juego_y_simulacion_con_la_misma_semilla():
+    game = CrazyFruitsGame(None, None, ANCHO, ALTO, semilla=7)
+    assert (game.ronda, game.semilla_ronda) == (0, 7)
+    jugar_igual(game, Partida(ANCHO, ALTO, semilla=7, verbose=False))
+
+    # La ronda siguiente repite la de la semilla siguiente
+    game.reset()
+    assert (game.ronda, game.semilla_ronda) == (1, 8)
+    jugar_igual(game, Partida(ANCHO, ALTO, semilla=8, verbose=False))
+
+
+def test_cada_ronda_vuelve_a_sembrar():
+    partida = Partida(ANCHO, ALTO, semilla=3, verbose=False)
+    otra = Partida(ANCHO, ALTO, semilla=3, verbose=False)
+    for _ in range(200):
+        partida.paso_simulacion(None, None, False)
+    partida.reiniciar_ronda()
+    otra.reiniciar_ronda()
+    assert partida.semilla_ronda == otra.semilla_ronda == 4
+    jugar_igual(partida, otra)
@@ -0,0 +1,44 @@
+"""
+`RejillaEspacial`: los vecinos devueltos incluyen todo lo que está al alcance.
+"""
+
+import numpy as np
+
+from rejilla import RejillaEspacial
+
+
+def test_cercanos_incluye_todo_lo_que_esta_a_una_celda():
+    rng = np.random.default_rng(0)
+    ancho, alto, celda = 640, 480, 70
+    x = rng.uniform(-50, ancho + 50, 500)
+    y = rng.uniform(-80, alto + 50, 500)
+    rejilla = RejillaEspacial(ancho, alto, celda)
+    rejilla.indexar(x, y)
+    for px, py in rng.uniform((0, 0), (ancho, alto), (50, 2)):
+        cand = rejilla.cercanos(px, py)
+        assert len(np.unique(cand)) == len(cand)
+        dentro = np.flatnonzero(np.hypot(x - px, y - py) <= celda)
+        assert set(dentro) <= set(cand.tolist())
+
+
+def test_cercanos_solo_mira_las_celdas_vecinas():
+    rejilla = RejillaEspacial(300, 300, 100)
+    x = np.array([10.0, 150.0, 290.0, 290.0])
+    y = np.array([10.0, 150.0, 290.0, 10.0])
+    rejilla.indexar(x, y)
+    assert sorted(rejilla.cercanos(20, 20).tolist()) == [0, 1]
+    assert sorted(rejilla.cercanos(150, 150).tolist()) == [0, 1, 2, 3]
+    assert sorted(rejilla.cercanos(280, 280).tolist()) == [1, 2]
+
+
+def test_puntos_fuera_del_area_van_a_la_celda_del_borde():
+    rejilla = RejillaEspacial(300, 300, 100)
+    rejilla.indexar(np.array([150.0, 150.0]), np.array([-40.0, 900.0]))
+    assert rejilla.cercanos(150, 10).tolist() == [0]
+    assert rejilla.cercanos(150, 290).tolist() == [1]
+
+
+def test_sin_puntos():
+    rejilla = RejillaEspacial(300, 300, 100)
+    rejilla.indexar(np.zeros(0), np.zeros(0))
+    assert len(rejilla.cercanos(150, 150)) == 0
@@ -0,0 +1,45 @@
+"""
+`RelojSimulacion`: pasos fijos, tope por frame y fracción pendiente.
+"""
+
+import pytest
+
+from reloj import RelojSimulacion
+
+
+def test_pasos_enteros_y_alfa():
+    reloj = RelojSimulacion(pasos_por_segundo=30, max_pasos=5)
+    paso = 1 / 30
+    assert reloj.avanzar(paso) == 1
+    assert reloj.alfa == pytest.approx(0.0, abs=1e-6)
+    assert reloj.avanzar(paso * 0.5) == 0
+    assert reloj.alfa == pytest.approx(0.5)
+    assert reloj.avanzar(paso * 0.75) == 1
+    assert reloj.alfa == pytest.approx(0.25)
+    assert reloj.pasos == 2
+    assert reloj.tiempo == pytest.approx(2 * paso)
+
+
+def test_muchos_pasos_cortos_no_pierden_tiempo():
+    reloj = RelojSimulacion(pasos_por_segundo=30)
+    total = sum(reloj.avanzar(1 / 60) for _ in range(600))
+    assert total == 300
+
+
+def test_tope_de_pasos_por_frame():
+    reloj = RelojSimulacion(pasos_por_segundo=30, max_pasos=5)
+    paso = 1 / 30
+    assert reloj.avanzar(paso * 12.5) == 5
+    assert reloj.tiempo_descartado == pytest.approx(7 * paso)
+    # La fracción de paso se conserva
+    assert reloj.alfa == pytest.approx(0.5)
+    assert reloj.avanzar(paso * 0.5) == 1
+
+
+def test_reiniciar():
+    reloj = RelojSimulacion()
+    reloj.avanzar(1.0)
+    reloj.reiniciar()
+    assert (reloj.pasos, reloj.tiempo, reloj.alfa, reloj.tiempo_descartado) == (0, 0.0, 0.0, 0.0)
+    # Sin dt, la primera llamada solo toma referencia
+    assert reloj.avanzar() == 0
@@ -0,0 +1,62 @@
+"""
+Puntajes: TOP en memoria, escritura diferida y rankings con pendientes.
+
+Todas las pruebas comparten la base temporal de la sesión (ver conftest),
+así que cada una usa sus propios nombres y puntajes.
+"""
+
+import sqlite3
+from datetime import datetime
+
+import score_manager
+
+
+def filas_en_base(nombre):
+    with sqlite3.connect(score_manager.SCORES_DB) as con:
+        return [f[0] for f in con.execute(
+            "SELECT score FROM puntajes WHERE nombre = ? ORDER BY id", (nombre,))]
+
+
+def test_escritura_diferida():
+    for score in (5, 7, 3):
+        score_manager.guardar_puntaje(score, "  Diferido ")
+    # Pendientes o no, las consultas los ven
+    assert score_manager.mejor_de_jugador("Diferido")["score"] == 7
+    assert score_manager.vaciar_pendientes()
+    assert filas_en_base("Diferido") == [5, 7, 3]
+
+
+def test_top_en_orden_y_empates_por_antiguedad():
+    base = 10 ** 6
+    for nombre, score in [("TopA", base + 1), ("TopB", base + 3), ("TopC", base + 1), ("TopD", base + 2)]:
+        score_manager.guardar_puntaje(score, nombre)
+    mejores = score_manager.obtener_mejores(4)
+    assert [p["nombre"] for p in mejores] == ["TopB", "TopD", "TopA", "TopC"]
+
+    # Con la base compartida se consulta la base y el resultado es el mismo
+    score_manager.vaciar_pendientes()
+    score_manager.fijar_compartida()
+    try:
+        assert [p["nombre"] for p in score_manager.obtener_mejores(4)] == ["TopB", "TopD", "TopA", "TopC"]
+    finally:
+        score_manager.fijar_compartida(False)
+
+
+def test_top_en_memoria_limitado():
+    for i in range(score_manager.TAM_TOP + 5):
+        score_manager.guardar_puntaje(2 * 10 ** 6 + i, f"Limite{i}")
+    assert len(score_manager._top) == score_manager.TAM_TOP
+    mejores = score_manager.obtener_mejores(score_manager.TAM_TOP)
+    assert [p["score"] for p in mejores] == sorted((p["score"] for p in mejores), reverse=True)
+    assert mejores[0]["nombre"] == f"Limite{score_manager.TAM_TOP + 4}"
+
+
+def test_ranking_del_dia_incluye_pendientes():
+    score_manager.guardar_puntaje(40, "RankA")
+    score_manager.vaciar_pendientes()
+    score_manager.guardar_puntaje(60, "RankA")   # mejora (pendiente)
+    score_manager.guardar_puntaje(0, "RankB")    # nuevo jugador (pendiente)
+    ranking = {p["nombre"]: p["score"] for p in score_manager.ranking_dia(datetime.now(), n=100)}
+    assert ranking["RankA"] == 60
+    assert ranking["RankB"] == 0
+    assert score_manager.ranking_semana(n=100)
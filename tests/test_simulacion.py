@@ -0,0 +1,74 @@
+"""
+Rondas grabadas: el juego con cámara y la simulación deben jugar lo mismo.
+"""
+
+import random
+
+import pytest
+
+from game import CrazyFruitsGame
+from simulacion import (ANCHO, ALTO, EntradaGrabada, GrabadorEntrada, JugadorSintetico,
+                        simular_ronda)
+
+MAX_PASOS = 3000
+
+
+def jugar_ronda(game, jugador):
+    """Juega la ronda actual del juego con el jugador sintético, sin cámara.
+
+    La posición se redondea como la guarda `GrabadorEntrada`, para que la
+    repetición vea exactamente la misma entrada.
+    """
+    for _ in range(MAX_PASOS):
+        x, y, abierta = jugador(game)
+        game.paso_jugadores(((round(x, 1), round(y, 1), abierta),))
+        if game.game_over:
+            break
+    return {
+        "score": game.score,
+        "pasos": game.frame_counter,
+        "generadas": game.generadas,
+        "atrapadas": int(game.atrapadas.sum()),
+        "perdidas": int(game.perdidas.sum()),
+    }
+
+
+def test_rondas_grabadas_se_repiten(tmp_path):
+    grabador = GrabadorEntrada(str(tmp_path / "partida.csv"))
+    game = CrazyFruitsGame(None, None, ANCHO, ALTO, semilla=11, grabador=grabador)
+    jugador = JugadorSintetico(0.6, random.Random(5))
+    en_vivo = [jugar_ronda(game, jugador)]
+    game.reset()
+    en_vivo.append(jugar_ronda(game, jugador))
+    grabador.cerrar()
+
+    for n, esperado in enumerate(en_vivo, start=1):
+        ruta = str(tmp_path / f"partida-{n:03d}.csv")
+        entrada = EntradaGrabada(ruta)
+        assert (entrada.semilla, entrada.ancho, entrada.alto) == (10 + n, ANCHO, ALTO)
+        assert len(entrada.filas) == esperado["pasos"]
+
+        # La semilla y la resolución salen del archivo, no de los argumentos
+        repetida = simular_ronda(0, ruta_entrada=ruta, ancho=320, alto=240)
+        assert repetida["semilla"] == 10 + n
+        for clave, valor in esperado.items():
+            assert repetida[clave] == valor, clave
+    assert en_vivo[0] != en_vivo[1]
+
+
+def test_entrada_sin_cabecera(tmp_path):
+    ruta = tmp_path / "vieja.csv"
+    ruta.write_text("x,y,abierta\n10.5,20,1\n,,0\n", encoding="utf-8")
+    entrada = EntradaGrabada(str(ruta))
+    assert entrada.semilla is None
+    assert entrada(None) == (10.5, 20.0, True)
+    assert entrada(None) == (None, None, False)
+    with pytest.raises(StopIteration):
+        entrada(None)
+
+
+def test_simulacion_reproducible():
+    a = simular_ronda(3, habilidad=0.5, max_segundos=60)
+    b = simular_ronda(3, habilidad=0.5, max_segundos=60)
+    a.pop("pasos_por_segundo"), b.pop("pasos_por_segundo")
+    assert a == b